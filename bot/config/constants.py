@@ -1,5 +1,27 @@
-DEBUG_MODE = True          # master switch
+DEBUG_MODE = True          # master switch (read at call time, so it can be flipped at runtime)
 DEBUG_STATE = True         # print parsed state
 DEBUG_ACTION = True        # print chosen action
 EQUITY_CALCULATION_SIMULATIONS = 500   # for any equity calculations
+EQUITY_BATCH_SIZE = 100                # adaptive mode: samples per confidence check
+EQUITY_MAX_SIMULATIONS = 2000          # adaptive mode: hard cap
+EQUITY_CONFIDENCE_Z = 1.96             # adaptive mode: ~95% interval
+DECISION_TIME_BUDGET = 0.05            # seconds WorldClassBot may spend refining equity per decision
+EQUITY_ENGINE = "numpy"    # "numpy" (batched), "lookup" (per-trial) or "pypokerengine"
+EXACT_ENUMERATION_LIMIT = 50_000   # heads-up showdowns scored exactly instead of sampled
+EQUITY_CACHE_SIZE = 50_000  # canonical spots kept by the equity LRU cache
+EQUITY_SERVICE_WORKERS = None  # equity service pool size (None = one per core)
+EQUITY_SERVICE_MIN_CHUNK = 250 # fewest simulations worth sending to a worker
+LEGACY_SHOWDOWN_RULES = "engine"  # estimate_hole_card_win_rate scoring: "engine" (as pypokerengine pays out) or "standard"
+RANGE_EQUITY_RUNOUTS = 200     # runouts scored against every combo of a range (fewer left = exact)
+RANGE_BOARDS_KEPT = 8          # boards whose range runouts are kept scored
+RANGE_MATCHUPS_KEPT = 4096     # range-vs-range results kept (per canonical flop and range pair)
+RANGE_NUT_SHARE_TOP = 0.10     # top fraction of both ranges that counts as the nuts
+PUSH_FOLD_MIN_BB = 1.0        # push/fold tables: shallowest stack solved
+PUSH_FOLD_MAX_BB = 20.0       # push/fold tables: deepest stack solved
+PUSH_FOLD_STACK_STEP = 0.5    # push/fold tables: stack depth resolution (bb)
+PUSH_FOLD_ITERATIONS = 1000   # fictitious-play rounds per seat
+ICM_PAYOUTS = None            # prize shares from 1st place down, e.g. (0.5, 0.3, 0.2); None = chip EV
+ICM_EXACT_STATES = 100_000    # exact ICM up to this many subset steps, sampled above
+ICM_SAMPLES = 20_000          # sampled ICM: finishing orders drawn
+ICM_CACHE_SIZE = 4096         # ICM results kept (per stacks and payouts)
 SHORT_STACK_THRESHOLD = 12
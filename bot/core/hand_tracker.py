@@ -0,0 +1,239 @@
+# bot/core/hand_tracker.py
+
+"""
+Per-hand action tracker.
+
+WorldClassBot feeds it from the engine callbacks:
+
+    receive_round_start_message   -> start_round
+    receive_street_start_message  -> start_street
+    receive_game_update_message   -> record_action
+
+so at decision time seat order, positions, preflop raise / call / limp
+counts, the last aggressor of every street and pot contributions are
+already known and parse_state only reads them.
+
+HandTracker.replay(round_state) rebuilds the same state from
+action_histories for callers that do not get the callbacks.
+"""
+
+from bot.core.position import get_position_name
+
+
+STREETS = ("preflop", "flop", "turn", "river")
+
+
+class HandTracker:
+
+    def __init__(self):
+        self.start_round(None)
+
+    # ======================================================
+    # ENGINE CALLBACKS
+    # ======================================================
+
+    def start_round(self, round_count):
+
+        self.round_count = round_count
+        self.street = None
+        self.big_blind = 0
+
+        # uuid -> (relative position from the button, position name),
+        # fixed for the whole hand
+        self.positions = {}
+
+        # participating uuids, first to act first
+        self.alive_order = []
+        self.stacks = {}
+
+        # preflop action
+        self.raises = 0
+        self.callers = 0
+        self.limpers = 0
+        self.max_bet = 0
+        self.preflop_raisers = []
+
+        # street -> uuid of the last raiser on that street
+        self.street_aggressors = {}
+
+        # chips put in on the current street / over the whole hand
+        self.street_bets = {}
+        self.contributions = {}
+
+    def start_street(self, street, round_state):
+
+        if round_state["round_count"] != self.round_count:
+            self.start_round(round_state["round_count"])
+
+        self._enter_street(street)
+
+        if street == "preflop":
+            self._start_hand(round_state)
+
+            # blinds and antes are already posted at this point
+            for action in round_state["action_histories"].get("preflop", []):
+                self._apply(action["uuid"], action["action"].lower(), action.get("amount", 0))
+
+        self._refresh_seats(round_state)
+
+    def record_action(self, action, round_state):
+
+        # The message carries the declared action; the engine may have
+        # corrected it (illegal raise -> fold, short call -> all-in), and
+        # the accepted one is the last entry of the street's history.
+        history = round_state["action_histories"].get(round_state["street"], [])
+        accepted = history[-1] if history else None
+
+        if accepted is not None and accepted["uuid"] == action["player_uuid"]:
+            self._apply(accepted["uuid"], accepted["action"].lower(), accepted.get("amount", 0))
+        else:
+            self._apply(action["player_uuid"], action["action"], action["amount"])
+
+        self._refresh_seats(round_state)
+
+    # ======================================================
+    # QUERIES
+    # ======================================================
+
+    def tracks(self, round_state):
+        """
+        True when this tracker is in sync with round_state.
+        """
+        return (
+            self.round_count == round_state["round_count"]
+            and self.street == round_state["street"]
+        )
+
+    def preflop_context(self, player_uuid):
+        """
+        Same dict as build_preflop_context, from the running counters.
+        """
+
+        alive = self.alive_order
+        hero_pos = alive.index(player_uuid)
+
+        # Track only raisers still alive
+        last_raiser_uuid = next(
+            (u for u in reversed(self.preflop_raisers) if u in alive),
+            None
+        )
+
+        if last_raiser_uuid is None:
+            players_left = len(alive) - hero_pos - 1
+        else:
+            raiser_pos = alive.index(last_raiser_uuid)
+
+            if hero_pos < raiser_pos:
+                players_left = raiser_pos - hero_pos - 1
+            else:
+                players_left = len(alive) - hero_pos - 1 + raiser_pos
+
+        return {
+            "raises_before": self.raises,
+            "callers_before": self.callers,
+            "limpers_before": self.limpers,
+            "players_left_to_act": players_left,
+            "is_closing_action": players_left == 0,
+            "last_raiser_uuid": last_raiser_uuid
+        }
+
+    @classmethod
+    def replay(cls, round_state):
+        """
+        Tracker rebuilt from round_state["action_histories"].
+        """
+
+        tracker = cls()
+        tracker.round_count = round_state["round_count"]
+
+        histories = round_state.get("action_histories", {})
+
+        for street in STREETS:
+
+            tracker._enter_street(street)
+
+            if street == "preflop":
+                tracker._start_hand(round_state)
+
+            for action in histories.get(street, []):
+                tracker._apply(action["uuid"], action["action"].lower(), action.get("amount", 0))
+
+            if street == round_state["street"]:
+                break
+
+        tracker._refresh_seats(round_state)
+
+        return tracker
+
+    # ======================================================
+    # INTERNAL
+    # ======================================================
+
+    def _enter_street(self, street):
+        self.street = street
+        self.street_bets = {}
+
+    def _start_hand(self, round_state):
+
+        seats = round_state["seats"]
+        n = len(seats)
+        dealer_btn = round_state["dealer_btn"]
+
+        self.big_blind = round_state["small_blind_amount"] * 2
+        self.max_bet = self.big_blind
+
+        # dealt in = not folded, or folded after acting this hand
+        acted = {
+            a["uuid"] for a in round_state.get("action_histories", {}).get("preflop", [])
+        }
+        dealt = [
+            seats[(dealer_btn + i) % n] for i in range(n)
+        ]
+        dealt = [s for s in dealt if s["state"] != "folded" or s["uuid"] in acted]
+
+        self.positions = {
+            s["uuid"]: (i, get_position_name(i, len(dealt)))
+            for i, s in enumerate(dealt)
+        }
+
+    def _refresh_seats(self, round_state):
+
+        seats = round_state["seats"]
+        n = len(seats)
+        dealer_btn = round_state["dealer_btn"]
+
+        order = [seats[(dealer_btn + 1 + i) % n] for i in range(n)]
+
+        self.alive_order = [s["uuid"] for s in order if s["state"] == "participating"]
+        self.stacks = {s["uuid"]: s["stack"] for s in seats}
+
+    def _apply(self, uuid, act, amount):
+
+        if act == "ante":
+            self.contributions[uuid] = self.contributions.get(uuid, 0) + amount
+            return
+
+        if act == "fold":
+            return
+
+        preflop = self.street == "preflop"
+
+        if act == "raise":
+            self.street_aggressors[self.street] = uuid
+
+            if preflop:
+                self.raises += 1
+                self.max_bet = max(self.max_bet, amount)
+                self.preflop_raisers.append(uuid)
+
+        elif act == "call" and preflop:
+            if self.max_bet == self.big_blind:
+                self.limpers += 1
+            else:
+                self.callers += 1
+
+        # call / raise / blind amounts are the player's street total
+        paid = amount - self.street_bets.get(uuid, 0)
+        if paid > 0:
+            self.street_bets[uuid] = amount
+            self.contributions[uuid] = self.contributions.get(uuid, 0) + paid
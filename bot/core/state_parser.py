@@ -1,15 +1,56 @@
 # bot/core/state_parser.py
 
-from bot.config.constants import DEBUG_MODE, DEBUG_STATE
-from bot.core.position import get_position_name
+from bot.config import constants
+from bot.config.constants import DEBUG_STATE
 from bot.evaluation.stack import get_stack_zone
 from bot.evaluation.pot_odds import calculate_pot_odds
-from bot.evaluation.equity import calculate_equity
+from bot.evaluation.cards import cards_to_ints, card_mask
+from bot.evaluation.equity import estimate_equity_ints
 from bot.evaluation.hand_classifier import classify_hand
-from bot.core.preflop_context import build_preflop_context
+from bot.core.hand_tracker import HandTracker
+
+
+# marks a lazy field that has not been computed yet
+_PENDING = object()
 
 
 class GameState:
+    """
+    Snapshot of one decision.
+
+    Cheap fields are plain slots. pot_odds, equity, hand_info and
+    preflop_context are computed on first access and memoized, so a
+    decision that never reads them (push/fold, unopened ranges) never
+    pays for them.
+    """
+
+    __slots__ = (
+        "street",
+        "hero_uuid",
+        "hero_position",
+        "hero_position_name",
+        "stack",
+        "stack_zone",
+        "pot",
+        "to_call",
+        "players",
+        "hero_cards",
+        "board_cards",
+        "hero_ints",
+        "board_ints",
+        "hero_mask",
+        "board_mask",
+        "big_blind",
+        "hero_act_index",
+        "in_position",
+        "tracker",
+        "deadline",
+        "_pot_odds",
+        "_estimate",
+        "_hand_info",
+        "_preflop_context",
+    )
+
     def __init__(self,
                  street,
                  hero_uuid,
@@ -22,13 +63,13 @@ class GameState:
                  players,
                  hero_cards,
                  board_cards,
+                 hero_ints,
+                 board_ints,
                  big_blind,
-                 pot_odds,
-                 equity,
-                 hand_info,
                  hero_act_index,
                  in_position,
-                 preflop_context
+                 tracker,
+                 deadline=None
                  ):
 
         self.street = street
@@ -42,13 +83,25 @@ class GameState:
         self.players = players
         self.hero_cards = hero_cards
         self.board_cards = board_cards
+        # int cards / 52-bit masks (bot.evaluation.cards) for the
+        # evaluation and strategy modules; the strings are kept for the
+        # engine and debug output only
+        self.hero_ints = hero_ints
+        self.board_ints = board_ints
+        self.hero_mask = card_mask(hero_ints)
+        self.board_mask = card_mask(board_ints)
         self.big_blind = big_blind
-        self.pot_odds = pot_odds
-        self.equity = equity
-        self.hand_info = hand_info
         self.hero_act_index = hero_act_index
         self.in_position = in_position
-        self.preflop_context = preflop_context
+        # per-hand action state (valid for this decision) and the
+        # equity deadline
+        self.tracker = tracker
+        self.deadline = deadline
+
+        self._pot_odds = _PENDING
+        self._estimate = _PENDING
+        self._hand_info = _PENDING
+        self._preflop_context = _PENDING
 
     @property
     def stack_bb(self):
@@ -63,15 +116,122 @@ class GameState:
             return 0
         return self.stack / self.pot
 
-def parse_state(round_state, hole_card, player_uuid, valid_actions):
+    # -----------------------------------------
+    # LAZY FIELDS
+    # -----------------------------------------
+
+    @property
+    def pot_odds(self):
+        if self._pot_odds is _PENDING:
+            self._pot_odds = calculate_pot_odds(self.to_call, self.pot)
+        return self._pot_odds
+
+    @property
+    def equity_estimate(self):
+
+        if self._estimate is _PENDING:
+
+            # Facing a bet the only boundary that matters is pot odds, so
+            # let sampling stop once equity is clearly on one side of it.
+            # With a deadline, sampling refines until time runs out.
+            self._estimate = estimate_equity_ints(
+                self.hero_ints,
+                self.board_ints,
+                self.players,
+                threshold=self.pot_odds if self.to_call > 0 else None,
+                deadline=self.deadline
+            )
+
+            if constants.DEBUG_MODE and DEBUG_STATE:
+                print(
+                    f"[STATE] Equity: {self._estimate.equity:.2%} "
+                    f"({self._estimate.method}, {self._estimate.samples} samples)"
+                )
+
+        return self._estimate
+
+    @property
+    def equity(self):
+        return self.equity_estimate.equity
+
+    @property
+    def equity_samples(self):
+        """
+        Showdowns scored for this decision; 0 if equity was never needed.
+        """
+        if self._estimate is _PENDING:
+            return 0
+        return self._estimate.samples
+
+    @property
+    def hand_info(self):
+
+        if self._hand_info is _PENDING:
+            self._hand_info = classify_hand(self.hero_ints, self.board_ints)
+
+            if constants.DEBUG_MODE and DEBUG_STATE:
+                print(f"[STATE] Made Hand: {self._hand_info['made_hand']}")
+                print(f"[STATE] Draws: {self._hand_info['draws']}")
+
+        return self._hand_info
+
+    @property
+    def preflop_context(self):
+
+        if self._preflop_context is _PENDING:
+
+            ctx = None
+            if self.street == "preflop":
+                ctx = self.tracker.preflop_context(self.hero_uuid)
+
+            self._preflop_context = ctx
+
+            if constants.DEBUG_MODE and DEBUG_STATE and ctx:
+                print("[STATE] Preflop Context:")
+                print(f"  Raises Before: {ctx['raises_before']}")
+                print(f"  Callers Before: {ctx['callers_before']}")
+                print(f"  Players Left: {ctx['players_left_to_act']}")
+                print(f"  Closing Action: {ctx['is_closing_action']}")
+                print(f"  Limpers Before: {ctx['limpers_before']}")
+                print(f"  Last Raiser: {ctx['last_raiser_uuid']}")
+
+        return self._preflop_context
+
+    @property
+    def street_aggressors(self):
+        """
+        street -> uuid of the last raiser on that street.
+        """
+        return self.tracker.street_aggressors
+
+    @property
+    def contributions(self):
+        """
+        uuid -> chips put into the pot this hand.
+        """
+        return self.tracker.contributions
+
+
+def parse_state(round_state, hole_card, player_uuid, valid_actions, deadline=None, tracker=None):
+    """
+    tracker: HandTracker kept up to date by the bot's engine callbacks.
+    Without one (or if it is out of sync) the hand is replayed from
+    round_state["action_histories"].
+    """
+
+    if tracker is None or not tracker.tracks(round_state):
+        tracker = HandTracker.replay(round_state)
 
     street = round_state["street"]
     board = round_state["community_card"]
+
+    # Engine boundary: cards are converted once here
+    hero_ints = tuple(cards_to_ints(hole_card))
+    board_ints = tuple(cards_to_ints(board))
+
     pot = round_state["pot"]["main"]["amount"]
 
-    seats = round_state["seats"]
-    hero_seat = next(s for s in seats if s["uuid"] == player_uuid)
-    stack = hero_seat["stack"]
+    stack = tracker.stacks[player_uuid]
 
     big_blind = round_state["small_blind_amount"] * 2
 
@@ -81,56 +241,18 @@ def parse_state(round_state, hole_card, player_uuid, valid_actions):
     )
     to_call = call_action["amount"] if call_action else 0
 
-    players_alive = sum(1 for s in seats if s["state"] == "participating")
-
-    dealer_btn = round_state["dealer_btn"]
-
-    # --- Active seats (stack > 0) ---
-    n = len(seats)
-    rotated = [(dealer_btn + i) % n for i in range(n)]
-
-    active_rotated = [
-        seats[i] for i in rotated
-        if seats[i]["stack"] > 0
-    ]
-
-    relative_pos = next(
-        i for i, s in enumerate(active_rotated)
-        if s["uuid"] == player_uuid
-    )
-
-    position_name = get_position_name(relative_pos, len(active_rotated))
+    # --- Seats dealt in, counted from the button ---
+    relative_pos, position_name = tracker.positions[player_uuid]
 
     stack_zone = get_stack_zone(stack / big_blind)
-    pot_odds = calculate_pot_odds(to_call, pot)
-
-    equity = calculate_equity(
-        hole_card,
-        board,
-        players_alive
-    )
-
-    hand_info = classify_hand(hole_card, board)
 
     # --- Position order for in-position logic ---
-    order = [(dealer_btn + 1 + i) % n for i in range(n)]
-    alive_order = [
-        seats[i] for i in order
-        if seats[i]["state"] == "participating"
-    ]
-
-    hero_act_index = next(
-        i for i, s in enumerate(alive_order)
-        if s["uuid"] == player_uuid
-    )
-
-    in_position = hero_act_index == len(alive_order) - 1
+    players_alive = len(tracker.alive_order)
+    hero_act_index = tracker.alive_order.index(player_uuid)
 
-    preflop_context = None
-    if street == "preflop":
-        preflop_context = build_preflop_context(round_state, player_uuid)
+    in_position = hero_act_index == players_alive - 1
 
-    if DEBUG_MODE and DEBUG_STATE:
+    if constants.DEBUG_MODE and DEBUG_STATE:
         print("\n[STATE PARSED]")
         print(f"Street: {street}")
         print(f"Hero Cards: {hole_card}")
@@ -142,19 +264,7 @@ def parse_state(round_state, hole_card, player_uuid, valid_actions):
         print(f"To Call: {to_call}")
         print(f"Players Alive: {players_alive}")
         print(f"Position: {position_name}")
-        print(f"Pot Odds: {pot_odds:.2%}")
-        print(f"Equity: {equity:.2%}")
-        print(f"Made Hand: {hand_info['made_hand']}")
-        print(f"Draws: {hand_info['draws']}")
         print(f"In Position: {in_position}")
-        if preflop_context:
-            print("Preflop Context:")
-            print(f"  Raises Before: {preflop_context['raises_before']}")
-            print(f"  Callers Before: {preflop_context['callers_before']}")
-            print(f"  Players Left: {preflop_context['players_left_to_act']}")
-            print(f"  Closing Action: {preflop_context['is_closing_action']}")
-            print(f"  Limpers Before: {preflop_context['limpers_before']}")
-            print(f"  Last Raiser: {preflop_context['last_raiser_uuid']}")
         print("-" * 30)
 
     return GameState(
@@ -169,11 +279,11 @@ def parse_state(round_state, hole_card, player_uuid, valid_actions):
         players=players_alive,
         hero_cards=hole_card,
         board_cards=board,
+        hero_ints=hero_ints,
+        board_ints=board_ints,
         big_blind=big_blind,
-        pot_odds=pot_odds,
-        equity=equity,
-        hand_info=hand_info,
         hero_act_index=hero_act_index,
         in_position=in_position,
-        preflop_context=preflop_context
-    )
\ No newline at end of file
+        tracker=tracker,
+        deadline=deadline
+    )
@@ -0,0 +1,52 @@
+# bot/evaluation/canonical.py
+
+"""
+Suit-isomorphic canonical form for (hole, board).
+
+Equity does not change when suits are relabelled, so ['SA','DK'] on
+['H8','D7','C2'] and ['HA','SK'] on ['D8','S7','C2'] are the same spot.
+
+Each suit gets a signature (hole ranks in that suit, board ranks in
+that suit). Suits are renumbered in signature order; suits with equal
+signatures are interchangeable, so the result is unique.
+"""
+
+
+def _suit_signatures(hole, board):
+
+    signatures = [([], []) for _ in range(4)]
+
+    for c in hole:
+        signatures[c & 3][0].append(c >> 2)
+
+    for c in board:
+        signatures[c & 3][1].append(c >> 2)
+
+    return [
+        (sorted(h, reverse=True), sorted(b, reverse=True))
+        for h, b in signatures
+    ]
+
+
+def canonical_suit_map(hole, board):
+    """
+    Old suit index -> canonical suit index.
+    """
+
+    signatures = _suit_signatures(hole, board)
+    order = sorted(range(4), key=lambda s: signatures[s], reverse=True)
+
+    return {suit: new for new, suit in enumerate(order)}
+
+
+def canonicalize(hole, board):
+    """
+    int cards -> (hole tuple, board tuple), both sorted.
+    """
+
+    suit_map = canonical_suit_map(hole, board)
+
+    return (
+        tuple(sorted((c & ~3) | suit_map[c & 3] for c in hole)),
+        tuple(sorted((c & ~3) | suit_map[c & 3] for c in board)),
+    )
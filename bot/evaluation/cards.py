@@ -0,0 +1,98 @@
+# bot/evaluation/cards.py
+
+"""
+Integer card encoding used by the fast evaluators.
+
+Engine strings ('SA', 'D7') map to ints 0–51:
+
+    card = rank_index * 4 + suit_index
+
+rank_index: 0 ('2') … 12 ('A')
+suit_index: 0 (C), 1 (D), 2 (H), 3 (S)
+"""
+
+RANKS = "23456789TJQKA"
+SUITS = "CDHS"
+
+INT_TO_CARD = [s + r for r in RANKS for s in SUITS]
+CARD_TO_INT = {card: i for i, card in enumerate(INT_TO_CARD)}
+
+FULL_DECK = tuple(range(52))
+
+
+def card_to_int(card: str) -> int:
+    """
+    'SA' -> 51
+    """
+    return CARD_TO_INT[card]
+
+
+def cards_to_ints(cards):
+    return [CARD_TO_INT[c] for c in cards]
+
+
+def int_to_card(card: int) -> str:
+    """
+    51 -> 'SA'
+    """
+    return INT_TO_CARD[card]
+
+
+def ints_to_cards(cards):
+    return [INT_TO_CARD[c] for c in cards]
+
+
+def rank_of(card: int) -> int:
+    return card >> 2
+
+
+def suit_of(card: int) -> int:
+    return card & 3
+
+
+# ======================================================
+# 52-BIT MASKS
+# ======================================================
+# bit `card` set for every card in the hand / board, so dead-card checks
+# and overlaps are single & operations.
+
+CARD_BIT = [1 << c for c in range(52)]
+
+
+def card_mask(cards) -> int:
+    mask = 0
+    for c in cards:
+        mask |= CARD_BIT[c]
+    return mask
+
+
+def mask_to_ints(mask: int):
+    return [c for c in range(52) if mask >> c & 1]
+
+
+# ======================================================
+# RANK / SUIT SUMMARIES
+# ======================================================
+
+def rank_mask(cards) -> int:
+    """
+    13-bit mask of the ranks present (bit 0 = '2', bit 12 = 'A').
+    """
+    mask = 0
+    for c in cards:
+        mask |= 1 << (c >> 2)
+    return mask
+
+
+def rank_counts(cards):
+    counts = [0] * 13
+    for c in cards:
+        counts[c >> 2] += 1
+    return counts
+
+
+def suit_counts(cards):
+    counts = [0] * 4
+    for c in cards:
+        counts[c & 3] += 1
+    return counts
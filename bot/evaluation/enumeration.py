@@ -0,0 +1,221 @@
+# bot/evaluation/enumeration.py
+
+"""
+Exact and stratified equity for the late streets.
+
+Heads-up:
+    every (runout, opponent holding) pair is scored, so the result is the
+    exact win rate. River = C(45,2) holdings, turn = 46 runouts × C(45,2).
+
+Flop and multiway turn / river:
+    (first opponent holding, runout) pairs are taken from a randomly
+    shifted lattice instead of drawn independently, with the holdings
+    ordered by strength on the current board, so the same budget gives
+    a much tighter estimate. On the river the lattice pairs the first
+    two opponents' holdings instead.
+
+All scoring goes through vectorized.evaluate_keyed_batch. Ties count as
+wins, same as the Monte Carlo engines.
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from bot.evaluation.vectorized import (
+    CARD_KEYS,
+    SUIT_RANK_BITS,
+    deal_common,
+    evaluate_keyed_batch,
+    showdown_wins,
+)
+
+
+_RNG = np.random.default_rng()
+
+
+def reseed(seed):
+    """
+    Restart the module's sampler from `seed` (seeded simulations).
+    """
+
+    global _RNG
+    _RNG = np.random.default_rng(seed)
+
+
+def heads_up_space(board_len):
+    """
+    Number of showdowns exact heads-up enumeration would score.
+    """
+
+    deck = 52 - 2 - board_len
+    need = 5 - board_len
+
+    return comb(deck, need) * comb(deck - need, 2)
+
+
+# ======================================================
+# EXACT HEADS-UP
+# ======================================================
+
+def enumerate_heads_up(hole, board):
+    """
+    Returns (wins, showdowns) over every runout and opponent holding.
+    """
+
+    dead = set(hole) | set(board)
+    deck = np.array([c for c in range(52) if c not in dead], dtype=np.int64)
+
+    need = 5 - len(board)
+
+    runouts = list(combinations(deck, need))
+    runouts = np.array(runouts, dtype=np.int64).reshape(len(runouts), need)
+    pairs = np.array(list(combinations(deck, 2)), dtype=np.int64)
+
+    board_key = int(CARD_KEYS[board].sum()) + CARD_KEYS[runouts].sum(axis=1)
+    board_mask = int(SUIT_RANK_BITS[board].sum()) + SUIT_RANK_BITS[runouts].sum(axis=1)
+
+    hero = evaluate_keyed_batch(
+        board_key + CARD_KEYS[hole].sum(),
+        board_mask + SUIT_RANK_BITS[hole].sum()
+    )
+
+    pair_key = CARD_KEYS[pairs].sum(axis=1)
+    pair_mask = SUIT_RANK_BITS[pairs].sum(axis=1)
+
+    runout_mask = board_mask - int(SUIT_RANK_BITS[board].sum())
+
+    # opponent holdings that reuse a runout card are impossible
+    live = (runout_mask[:, None] & pair_mask[None, :]) == 0
+
+    opponent = evaluate_keyed_batch(
+        board_key[:, None] + pair_key[None, :],
+        board_mask[:, None] + pair_mask[None, :]
+    )
+
+    wins = int(((hero[:, None] >= opponent) & live).sum())
+
+    return wins, int(live.sum())
+
+
+# ======================================================
+# STRATIFIED SAMPLING (FLOP / MULTIWAY TURN AND RIVER)
+# ======================================================
+
+# golden-ratio step of the lattice's second coordinate
+_LATTICE_STEP = (5 ** 0.5 - 1) / 2
+
+
+def lattice_points(trials, rng):
+    """
+    `trials` points of a randomly shifted 2-D rank-1 lattice in [0, 1)^2:
+    the first coordinate is one point per 1 / trials stratum, the second
+    steps by the golden ratio. Both margins are uniform (so estimates
+    stay unbiased) and the point set fills the square evenly, unlike
+    independent draws.
+    """
+
+    shift = rng.random(2)
+    i = np.arange(trials)
+
+    first = (i + shift[0]) / trials
+    second = (shift[1] + i * _LATTICE_STEP) % 1.0
+
+    return first, second
+
+
+@lru_cache(maxsize=None)
+def _position_combos(n, k):
+    """
+    Every k-subset of range(n), as an (C(n, k), k) array in order.
+    """
+    combos = list(combinations(range(n), k))
+    return np.array(combos, dtype=np.int64).reshape(len(combos), k)
+
+
+@lru_cache(maxsize=256)
+def _holdings_by_strength(hole, board):
+    """
+    (deck, pairs): the live deck and every holding from it as a pair of
+    deck positions, weakest to strongest on the current board.
+    """
+
+    dead = set(hole) | set(board)
+    deck = np.array([c for c in range(52) if c not in dead], dtype=np.int64)
+
+    pairs = _position_combos(len(deck), 2)
+    cards = deck[pairs]
+
+    current = evaluate_keyed_batch(
+        int(CARD_KEYS[list(board)].sum()) + CARD_KEYS[cards].sum(axis=1),
+        int(SUIT_RANK_BITS[list(board)].sum()) + SUIT_RANK_BITS[cards].sum(axis=1)
+    )
+
+    return deck, pairs[np.argsort(current, kind="stable")]
+
+
+def stratified_wins(hole, board, opponents, trials, rng=None):
+    """
+    Flop, turn or multiway river equity sampled on a lattice instead of
+    independently.
+
+    - first opponent's holding: the first lattice coordinate indexes the
+      possible holdings sorted by their value on the current board, so
+      weak and strong holdings come out in exact proportion
+    - runout: the second coordinate indexes the runouts left once that
+      holding is dealt; on the river, where there is no runout, it
+      indexes the second opponent's holding instead
+    - any further opponents: drawn at random (deal_common, so a seeded
+      rng gives common random numbers)
+
+    Returns (wins, trials).
+    """
+
+    if rng is None:
+        rng = _RNG
+
+    deck, pairs = _holdings_by_strength(tuple(hole), tuple(board))
+
+    need = 5 - len(board)
+    second_holding = need == 0 and opponents > 1
+
+    picks = _position_combos(len(deck) - 2, 2 if second_holding else need)
+
+    first, second = lattice_points(trials, rng)
+
+    holding = pairs[(first * len(pairs)).astype(np.int64)]
+    picked = picks[(second * len(picks)).astype(np.int64)]
+
+    # positions among the deck cards left once the holding (deck
+    # positions a < b) is dealt -> deck positions
+    a = holding[:, :1]
+    b = holding[:, 1:]
+    picked = deck[picked + (picked >= a) + (picked >= b - 1)]
+
+    holes = deck[holding]
+
+    if second_holding:
+        holes = np.hstack([holes, picked])
+        drawn_runouts = picked[:, :0]
+    else:
+        drawn_runouts = picked
+
+    dealt = holes.shape[1] // 2
+
+    if opponents > dealt:
+        others = deal_common(
+            set(hole) | set(board), 2 * (opponents - dealt), trials, rng,
+            row_dead=np.hstack([holes, drawn_runouts])
+        )
+        holes = np.hstack([holes, others])
+
+    won = showdown_wins(
+        hole,
+        board,
+        drawn_runouts,
+        holes.reshape(trials, opponents, 2)
+    )
+
+    return int(won.sum()), trials
@@ -1,34 +1,286 @@
+import time
+from math import sqrt
+
+import numpy as np
+
 from pypokerengine.utils.card_utils import gen_cards, estimate_hole_card_win_rate
-from bot.config.constants import EQUITY_CALCULATION_SIMULATIONS
+from bot.config.constants import (
+    EQUITY_CALCULATION_SIMULATIONS,
+    EQUITY_ENGINE,
+    EXACT_ENUMERATION_LIMIT,
+    EQUITY_BATCH_SIZE,
+    EQUITY_MAX_SIMULATIONS,
+    EQUITY_CONFIDENCE_Z
+)
+from bot.evaluation.cards import cards_to_ints, ints_to_cards
+from bot.evaluation.canonical import canonicalize
+from bot.evaluation.equity_cache import EquityEstimate
+from bot.evaluation.table_equity import active_cache
+from bot.evaluation.hand_utils import normalize_ints
+from bot.evaluation.preflop_table import preflop_equity
+from bot.evaluation.evaluator import simulate_wins
+from bot.evaluation.vectorized import simulate_wins_batch
+from bot.evaluation.enumeration import (
+    heads_up_space,
+    enumerate_heads_up,
+    stratified_wins
+)
+
 
-def calculate_equity(hole_cards, board_cards, players, simulations = EQUITY_CALCULATION_SIMULATIONS):
+def calculate_equity(hole_cards, board_cards, players, simulations = EQUITY_CALCULATION_SIMULATIONS,
+                     threshold = None, deadline = None, seed = None):
     """
     Returns win probability for hero hand.
 
     hole_cards: ['SA','DK']
     board_cards: ['H8','D7','C2']
     players: number of active players
+    threshold: decision boundary (e.g. pot odds). When given, sampling
+               runs in batches and stops as soon as the confidence
+               interval is clear of it, up to EQUITY_MAX_SIMULATIONS.
+    deadline: time.perf_counter() value. When given, sampling refines
+              in batches until the deadline and returns the best
+              estimate so far (anytime mode).
+    seed: makes the sample stream reproducible. Calls with the same seed
+          share their random numbers (common random numbers), so the
+          difference between two spots or two bot versions carries far
+          less noise than with independent runs. Seeded calls bypass
+          the cache and suit canonicalization.
+
+    Monte Carlo is the fallback; cheaper exact paths come first:
+    - preflop → precomputed 169-class table (bot/data/preflop_equity.bin)
+    - repeated spot (up to suit relabelling) → EQUITY_CACHE, or the
+      installed TableEquity's cache during a simulated game
+    - heads-up with a small remaining space → exact enumeration
+    - flop, multiway turn → lattice sampling of (opponent holding,
+      runout), enumeration.stratified_wins
+    - multiway river → the same lattice over the first two opponents'
+      holdings
+    """
+    return estimate_equity(
+        hole_cards, board_cards, players, simulations, threshold, deadline, seed
+    ).equity
+
+
+def estimate_equity(hole_cards, board_cards, players, simulations = EQUITY_CALCULATION_SIMULATIONS,
+                    threshold = None, deadline = None, seed = None):
+    """
+    Same as calculate_equity, returning an EquityEstimate.
+    """
+    return estimate_equity_ints(
+        cards_to_ints(hole_cards),
+        cards_to_ints(board_cards),
+        players,
+        simulations,
+        threshold,
+        deadline,
+        seed
+    )
+
+
+def estimate_equity_ints(hole, board, players, simulations = EQUITY_CALCULATION_SIMULATIONS,
+                         threshold = None, deadline = None, seed = None):
+    """
+    estimate_equity for int cards (bot.evaluation.cards), as stored on
+    GameState.
     """
 
     # Safety guard
     if players <= 1:
-        return 1.0
+        return EquityEstimate(1.0, 0, "trivial")
 
     try:
-        win_rate = estimate_hole_card_win_rate(
-            nb_simulation=simulations,
-            nb_player=players,
-            hole_card=gen_cards(hole_cards),
-            community_card=gen_cards(board_cards)
+        if not board and EQUITY_ENGINE != "pypokerengine":
+            table_equity = preflop_equity(normalize_ints(hole), players)
+            if table_equity is not None:
+                return EquityEstimate(table_equity, 0, "table")
+
+        if seed is not None:
+            # same cards, same stream: no relabelling, no cached answer
+            return _compute_equity(
+                list(hole), list(board), players, simulations, threshold, deadline,
+                np.random.default_rng(seed)
+            )
+
+        hole, board = canonicalize(hole, board)
+
+        budget = simulations if deadline is None else "anytime"
+        key = (hole, board, players, budget, threshold)
+
+        # the installed TableEquity's cache during a simulated game,
+        # else the process-wide EQUITY_CACHE
+        cache = active_cache()
+
+        cached = cache.get(key)
+        if cached is not None:
+            return cached._replace(samples=0, method="cache")
+
+        estimate = _compute_equity(
+            list(hole), list(board), players, simulations, threshold, deadline
         )
-        return float(win_rate)
+        cache.put(key, estimate)
+
+        return estimate
 
     except Exception:
         # Never crash decision loop
-        return 0.0
+        return EquityEstimate(0.0, 0, "error")
 
 def calculate_equity_fast(hole_cards, board_cards, players):
     """
     Lower simulation count for speed-sensitive spots.
     """
     return calculate_equity(hole_cards, board_cards, players, simulations=200)
+
+
+def confidence_interval(wins, trials, z = EQUITY_CONFIDENCE_Z):
+    """
+    Wilson score interval for a win rate.
+    """
+
+    if trials == 0:
+        return 0.0, 1.0
+
+    p = wins / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    margin = z * sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+
+    return centre - margin, centre + margin
+
+
+def _compute_equity(hole, board, players, simulations, threshold, deadline, rng=None):
+
+    opponents = players - 1
+    method = "monte_carlo"
+
+    if EQUITY_ENGINE == "pypokerengine":
+        def sample(n):
+            win_rate = estimate_hole_card_win_rate(
+                nb_simulation=n,
+                nb_player=players,
+                hole_card=gen_cards(ints_to_cards(hole)),
+                community_card=gen_cards(ints_to_cards(board))
+            )
+            return round(win_rate * n), n
+
+    elif opponents == 1 and heads_up_space(len(board)) <= EXACT_ENUMERATION_LIMIT:
+        wins, showdowns = enumerate_heads_up(hole, board)
+        return EquityEstimate(wins / showdowns, showdowns, "exact")
+
+    elif len(board) >= 3:
+        method = "stratified"
+
+        def sample(n):
+            return stratified_wins(hole, board, opponents, n, rng)
+
+    elif EQUITY_ENGINE == "numpy":
+        def sample(n):
+            return simulate_wins_batch(hole, board, opponents, n, rng), n
+
+    else:
+        def sample(n):
+            return simulate_wins(hole, board, opponents, n), n
+
+    if threshold is None and deadline is None:
+        wins, showdowns = sample(simulations)
+    else:
+        wins, showdowns = _sequential_equity(sample, threshold, deadline)
+
+    return EquityEstimate(wins / showdowns, showdowns, method)
+
+
+def _sequential_equity(sample, threshold, deadline):
+    """
+    Batches of EQUITY_BATCH_SIZE until the interval clears threshold,
+    the deadline passes, or EQUITY_MAX_SIMULATIONS is reached.
+    Always scores at least one batch.
+    """
+
+    wins = 0
+    showdowns = 0
+
+    while showdowns < EQUITY_MAX_SIMULATIONS:
+
+        batch_wins, batch_showdowns = sample(
+            min(EQUITY_BATCH_SIZE, EQUITY_MAX_SIMULATIONS - showdowns)
+        )
+        wins += batch_wins
+        showdowns += batch_showdowns
+
+        if threshold is not None:
+            low, high = confidence_interval(wins, showdowns)
+            if low > threshold or high < threshold:
+                break
+
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+
+    return wins, showdowns
+
+
+# ======================================================
+# SAMPLING BENCHMARK
+# ======================================================
+
+def _benchmark_sampling(repeats=200, budget=EQUITY_CALCULATION_SIMULATIONS):
+    """
+    Standard error per millisecond of the flop / turn samplers before
+    (independent Monte Carlo) and after (lattice sampling), and the
+    noise on an equity difference with independent vs common seeds.
+
+        python -m bot.evaluation.equity
+    """
+
+    spots = [
+        ("heads-up flop", ["SA", "DK"], ["H8", "D7", "C2"], 2),
+        ("3-way flop", ["HQ", "HJ"], ["HT", "S9", "C2"], 3),
+        ("3-way turn", ["C9", "D9"], ["S6", "H7", "DQ", "C3"], 3),
+    ]
+
+    def run(sample):
+        values = []
+        start = time.perf_counter()
+        for _ in range(repeats):
+            wins, showdowns = sample()
+            values.append(wins / showdowns)
+        ms = (time.perf_counter() - start) * 1000 / repeats
+        return float(np.mean(values)), float(np.std(values)), ms
+
+    print(f"{'spot':<14} {'sampler':<12} {'equity':>7} {'SE':>8} {'ms':>6} {'1/(SE^2 ms)':>12}")
+
+    for name, hole_cards, board_cards, players in spots:
+
+        hole = cards_to_ints(hole_cards)
+        board = cards_to_ints(board_cards)
+        opponents = players - 1
+
+        before = run(lambda: (simulate_wins_batch(hole, board, opponents, budget), budget))
+        after = run(lambda: stratified_wins(hole, board, opponents, budget))
+
+        for label, (mean, se, ms) in (("monte_carlo", before), ("stratified", after)):
+            print(f"{name:<14} {label:<12} {mean:7.2%} {se:8.4f} {ms:6.2f} {1 / (se * se * ms):12.0f}")
+
+        gain = (before[1] ** 2 * before[2]) / (after[1] ** 2 * after[2])
+        print(f"{'':<14} efficiency gain {gain:.1f}x")
+
+    # Equity difference of two hero hands on one flop
+    board = ["H8", "D7", "C2"]
+    first, second = ["SA", "DK"], ["SA", "DQ"]
+
+    def difference(seed_first, seed_second):
+        return (
+            estimate_equity(first, board, 3, budget, seed=seed_first).equity
+            - estimate_equity(second, board, 3, budget, seed=seed_second).equity
+        )
+
+    independent = [difference(2 * i, 2 * i + 1) for i in range(repeats)]
+    common = [difference(i, i) for i in range(repeats)]
+
+    print(f"\nAKo - AQo on 8-7-2, 3-way, {budget} samples each:")
+    print(f"  independent seeds: mean {np.mean(independent):+.4f}  SE {np.std(independent):.4f}")
+    print(f"  common seeds:      mean {np.mean(common):+.4f}  SE {np.std(common):.4f}")
+
+
+if __name__ == "__main__":
+    _benchmark_sampling()
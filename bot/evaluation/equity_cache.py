@@ -0,0 +1,78 @@
+# bot/evaluation/equity_cache.py
+
+"""
+Bounded LRU cache for equity results.
+
+Keys are (canonical hole, canonical board, players, sample budget), so
+every suit-permuted version of a spot shares one entry.
+"""
+
+from collections import OrderedDict, namedtuple
+
+from bot.config.constants import EQUITY_CACHE_SIZE
+
+
+# equity:  win probability
+# samples: showdowns scored for this call (0 for table / cache answers)
+# method:  "trivial", "table", "cache", "exact", "stratified",
+#          "monte_carlo", "table_shared" (TableEquity), "range" /
+#          "range_sampled" (range_equity) or "error"
+EquityEstimate = namedtuple("EquityEstimate", ["equity", "samples", "method"])
+
+
+class EquityCache:
+
+    def __init__(self, maxsize=EQUITY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+
+        value = self._entries.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+EQUITY_CACHE = EquityCache()
@@ -0,0 +1,220 @@
+# bot/evaluation/equity_service.py
+
+"""
+Process-pool equity service.
+
+A persistent pool of worker processes (each builds the evaluator tables
+once) scores Monte Carlo chunks with vectorized.simulate_wins_batch.
+A request is split into chunks of EQUITY_SERVICE_MIN_CHUNK, each with
+its own seed from the service's SeedSequence, so a single large query
+runs on every core and gives the same answer on any number of them
+(a one-worker service runs the same chunks in-process). win_rates()
+sends several requests in one round trip. sample_rows() does the same for the shared sample sets a
+TableEquity deals for each board, so postflop cache misses are scored
+on the pool too.
+
+Bots keep their synchronous code: estimate_hole_card_win_rate() has the
+same signature as pypokerengine's and goes through the installed
+TableEquity (bot.evaluation.table_equity), else the installed service,
+else runs in-process. Requests are scored under LEGACY_SHOWDOWN_RULES
+unless they say otherwise, so by default the facade answers what the
+engine would pay out, not what standard rules would.
+
+    with EquityService() as service:
+        install_service(service)
+        ...  # run games
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bot.config.constants import EQUITY_SERVICE_WORKERS, EQUITY_SERVICE_MIN_CHUNK, LEGACY_SHOWDOWN_RULES
+from bot.evaluation.cards import cards_to_ints
+from bot.evaluation.table_equity import current_table, sample_rows
+from bot.evaluation.vectorized import simulate_wins_batch
+
+
+# ======================================================
+# WORKER SIDE
+# ======================================================
+
+def _wins_chunk(hole, board, opponents, trials, seed, rules):
+    return simulate_wins_batch(hole, board, opponents, trials, np.random.default_rng(seed), rules)
+
+
+def _rows_chunk(board, opponents, rows, seed, rules):
+    return sample_rows(board, opponents, rows, np.random.default_rng(seed), rules)
+
+
+# ======================================================
+# SERVICE
+# ======================================================
+
+class PendingWinRate:
+    """
+    Handle for a submitted request; result() blocks until every chunk
+    is back.
+    """
+
+    def __init__(self, parts, trials):
+        self.parts = parts
+        self.trials = trials
+
+    def result(self):
+
+        wins = 0
+        for part in self.parts:
+            wins += part if isinstance(part, int) else part.result()
+
+        return wins / self.trials
+
+
+class EquityService:
+
+    def __init__(self, workers=EQUITY_SERVICE_WORKERS, min_chunk=EQUITY_SERVICE_MIN_CHUNK, seed=None):
+
+        self.workers = workers or os.cpu_count() or 1
+        self.min_chunk = min_chunk
+
+        self._pool = None
+        self._seeds = np.random.SeedSequence(seed)
+
+        self.requests = 0
+        self.chunks = 0
+
+    def start(self):
+
+        # one worker cannot beat scoring in-process
+        if self._pool is None and self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        return self
+
+    def reseed(self, seed):
+        """
+        Restart the chunk seeds, so the same requests sample the same
+        cards again (one seed per simulated game).
+        """
+        self._seeds = np.random.SeedSequence(seed)
+
+    def close(self):
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------------------------
+    # REQUESTS (int cards)
+    # -----------------------------------------
+
+    def _chunks(self, total):
+        """
+        (size, seed) per chunk: min_chunk each, seeded in order, so a
+        request samples the same cards however many workers there are.
+        """
+
+        count = max(1, total // self.min_chunk)
+        sizes = [total // count + (i < total % count) for i in range(count)]
+
+        self.chunks += count
+        return zip(sizes, self._seeds.spawn(count))
+
+    def submit(self, hole, board, players, simulations, rules=LEGACY_SHOWDOWN_RULES):
+
+        self.requests += 1
+        opponents = players - 1
+
+        if self._pool is None:
+            wins = sum(
+                _wins_chunk(hole, board, opponents, size, seed, rules) for size, seed in self._chunks(simulations)
+            )
+            return PendingWinRate([int(wins)], simulations)
+
+        parts = [
+            self._pool.submit(_wins_chunk, list(hole), list(board), opponents, size, seed, rules)
+            for size, seed in self._chunks(simulations)
+        ]
+
+        return PendingWinRate(parts, simulations)
+
+    def win_rate(self, hole, board, players, simulations, rules=LEGACY_SHOWDOWN_RULES):
+        return self.submit(hole, board, players, simulations, rules).result()
+
+    def win_rates(self, requests):
+        """
+        requests: iterable of (hole, board, players, simulations[, rules]).
+        All are submitted before any result is awaited.
+        """
+
+        pending = [self.submit(*request) for request in requests]
+        return [p.result() for p in pending]
+
+    def sample_rows(self, board, opponents, rows, rules=LEGACY_SHOWDOWN_RULES):
+        """
+        table_equity.sample_rows for `rows` rows, dealt in chunks on the
+        workers: a list of per-chunk (board_key, board_mask,
+        best_opponent, row_cards) tuples.
+        """
+
+        self.requests += 1
+
+        if self._pool is None:
+            return [_rows_chunk(board, opponents, size, seed, rules) for size, seed in self._chunks(rows)]
+
+        parts = [
+            self._pool.submit(_rows_chunk, tuple(board), opponents, size, seed, rules)
+            for size, seed in self._chunks(rows)
+        ]
+
+        return [part.result() for part in parts]
+
+
+# ======================================================
+# SYNCHRONOUS FACADE
+# ======================================================
+
+_service = None
+
+
+def install_service(service):
+    """
+    Route estimate_hole_card_win_rate through `service` (None = in-process).
+    """
+
+    global _service
+    _service = service
+
+
+def estimate_hole_card_win_rate(nb_simulation, nb_player, hole_card, community_card=None):
+    """
+    Drop-in for pypokerengine.utils.card_utils.estimate_hole_card_win_rate.
+
+    hole_card / community_card are pypokerengine Card objects (gen_cards).
+    Ties count as wins, as in pypokerengine. Showdowns are scored under
+    LEGACY_SHOWDOWN_RULES, by default the engine's.
+    """
+
+    if nb_player <= 1:
+        return 1.0
+
+    hole = cards_to_ints([str(c) for c in hole_card])
+    board = cards_to_ints([str(c) for c in community_card or []])
+
+    table = current_table()
+    if table is not None:
+        return table.win_rate(hole, board, nb_player, nb_simulation)
+
+    if _service is None:
+        return simulate_wins_batch(
+            hole, board, nb_player - 1, nb_simulation, rules=LEGACY_SHOWDOWN_RULES
+        ) / nb_simulation
+
+    return _service.win_rate(hole, board, nb_player, nb_simulation)
@@ -0,0 +1,524 @@
+# bot/evaluation/evaluator.py
+
+"""
+Lookup-table hand evaluator for 5–7 card hands.
+
+Cards are ints from bot.evaluation.cards. A hand value is a plain int,
+higher is better:
+
+    value = category << 20 | five rank nibbles (tie-breakers)
+
+Everything is precomputed at import:
+- FLUSH_VALUES[mask]      value of the best flush / straight flush in a suit
+- NON_FLUSH_VALUES[key]   value of every 5–7 card rank multiset
+
+so evaluating a hand is one sum over the cards and one table lookup.
+
+Hands rank by standard poker rules, which is not quite how
+pypokerengine's HandEvaluator (the one that settles the engine's pots)
+ranks them. In 100k random heads-up showdowns the winner differs in
+about 4.1%, all from three rules (tests/test_evaluator.py fails on any
+other difference):
+
+- wheel (~0.6%): A-2-3-4-5 is a straight / straight flush here; the
+  engine only plays the ace high and scores the hand lower
+- hole card kickers (~3.2%): the engine ranks a hand by its category
+  and the ranks that make it (pair, both pairs, trips, the top card of
+  a straight or flush, quads, full house), then breaks ties on the two
+  hole cards, high then low, whether they play or not; here the best
+  five cards decide and a board that plays splits the pot
+- high card (~0.3%): the engine compares the hole cards only
+
+WorldClassBot's equity follows standard rules. The legacy bots ask
+estimate_hole_card_win_rate for the engine's answer, so that facade
+scores with the ENGINE_* tables below (evaluate_engine), which
+reproduce HandEvaluator.eval_hand value for value.
+"""
+
+import random
+
+
+# ======================================================
+# HAND CATEGORIES
+# ======================================================
+
+HIGH_CARD = 0
+PAIR = 1
+TWO_PAIR = 2
+TRIPS = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+QUADS = 7
+STRAIGHT_FLUSH = 8
+
+CATEGORY_NAMES = {
+    HIGH_CARD: "high_card",
+    PAIR: "pair",
+    TWO_PAIR: "two_pair",
+    TRIPS: "trips",
+    STRAIGHT: "straight",
+    FLUSH: "flush",
+    FULL_HOUSE: "full_house",
+    QUADS: "quads",
+    STRAIGHT_FLUSH: "straight_flush",
+}
+
+
+# ======================================================
+# RANK MASK TABLES (13-bit masks)
+# ======================================================
+
+WHEEL_MASK = 0x100F   # A 5 4 3 2
+
+
+def _straight_high(mask):
+
+    for high in range(12, 3, -1):
+        window = 0x1F << (high - 4)
+        if mask & window == window:
+            return high
+
+    if mask & WHEEL_MASK == WHEEL_MASK:
+        return 3
+
+    return -1
+
+
+def _top5(mask):
+
+    packed = 0
+    taken = 0
+
+    for r in range(12, -1, -1):
+        if mask >> r & 1:
+            packed |= r << (16 - 4 * taken)
+            taken += 1
+            if taken == 5:
+                break
+
+    return packed
+
+
+STRAIGHT_HIGH = [_straight_high(m) for m in range(1 << 13)]
+TOP5 = [_top5(m) for m in range(1 << 13)]
+
+
+def _top(mask, n):
+    """
+    Top n ranks of mask packed into n nibbles.
+    """
+    return TOP5[mask] >> (4 * (5 - n))
+
+
+# ======================================================
+# TABLE CONSTRUCTION
+# ======================================================
+
+def _flush_value(mask):
+
+    high = STRAIGHT_HIGH[mask]
+
+    if high >= 0:
+        return STRAIGHT_FLUSH << 20 | high << 16
+
+    return FLUSH << 20 | TOP5[mask]
+
+
+def _rank_value(counts):
+
+    mask = 0
+    for r in range(13):
+        if counts[r]:
+            mask |= 1 << r
+
+    groups = sorted(
+        ((counts[r], r) for r in range(13) if counts[r]),
+        reverse=True
+    )
+
+    top_count, top_rank = groups[0]
+    second_count, second_rank = groups[1]
+
+    if top_count == 4:
+        rest = mask & ~(1 << top_rank)
+        return QUADS << 20 | top_rank << 16 | _top(rest, 1) << 12
+
+    if top_count == 3 and second_count >= 2:
+        return FULL_HOUSE << 20 | top_rank << 16 | second_rank << 12
+
+    high = STRAIGHT_HIGH[mask]
+    if high >= 0:
+        return STRAIGHT << 20 | high << 16
+
+    if top_count == 3:
+        rest = mask & ~(1 << top_rank)
+        return TRIPS << 20 | top_rank << 16 | _top(rest, 2) << 8
+
+    if top_count == 2 and second_count == 2:
+        rest = mask & ~(1 << top_rank) & ~(1 << second_rank)
+        return TWO_PAIR << 20 | top_rank << 16 | second_rank << 12 | _top(rest, 1) << 8
+
+    if top_count == 2:
+        rest = mask & ~(1 << top_rank)
+        return PAIR << 20 | top_rank << 16 | _top(rest, 3) << 4
+
+    return HIGH_CARD << 20 | TOP5[mask]
+
+
+def _rank_multisets(rank, remaining, counts):
+    """
+    Yields every count vector (≤4 per rank) using exactly `remaining` cards.
+    """
+
+    if rank == 13:
+        if remaining == 0:
+            yield counts
+        return
+
+    for c in range(min(4, remaining) + 1):
+        counts[rank] = c
+        yield from _rank_multisets(rank + 1, remaining - c, counts)
+
+    counts[rank] = 0
+
+
+# Per-card key: 3 bits per rank count, then 4 bits per suit count
+RANK_KEY_BITS = 39
+RANK_KEY_MASK = (1 << RANK_KEY_BITS) - 1
+
+CARD_KEY = [
+    (1 << (3 * (c >> 2))) | (1 << (RANK_KEY_BITS + 4 * (c & 3)))
+    for c in range(52)
+]
+
+# Adding 3 to every suit nibble sets bit 3 only where the count is >= 5
+FLUSH_PROBE = 0x3333
+FLUSH_BITS = 0x8888
+_FLUSH_SUIT = {0x8: 0, 0x80: 1, 0x800: 2, 0x8000: 3}
+
+# Suit-major 52-bit layout: bit 13 * suit + rank, so a suit's ranks are
+# one 13-bit slice of the mask
+SUIT_RANK_BIT = [1 << (13 * (c & 3) + (c >> 2)) for c in range(52)]
+
+FLUSH_VALUES = [_flush_value(m) for m in range(1 << 13)]
+
+NON_FLUSH_VALUES = {}
+for _n in (5, 6, 7):
+    for _counts in _rank_multisets(0, _n, [0] * 13):
+        _key = sum(c << (3 * r) for r, c in enumerate(_counts))
+        NON_FLUSH_VALUES[_key] = _rank_value(_counts)
+
+
+# ======================================================
+# ENGINE RULES (pypokerengine's HandEvaluator)
+# ======================================================
+# Engine values are HandEvaluator.eval_hand's: a category bit and the
+# made ranks (engine ranks 2..14), shifted over the two hole ranks.
+# The tables hold the made part; high card (0 here) is scored on the
+# hole cards alone, so it is filled in per hand.
+
+ENGINE_PAIR = 1 << 8
+ENGINE_TWO_PAIR = 1 << 9
+ENGINE_TRIPS = 1 << 10
+ENGINE_STRAIGHT = 1 << 11
+ENGINE_FLUSH = 1 << 12
+ENGINE_FULL_HOUSE = 1 << 13
+ENGINE_QUADS = 1 << 14
+ENGINE_STRAIGHT_FLUSH = 1 << 15
+
+
+def _engine_straight_low(mask):
+    """
+    Engine rank of the lowest card of the highest straight, -1 if none.
+    The ace is only ever high.
+    """
+
+    for low in range(8, -1, -1):
+        window = 0x1F << low
+        if mask & window == window:
+            return low + 2
+
+    return -1
+
+
+def _engine_flush_value(mask):
+
+    low = _engine_straight_low(mask)
+
+    if low >= 0:
+        return ENGINE_STRAIGHT_FLUSH | low << 4
+
+    return ENGINE_FLUSH | (mask.bit_length() + 1) << 4
+
+
+def _engine_rank_value(counts):
+
+    mask = 0
+    for r in range(13):
+        if counts[r]:
+            mask |= 1 << r
+
+    ranks = [r + 2 for r in range(13)]
+    quads = [ranks[r] for r in range(13) if counts[r] == 4]
+    trips = [ranks[r] for r in range(13) if counts[r] >= 3]
+    pairs = [ranks[r] for r in range(13) if counts[r] == 2]
+
+    if quads:
+        return ENGINE_QUADS | quads[0] << 4
+
+    # two trips: the lower one is the full house's pair
+    if len(trips) == 2:
+        pairs.append(min(trips))
+
+    if trips and pairs:
+        return ENGINE_FULL_HOUSE | max(trips) << 4 | max(pairs)
+
+    low = _engine_straight_low(mask)
+    if low >= 0:
+        return ENGINE_STRAIGHT | low << 4
+
+    if trips:
+        return ENGINE_TRIPS | trips[0] << 4
+
+    if len(pairs) >= 2:
+        return ENGINE_TWO_PAIR | pairs[-1] << 4 | pairs[-2]
+
+    if pairs:
+        return ENGINE_PAIR | pairs[0] << 4
+
+    return 0
+
+
+ENGINE_FLUSH_VALUES = [_engine_flush_value(m) for m in range(1 << 13)]
+
+ENGINE_NON_FLUSH_VALUES = {}
+for _n in (5, 6, 7):
+    for _counts in _rank_multisets(0, _n, [0] * 13):
+        _key = sum(c << (3 * r) for r, c in enumerate(_counts))
+        ENGINE_NON_FLUSH_VALUES[_key] = _engine_rank_value(_counts)
+
+
+def engine_hole_value(c1, c2):
+    """
+    The engine's tie-breaker: hole ranks, high then low.
+    """
+
+    high, low = max(c1, c2) >> 2, min(c1, c2) >> 2
+    return (high + 2) << 4 | (low + 2)
+
+
+# ======================================================
+# PUBLIC ENTRY
+# ======================================================
+
+def evaluate(cards):
+    """
+    Value of the best five-card hand in 5–7 int cards.
+    """
+
+    key = 0
+    for c in cards:
+        key += CARD_KEY[c]
+
+    flush = ((key >> RANK_KEY_BITS) + FLUSH_PROBE) & FLUSH_BITS
+
+    if flush:
+        suit = _FLUSH_SUIT[flush]
+        mask = 0
+        for c in cards:
+            if c & 3 == suit:
+                mask |= 1 << (c >> 2)
+        return FLUSH_VALUES[mask]
+
+    return NON_FLUSH_VALUES[key & RANK_KEY_MASK]
+
+
+def evaluate_keyed(board_key, board, c1, c2):
+    """
+    Same as evaluate(board + [c1, c2]) with the board key precomputed.
+    Used by the simulators where one board is shared by every player.
+    """
+
+    key = board_key + CARD_KEY[c1] + CARD_KEY[c2]
+
+    flush = ((key >> RANK_KEY_BITS) + FLUSH_PROBE) & FLUSH_BITS
+
+    if flush:
+        suit = _FLUSH_SUIT[flush]
+        mask = 0
+        for c in board:
+            if c & 3 == suit:
+                mask |= 1 << (c >> 2)
+        if c1 & 3 == suit:
+            mask |= 1 << (c1 >> 2)
+        if c2 & 3 == suit:
+            mask |= 1 << (c2 >> 2)
+        return FLUSH_VALUES[mask]
+
+    return NON_FLUSH_VALUES[key & RANK_KEY_MASK]
+
+
+def evaluate_engine(hole, board):
+    """
+    HandEvaluator.eval_hand(hole, board) for int cards: the value the
+    engine settles a showdown on.
+    """
+
+    cards = list(hole) + list(board)
+
+    key = 0
+    for c in cards:
+        key += CARD_KEY[c]
+
+    flush = ((key >> RANK_KEY_BITS) + FLUSH_PROBE) & FLUSH_BITS
+
+    if flush:
+        suit = _FLUSH_SUIT[flush]
+        mask = 0
+        for c in cards:
+            if c & 3 == suit:
+                mask |= 1 << (c >> 2)
+        made = ENGINE_FLUSH_VALUES[mask]
+    else:
+        made = ENGINE_NON_FLUSH_VALUES[key & RANK_KEY_MASK]
+
+    hole_value = engine_hole_value(*hole)
+
+    return (made or hole_value) << 8 | hole_value
+
+
+def hand_category(value):
+    return value >> 20
+
+
+def category_name(value):
+    return CATEGORY_NAMES[value >> 20]
+
+
+# ======================================================
+# MONTE CARLO
+# ======================================================
+
+def simulate_wins(hole, board, opponents, trials, rng=random):
+    """
+    Counts showdowns hero wins or ties against `opponents` random hands.
+
+    hole / board are int cards. Ties count as wins, matching
+    pypokerengine's estimate_hole_card_win_rate.
+    """
+
+    dead = set(hole) | set(board)
+    deck = [c for c in range(52) if c not in dead]
+
+    need = 5 - len(board)
+    draw = need + 2 * opponents
+
+    h1, h2 = hole
+    base_key = 0
+    for c in board:
+        base_key += CARD_KEY[c]
+
+    sample = rng.sample
+    wins = 0
+
+    for _ in range(trials):
+
+        drawn = sample(deck, draw)
+
+        full_board = board + drawn[:need]
+        board_key = base_key
+        for c in drawn[:need]:
+            board_key += CARD_KEY[c]
+
+        hero = evaluate_keyed(board_key, full_board, h1, h2)
+
+        for i in range(need, draw, 2):
+            if evaluate_keyed(board_key, full_board, drawn[i], drawn[i + 1]) > hero:
+                break
+        else:
+            wins += 1
+
+    return wins
+
+
+# ======================================================
+# SELF CHECK
+# ======================================================
+# python -m bot.evaluation.evaluator
+#
+# Compares hand categories with pypokerengine's HandEvaluator on random
+# 7-card hands and reports showdowns per second for both.
+#
+# pypokerengine does not recognise A-2-3-4-5 (ace is only ever high), so
+# hands whose best holding here is a wheel are counted separately. The
+# kicker differences (module docstring) do not change categories;
+# tests/test_evaluator.py compares whole showdowns.
+
+def _check_against_pypokerengine(hands=20000, seed=7):
+
+    import time
+
+    from pypokerengine.engine.card import Card
+    from pypokerengine.engine.hand_evaluator import HandEvaluator
+    from bot.evaluation.cards import int_to_card
+
+    names = {
+        "HIGHCARD": HIGH_CARD,
+        "ONEPAIR": PAIR,
+        "TWOPAIR": TWO_PAIR,
+        "THREECARD": TRIPS,
+        "STRAIGHT": STRAIGHT,
+        "FLASH": FLUSH,
+        "FULLHOUSE": FULL_HOUSE,
+        "FOURCARD": QUADS,
+        "STRAIGHTFLASH": STRAIGHT_FLUSH,
+    }
+
+    rng = random.Random(seed)
+    deals = [rng.sample(range(52), 7) for _ in range(hands)]
+    engine_deals = [
+        [Card.from_str(int_to_card(c)) for c in deal] for deal in deals
+    ]
+
+    mismatches = 0
+    wheels = 0
+
+    for deal, cards in zip(deals, engine_deals):
+        ours = evaluate(deal)
+        theirs = names[
+            HandEvaluator.gen_hand_rank_info(cards[:2], cards[2:])["hand"]["strength"]
+        ]
+
+        if hand_category(ours) == theirs:
+            continue
+
+        is_wheel = hand_category(ours) in {STRAIGHT, STRAIGHT_FLUSH} and (ours >> 16 & 15) == 3
+        if is_wheel:
+            wheels += 1
+        else:
+            mismatches += 1
+            print("MISMATCH", [int_to_card(c) for c in deal], category_name(ours), theirs)
+
+    start = time.perf_counter()
+    for deal in deals:
+        evaluate(deal)
+    ours_rate = hands / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for cards in engine_deals:
+        HandEvaluator.eval_hand(cards[:2], cards[2:])
+    theirs_rate = hands / (time.perf_counter() - start)
+
+    print(f"Hands checked: {hands}")
+    print(f"Category mismatches: {mismatches}")
+    print(f"Wheel-only differences: {wheels}")
+    print(f"Lookup evaluator: {ours_rate:,.0f} hands/s")
+    print(f"pypokerengine:    {theirs_rate:,.0f} hands/s")
+    print(f"Speedup: {ours_rate / theirs_rate:.1f}x")
+
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    _check_against_pypokerengine()
@@ -1,43 +1,223 @@
-from collections import Counter
-from itertools import combinations
+"""
+Made hand / draw labels for the strategy layer.
 
-from pypokerengine.utils.card_utils import gen_cards
+Everything is table driven from the evaluator's per-card keys:
+- rank multiset key  → made hand ignoring suits (MADE_BY_RANK_KEY)
+- suit count nibbles → exactly-five / exactly-four suited (SUIT_SHAPES)
+- 13-bit rank mask   → straight draw outs (STRAIGHT_OUTS)
 
-RANKS = "23456789TJQKA"
-RANK_TO_VALUE = {r: i for i, r in enumerate(RANKS)}
+so a call is one pass over the cards and three lookups.
+"""
 
-def split_card(card):
-    return card[0], card[1]
+from itertools import product
+
+from bot.evaluation.evaluator import (
+    CARD_KEY,
+    RANK_KEY_BITS,
+    RANK_KEY_MASK,
+    NON_FLUSH_VALUES,
+    STRAIGHT_HIGH,
+    HIGH_CARD,
+    PAIR,
+    TWO_PAIR,
+    TRIPS,
+    STRAIGHT,
+    FULL_HOUSE,
+    QUADS,
+    _rank_multisets,
+)
+
+
+# ======================================================
+# LOOKUP TABLES
+# ======================================================
+
+_CATEGORY_LABELS = {
+    HIGH_CARD: "high_card",
+    PAIR: "pair",
+    TWO_PAIR: "two_pair",
+    TRIPS: "trips",
+    STRAIGHT: "straight",
+    FULL_HOUSE: "full_house",
+    QUADS: "quads",
+}
+
+
+def _short_label(counts):
+
+    shape = sorted((n for n in counts if n), reverse=True) + [0]
+
+    if shape[0] == 4:
+        return "quads"
+    if shape[0] == 3:
+        return "full_house" if shape[1] >= 2 else "trips"
+    if shape[0] == 2:
+        return "two_pair" if shape[1] == 2 else "pair"
+    return "high_card"
+
+
+# 5–7 cards reuse the evaluator's rank table; 2–4 cards (preflop) are
+# only a few thousand extra keys
+MADE_BY_RANK_KEY = {
+    key: _CATEGORY_LABELS[value >> 20]
+    for key, value in NON_FLUSH_VALUES.items()
+}
+
+for _n in (2, 3, 4):
+    for _counts in _rank_multisets(0, _n, [0] * 13):
+        _key = sum(c << (3 * r) for r, c in enumerate(_counts))
+        MADE_BY_RANK_KEY[_key] = _short_label(_counts)
+
+
+# (any suit with exactly 5, any suit with exactly 4), keyed by the four
+# suit count nibbles
+SUIT_SHAPES = {
+    sum(c << (4 * s) for s, c in enumerate(_suits)): (5 in _suits, 4 in _suits)
+    for _suits in product(range(8), repeat=4)
+    if 2 <= sum(_suits) <= 7
+}
+
+
+# Windows of five ranks a straight can use, wheel included
+_STRAIGHT_WINDOWS = [0x1F << low for low in range(9)] + [0x100F]
+
+
+def _straight_outs(mask):
+    """
+    Number of missing ranks that would complete a straight
+    (1 = gutshot, 2 = open-ender / double gutter).
+    """
+
+    outs = 0
+
+    for r in range(13):
+        bit = 1 << r
+        if mask & bit:
+            continue
+        if any((mask | bit) & w == w for w in _STRAIGHT_WINDOWS):
+            outs += 1
+
+    return outs
+
+
+STRAIGHT_OUTS = [_straight_outs(m) for m in range(1 << 13)]
+
+# Four ranks inside one five-rank window: a draw, or already a straight
+STRAIGHT_DRAW = [
+    STRAIGHT_OUTS[m] > 0 or STRAIGHT_HIGH[m] >= 0
+    for m in range(1 << 13)
+]
+
+
+# ======================================================
+# PUBLIC ENTRY
+# ======================================================
 
 def classify_hand(hole_cards, board_cards):
+    """
+    hole_cards / board_cards: int cards (bot.evaluation.cards)
+    """
 
-    all_cards = hole_cards + board_cards
+    key = 0
+    mask = 0
 
-    suits = []
-    ranks = []
+    for c in hole_cards:
+        key += CARD_KEY[c]
+        mask |= 1 << (c >> 2)
 
-    for c in all_cards:
-        s, r = split_card(c)
-        suits.append(s)
-        ranks.append(r)
+    for c in board_cards:
+        key += CARD_KEY[c]
+        mask |= 1 << (c >> 2)
 
-    rank_counts = Counter(ranks)
-    suit_counts = Counter(suits)
+    five_suited, four_suited = SUIT_SHAPES[key >> RANK_KEY_BITS]
 
     # ---------- MADE HAND DETECTION ----------
 
-    counts = sorted(rank_counts.values(), reverse=True)
+    made = MADE_BY_RANK_KEY[key & RANK_KEY_MASK]
+
+    if five_suited and made not in ("quads", "full_house"):
+        made = "flush"
+
+    # ---------- DRAW DETECTION ----------
+
+    draws = []
 
+    if len(board_cards) == 5:
+        # no draws possible on river
+        return {"made_hand": made, "draws": draws}
+
+    if four_suited:
+        draws.append("flush_draw")
+
+    if STRAIGHT_DRAW[mask]:
+        draws.append("straight_draw")
+
+    return {
+        "made_hand": made,
+        "draws": draws
+    }
+
+
+def straight_draw_type(hole_cards, board_cards):
+    """
+    "open_ended", "gutshot" or None, from the rank mask alone.
+    """
+
+    mask = 0
+    for c in hole_cards:
+        mask |= 1 << (c >> 2)
+    for c in board_cards:
+        mask |= 1 << (c >> 2)
+
+    outs = STRAIGHT_OUTS[mask]
+
+    if outs >= 2:
+        return "open_ended"
+    if outs == 1:
+        return "gutshot"
+    return None
+
+
+# ======================================================
+# SELF CHECK
+# ======================================================
+# python -m bot.evaluation.hand_classifier
+#
+# Compares classify_hand with the previous count-based classifier on
+# every flop (each with a fixed set of hole cards) and on random turns
+# and rivers, and reports calls per second for both.
+
+def _classify_reference(hole_cards, board_cards):
+
+    from itertools import combinations
+
+    all_cards = list(hole_cards) + list(board_cards)
+    ranks = [c >> 2 for c in all_cards]
+
+    rank_count = [0] * 13
+    suit_count = [0] * 4
+    for c in all_cards:
+        rank_count[c >> 2] += 1
+        suit_count[c & 3] += 1
+
+    counts = sorted((n for n in rank_count if n), reverse=True)
     top = counts[0]
     second = counts[1] if len(counts) > 1 else 0
 
+    values = sorted(set(ranks))
+    wheel = {12, 0, 1, 2, 3}
+
+    straight = wheel.issubset(values) or any(
+        values[i + 4] - values[i] == 4 for i in range(len(values) - 4)
+    )
+
     if top == 4:
         made = "quads"
     elif top == 3 and second >= 2:
         made = "full_house"
-    elif 5 in suit_counts.values():
+    elif 5 in suit_count:
         made = "flush"
-    elif _has_straight(ranks):
+    elif straight:
         made = "straight"
     elif top == 3:
         made = "trips"
@@ -48,57 +228,64 @@ def classify_hand(hole_cards, board_cards):
     else:
         made = "high_card"
 
-
-    # ---------- DRAW DETECTION ----------
-
     draws = []
 
-    if _has_flush_draw(all_cards):
+    if 4 in suit_count:
         draws.append("flush_draw")
 
-    if _has_straight_draw(ranks):
+    if len(wheel.intersection(values)) >= 4 or any(
+        max(combo) - min(combo) <= 4 for combo in combinations(values, 4)
+    ):
         draws.append("straight_draw")
+
     if len(board_cards) == 5:
-        draws = []  # no draws possible on river
-    return {
-        "made_hand": made,
-        "draws": draws
-    }
+        draws = []
 
+    return {"made_hand": made, "draws": draws}
 
-def _has_straight(ranks):
 
-    values = sorted(set(RANK_TO_VALUE[r] for r in ranks))
+def _check_against_reference(holes_per_flop=4, late_street_deals=100_000, seed=9):
 
-    # Handle wheel: A2345
-    if set(['A','2','3','4','5']).issubset(ranks):
-        return True
+    import random
+    import time
+    from itertools import combinations
 
-    for i in range(len(values) - 4):
-        if values[i+4] - values[i] == 4:
-            return True
+    rng = random.Random(seed)
 
-    return False
+    deals = []
+    for flop in combinations(range(52), 3):
+        live = [c for c in range(52) if c not in flop]
+        for _ in range(holes_per_flop):
+            deals.append((rng.sample(live, 2), list(flop)))
 
-def _has_flush_draw(cards):
+    for board_len in (4, 5):
+        for _ in range(late_street_deals):
+            cards = rng.sample(range(52), 2 + board_len)
+            deals.append((cards[:2], cards[2:]))
 
-    suits = [split_card(c)[0] for c in cards]
-    counts = Counter(suits)
+    mismatches = 0
+    for hole, board in deals:
+        if classify_hand(hole, board) != _classify_reference(hole, board):
+            mismatches += 1
 
-    return any(v == 4 for v in counts.values())
+    start = time.perf_counter()
+    for hole, board in deals:
+        _classify_reference(hole, board)
+    reference_rate = len(deals) / (time.perf_counter() - start)
 
-def _has_straight_draw(ranks):
+    start = time.perf_counter()
+    for hole, board in deals:
+        classify_hand(hole, board)
+    table_rate = len(deals) / (time.perf_counter() - start)
 
-    values = sorted(set(RANK_TO_VALUE[r] for r in ranks))
+    print(f"Deals checked: {len(deals)}")
+    print(f"Mismatches: {mismatches}")
+    print(f"Count-based: {reference_rate:,.0f} calls/s")
+    print(f"Table-driven: {table_rate:,.0f} calls/s")
+    print(f"Speedup: {table_rate / reference_rate:.1f}x")
 
-    # wheel draw
-    wheel = {RANK_TO_VALUE[r] for r in ['A','2','3','4','5']}
-    if len(wheel.intersection(values)) >= 4:
-        return True
+    return mismatches == 0
 
-    # general detection
-    for combo in combinations(values, 4):
-        if max(combo) - min(combo) <= 4:
-            return True
 
-    return False
+if __name__ == "__main__":
+    _check_against_reference()
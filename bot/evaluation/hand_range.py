@@ -0,0 +1,175 @@
+# bot/evaluation/hand_range.py
+
+"""
+Preflop ranges as bitsets.
+
+A HandRange is a 169-bit int, bit i = hand class HAND_CODES[i] of the
+13x13 grid (hand_utils), so set algebra is int algebra:
+
+    opens = HandRange.from_codes({"AA", "KK", "AKs"})
+    (opens | calls) - three_bets
+
+Membership reads `members`, the same bits unpacked into 169 bytes,
+indexed by the grid index hand_index() gives straight from int cards
+(a shift of a 169-bit int allocates a new int, a bytes index does not):
+
+    opens.members[hand_index(hero_ints)]
+
+Combo-level questions use the matching 1326-bit set (bit i = combo i of
+range_equity.COMBOS), so card removal is an AND with a dead-card mask.
+"""
+
+import numpy as np
+
+from bot.evaluation.hand_utils import HAND_CODES, HAND_CODE_INDEX, hand_code_index
+from bot.evaluation.range_equity import COMBOS, COMBO_CLASS
+
+
+TOTAL_COMBOS = len(COMBOS)
+
+# hand class -> 1326-bit set of its combos
+CLASS_COMBO_BITS = [0] * len(HAND_CODES)
+
+# card -> 1326-bit set of the combos that use it
+CARD_COMBO_BITS = [0] * 52
+
+for _i, ((_c1, _c2), _cls) in enumerate(zip(COMBOS.tolist(), COMBO_CLASS.tolist())):
+    CLASS_COMBO_BITS[_cls] |= 1 << _i
+    CARD_COMBO_BITS[_c1] |= 1 << _i
+    CARD_COMBO_BITS[_c2] |= 1 << _i
+
+# combos per class: 6 pairs, 4 suited, 12 offsuit
+CLASS_COMBOS = [bits.bit_count() for bits in CLASS_COMBO_BITS]
+
+
+def as_hand_index(hand) -> int:
+    """
+    Grid index from an index or a hand code ('AKo' -> 13).
+    """
+    return HAND_CODE_INDEX[hand] if isinstance(hand, str) else hand
+
+
+class HandRange:
+
+    __slots__ = ("bits", "members")
+
+    def __init__(self, bits=0):
+        self.bits = bits
+        self.members = bytes(bits >> i & 1 for i in range(len(HAND_CODES)))
+
+    @classmethod
+    def from_codes(cls, codes):
+        """
+        Raises ValueError on a code that is not a normalized hand code
+        ('QKs', 'aks'); range_notation.parse_range reads notation.
+        """
+
+        bits = 0
+        for code in codes:
+            bits |= 1 << hand_code_index(code)
+
+        return cls(bits)
+
+    @classmethod
+    def from_indices(cls, indices):
+
+        bits = 0
+        for i in indices:
+            bits |= 1 << i
+
+        return cls(bits)
+
+    # -----------------------------------------
+    # MEMBERSHIP / ALGEBRA
+    # -----------------------------------------
+
+    def __contains__(self, hand):
+        return self.members[as_hand_index(hand)] == 1
+
+    def __or__(self, other):
+        return HandRange(self.bits | other.bits)
+
+    def __and__(self, other):
+        return HandRange(self.bits & other.bits)
+
+    def __sub__(self, other):
+        return HandRange(self.bits & ~other.bits)
+
+    def __eq__(self, other):
+        return isinstance(other, HandRange) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __len__(self):
+        """
+        Hand classes in the range.
+        """
+        return self.bits.bit_count()
+
+    def indices(self):
+
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def __iter__(self):
+        """
+        Hand codes, in grid order.
+        """
+        return (HAND_CODES[i] for i in self.indices())
+
+    def __repr__(self):
+        return f"HandRange({len(self)} hands, {self.combos()} combos)"
+
+    # -----------------------------------------
+    # COMBOS
+    # -----------------------------------------
+
+    @property
+    def combo_bits(self):
+        """
+        1326-bit set of every combo of the range.
+        """
+
+        bits = 0
+        for i in self.indices():
+            bits |= CLASS_COMBO_BITS[i]
+
+        return bits
+
+    def combos(self, dead_cards=()):
+        """
+        Combos in the range, without those using a dead card.
+        """
+
+        if not dead_cards:
+            return sum(CLASS_COMBOS[i] for i in self.indices())
+
+        dead = 0
+        for c in dead_cards:
+            dead |= CARD_COMBO_BITS[c]
+
+        return (self.combo_bits & ~dead).bit_count()
+
+    def percent(self):
+        """
+        Share of all starting hands, in percent.
+        """
+        return 100 * self.combos() / TOTAL_COMBOS
+
+    def weights(self):
+        """
+        1326 combo weights for range_equity (1.0 in range, else 0.0).
+        """
+
+        classes = np.zeros(len(HAND_CODES))
+        classes[list(self.indices())] = 1.0
+
+        return classes[COMBO_CLASS]
+
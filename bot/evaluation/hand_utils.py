@@ -38,6 +38,34 @@ def normalize_hand(hole_cards):
 
     return f"{high}{low}{suffix}"
 
+
+# ==================================================
+# INT CARDS (bot.evaluation.cards)
+# ==================================================
+# Same codes as normalize_hand, looked up by c1 * 52 + c2.
+
+def _pair_code(c1, c2):
+
+    r1, r2 = c1 >> 2, c2 >> 2
+
+    if r1 == r2:
+        return RANK_ORDER[r1] * 2
+
+    suffix = "s" if c1 & 3 == c2 & 3 else "o"
+
+    return RANK_ORDER[max(r1, r2)] + RANK_ORDER[min(r1, r2)] + suffix
+
+
+_PAIR_CODES = [_pair_code(a, b) for a in range(52) for b in range(52)]
+
+
+def normalize_ints(hole_cards) -> str:
+    """
+    [51, 46] -> 'AKo'  (int-card counterpart of normalize_hand)
+    """
+    c1, c2 = hole_cards
+    return _PAIR_CODES[c1 * 52 + c2]
+
 def is_pair(hand_code: str) -> bool:
     return len(hand_code) == 2
 
@@ -45,3 +73,52 @@ def get_ranks(hand_code: str):
     if is_pair(hand_code):
         return hand_code[0], hand_code[1]
     return hand_code[0], hand_code[1]
+
+
+# ==================================================
+# 13x13 HAND GRID
+# ==================================================
+# Row / column = rank from A down to 2.
+# Diagonal = pairs, above = suited, below = offsuit.
+
+GRID_RANKS = RANK_ORDER[::-1]
+
+
+def _grid_code(row, col):
+
+    if row == col:
+        return GRID_RANKS[row] * 2
+
+    if row < col:
+        return GRID_RANKS[row] + GRID_RANKS[col] + "s"
+
+    return GRID_RANKS[col] + GRID_RANKS[row] + "o"
+
+
+HAND_CODES = [_grid_code(r, c) for r in range(13) for c in range(13)]
+HAND_CODE_INDEX = {code: i for i, code in enumerate(HAND_CODES)}
+
+
+def hand_code_index(hand_code: str) -> int:
+    """
+    'AA' -> 0, 'AKs' -> 1, 'AKo' -> 13, '22' -> 168
+
+    ValueError for anything that is not a normalized code ('QKs', 'aks').
+    """
+
+    if hand_code not in HAND_CODE_INDEX:
+        raise ValueError(f"not a normalized hand code: {hand_code!r}")
+
+    return HAND_CODE_INDEX[hand_code]
+
+
+# c1 * 52 + c2 -> grid index, so int cards never go through a string
+_PAIR_INDEX = [HAND_CODE_INDEX[code] for code in _PAIR_CODES]
+
+
+def hand_index(hole_cards) -> int:
+    """
+    [51, 46] -> 13  (grid index of 'AKo', straight from int cards)
+    """
+    c1, c2 = hole_cards
+    return _PAIR_INDEX[c1 * 52 + c2]
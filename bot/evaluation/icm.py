@@ -0,0 +1,266 @@
+# bot/evaluation/icm.py
+
+"""
+Independent Chip Model: tournament chips -> prize equity.
+
+    icm_equities((5000, 3000, 2000), (0.5, 0.3, 0.2))
+    -> (0.3839..., 0.3275, 0.2886...)
+
+payouts are the prizes from first place down (fractions of the prize
+pool or currency, the result is in the same unit). Players with no chips
+are out and get 0; the others play for the top places.
+
+Malmuth-Harville: a player finishes first with probability stack / total
+chips, and the rest of the order follows the same rule among the players
+left. The exact mode walks the finishing orders place by place, merging
+every order that reaches the same set of placed players (one state per
+subset, never one per permutation), and stops at the last paid place;
+big walks run on numpy arrays a place at a time. Past ICM_EXACT_STATES
+subset steps (large fields paying many places) it samples finishing
+orders instead: Harville order is the order in which independent
+exponential clocks with rates = stacks go off, so each sample is one
+vectorised draw. Sampling uses a fixed seed, so nearby
+stack vectors (the outcomes of one decision) are compared on the same
+orders.
+
+Results are memoized per (stacks, payouts).
+
+Benchmark:
+    python -m bot.evaluation.icm
+"""
+
+import time
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from bot.config.constants import ICM_EXACT_STATES, ICM_SAMPLES, ICM_CACHE_SIZE
+
+
+ICM_SEED = 2024
+
+# above this many subset steps the exact walk runs on arrays
+DENSE_STATES = 2_000
+
+
+# ======================================================
+# EXACT (SUBSET DP)
+# ======================================================
+
+def harville_states(players, places):
+    """
+    Subset steps the exact mode takes for `players` and `places` paid.
+    """
+    return players * sum(comb(players, k) for k in range(min(places, players)))
+
+
+def _harville(stacks, payouts):
+
+    equity = [0.0] * len(stacks)
+    last = len(payouts) - 1
+
+    # placed players (bit mask) -> (probability, chips of the unplaced)
+    level = {0: (1.0, float(sum(stacks)))}
+
+    for place, prize in enumerate(payouts):
+        following = {}
+
+        for placed, (probability, left) in level.items():
+            scale = probability / left
+
+            for i, stack in enumerate(stacks):
+                if placed >> i & 1:
+                    continue
+
+                reach = scale * stack
+                equity[i] += reach * prize
+
+                if place < last:
+                    key = placed | 1 << i
+                    seen = following.get(key)
+                    following[key] = (reach, left - stack) if seen is None else (seen[0] + reach, seen[1])
+
+        level = following
+
+    return equity
+
+
+def _harville_dense(stacks, payouts):
+    """
+    _harville with each place's subsets as arrays (large fields).
+    """
+
+    stacks = np.asarray(stacks, dtype=np.float64)
+    bits = np.int64(1) << np.arange(len(stacks), dtype=np.int64)
+
+    placed = np.zeros(1, dtype=np.int64)
+    probability = np.ones(1)
+    left = np.array([stacks.sum()])
+
+    equity = np.zeros(len(stacks))
+    last = len(payouts) - 1
+
+    for place, prize in enumerate(payouts):
+        free = (placed[:, None] & bits) == 0
+        reach = np.where(free, (probability / left)[:, None] * stacks, 0.0)
+
+        equity += prize * reach.sum(axis=0)
+
+        if place == last:
+            break
+
+        rows, cols = np.nonzero(free)
+        placed, merged = np.unique(placed[rows] | bits[cols], return_inverse=True)
+
+        probability = np.bincount(merged, weights=reach[rows, cols], minlength=len(placed))
+
+        chips_left = np.empty(len(placed))
+        chips_left[merged] = left[rows] - stacks[cols]
+        left = chips_left
+
+    return equity.tolist()
+
+
+# ======================================================
+# SAMPLED (EXPONENTIAL RACES)
+# ======================================================
+
+def _sampled(stacks, payouts, samples=ICM_SAMPLES, seed=ICM_SEED):
+
+    rng = np.random.default_rng(seed)
+    rates = np.asarray(stacks, dtype=np.float64)
+
+    clocks = rng.standard_exponential((samples, len(rates))) / rates
+    order = np.argpartition(clocks, len(payouts) - 1, axis=1)[:, :len(payouts)]
+
+    # argpartition leaves the paid places unordered; sort just those
+    paid = np.take_along_axis(clocks, order, axis=1).argsort(axis=1)
+    order = np.take_along_axis(order, paid, axis=1)
+
+    equity = np.zeros(len(rates))
+    for place, prize in enumerate(payouts):
+        equity += prize * np.bincount(order[:, place], minlength=len(rates))
+
+    return (equity / samples).tolist()
+
+
+# ======================================================
+# PUBLIC
+# ======================================================
+
+@lru_cache(maxsize=ICM_CACHE_SIZE)
+def _equities(stacks, payouts):
+
+    alive = [i for i, s in enumerate(stacks) if s > 0]
+    live_stacks = [stacks[i] for i in alive]
+    payouts = payouts[:len(alive)]
+
+    if not payouts:
+        return (0.0,) * len(stacks)
+
+    states = harville_states(len(alive), len(payouts))
+
+    if states <= DENSE_STATES:
+        live = _harville(live_stacks, payouts)
+    elif states <= ICM_EXACT_STATES:
+        live = _harville_dense(live_stacks, payouts)
+    else:
+        live = _sampled(live_stacks, payouts)
+
+    equity = [0.0] * len(stacks)
+    for i, value in zip(alive, live):
+        equity[i] = value
+
+    return tuple(equity)
+
+
+def icm_equities(stacks, payouts):
+    """
+    Prize equity of every player (same order as stacks).
+    """
+    return _equities(tuple(stacks), tuple(payouts))
+
+
+def icm_equity(stacks, payouts, player):
+    """
+    Prize equity of stacks[player].
+    """
+    return _equities(tuple(stacks), tuple(payouts))[player]
+
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def _brute_force(stacks, payouts):
+    """
+    Harville summed over every finishing order (small fields only).
+    """
+
+    from itertools import permutations
+
+    equity = [0.0] * len(stacks)
+
+    for order in permutations(range(len(stacks))):
+        probability, left = 1.0, sum(stacks)
+
+        for place, player in enumerate(order):
+            probability *= stacks[player] / left
+            left -= stacks[player]
+
+        for place, player in enumerate(order[:len(payouts)]):
+            equity[player] += probability * payouts[place]
+
+    return equity
+
+
+def _benchmark():
+
+    rng = np.random.default_rng(7)
+
+    stacks = rng.integers(500, 5000, 7).tolist()
+    payouts = (0.5, 0.3, 0.2)
+    truth = _brute_force(stacks, payouts)
+    for walk in (_harville, _harville_dense):
+        error = max(abs(a - b) for a, b in zip(walk(stacks, payouts), truth))
+        print(f"{walk.__name__} vs every finishing order (7 players): max error {error:.2e}")
+
+    fields = [
+        (6, (0.65, 0.35)),
+        (9, (0.5, 0.3, 0.2)),
+        (18, (0.4, 0.3, 0.2, 0.1)),
+        (18, (0.25, 0.18, 0.14, 0.11, 0.09, 0.07, 0.06, 0.05, 0.05)),
+    ]
+
+    print(f"{'players':>7} {'paid':>4} {'mode':>7} {'cold us':>9} {'cached us':>9}")
+
+    for players, payouts in fields:
+        cases = [tuple(rng.integers(500, 5000, players).tolist()) for _ in range(200)]
+
+        exact = harville_states(players, len(payouts)) <= ICM_EXACT_STATES
+        runs = cases if exact else cases[:20]
+
+        _equities.cache_clear()
+        start = time.perf_counter()
+        for stacks in runs:
+            icm_equities(stacks, payouts)
+        cold = (time.perf_counter() - start) / len(runs) * 1e6
+
+        start = time.perf_counter()
+        for stacks in runs:
+            icm_equities(stacks, payouts)
+        cached = (time.perf_counter() - start) / len(runs) * 1e6
+
+        mode = "exact" if exact else "sampled"
+        print(f"{players:>7} {len(payouts):>4} {mode:>7} {cold:>9.1f} {cached:>9.2f}")
+
+        if not exact:
+            stacks = runs[0]
+            truth = _harville_dense(stacks, payouts)
+            error = max(abs(a - b) for a, b in zip(icm_equities(stacks, payouts), truth))
+            print(f"{'':>7} sampled vs exact: max error {error:.4f} (prize pool = 1)")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,327 @@
+# bot/evaluation/preflop_matchups.py
+
+"""
+Heads-up preflop all-in equity, exact over every five-card board.
+
+    combo_equity(hero, villain)   one combo against another (card ints)
+    combo_equity_matrix()         uint16[1326][1326], combo i vs combo j
+                                  (range_equity.COMBOS order) × 65535,
+                                  0 where the combos share a card
+
+    equity[i, j]   share of the pot class i gets all-in preflop against
+                   class j, over every pair of non-overlapping combos
+    combos[i, j]   combos of class j left once a combo of class i is
+                   dealt (card removal between the two hands)
+
+Ties split the pot, as chips do at showdown.
+
+A suit permutation of a matchup has the same equity, so the build only
+scores one representative combo per class against all 1326 combos, on
+all C(52,5) boards, and every other row is that row with the suits
+relabelled. The boards are cut into parts; each part's win counts are
+saved under bot/data/preflop_matchups.parts as soon as it finishes, the
+parts run on a process pool, and a rerun skips the parts already saved.
+
+File layout (little-endian), memory-mapped on first use:
+    header   MAGIC, version, classes, boards
+    body     uint16[169][169] equity × 65535, uint16[169][169] combos,
+             uint16[1326][1326] combo equity × 65535
+
+Build (resumable):
+    python -m bot.evaluation.preflop_matchups [workers]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, combinations, permutations
+from math import comb
+
+import numpy as np
+
+from bot.evaluation.hand_utils import HAND_CODES
+from bot.evaluation.range_equity import (
+    COMBOS, COMBO_BITS, COMBO_CLASS, COMBO_INDEX, COMBO_KEYS, COMBO_MASKS,
+)
+from bot.evaluation.vectorized import CARD_KEYS, SUIT_RANK_BITS, evaluate_keyed_batch
+
+
+MATRIX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "preflop_matchups.bin"
+)
+
+PARTS_DIR = MATRIX_PATH[:-len(".bin")] + ".parts"
+
+MAGIC = b"PFMX"
+VERSION = 2
+HEADER = struct.Struct("<4sHHI")
+
+EQUITY_SCALE = 65535
+
+BOARDS = comb(52, 5)
+BOARDS_PER_MATCHUP = comb(48, 5)
+
+PART_BOARDS = 100_000
+BUILD_CHUNK = 2_000
+
+CLASSES = len(HAND_CODES)
+COMBO_COUNT = len(COMBOS)
+
+
+# ======================================================
+# LOOKUP
+# ======================================================
+
+_tables = None
+_combo_equity = None
+_loaded = False
+
+
+def _load():
+
+    global _tables, _combo_equity, _loaded
+    _loaded = True
+
+    if not os.path.exists(MATRIX_PATH):
+        return
+
+    with open(MATRIX_PATH, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, classes, _ = HEADER.unpack_from(mapped, 0)
+
+    if magic != MAGIC or version != VERSION or classes != CLASSES:
+        return
+
+    body = np.frombuffer(mapped, dtype="<u2", offset=HEADER.size)
+    split = 2 * CLASSES * CLASSES
+
+    tables = body[:split].reshape(2, CLASSES, CLASSES)
+
+    _tables = (tables[0] / EQUITY_SCALE, tables[1].astype(np.float64))
+    _combo_equity = body[split:].reshape(COMBO_COUNT, COMBO_COUNT)
+
+
+def matchup_tables():
+    """
+    (equity, combos) as 169x169 float arrays indexed by grid index
+    (hand_utils.HAND_CODES), or None when the file is missing.
+    """
+
+    if not _loaded:
+        _load()
+
+    return _tables
+
+
+def combo_equity_matrix():
+    """
+    1326x1326 uint16 view of the file (equity × EQUITY_SCALE), or None
+    when the file is missing.
+    """
+
+    if not _loaded:
+        _load()
+
+    return _combo_equity
+
+
+def combo_equity(hero, villain):
+    """
+    Hero's all-in pot share against villain, both (card, card) ints;
+    None when the file is missing.
+    """
+
+    matrix = combo_equity_matrix()
+    if matrix is None:
+        return None
+
+    row = COMBO_INDEX[hero[0] * 52 + hero[1]]
+    column = COMBO_INDEX[villain[0] * 52 + villain[1]]
+
+    return matrix[row, column] / EQUITY_SCALE
+
+
+# ======================================================
+# BUILD
+# ======================================================
+
+def representative_combos():
+    """
+    First combo (range_equity.COMBOS order) of every class.
+    """
+
+    first = np.full(CLASSES, -1, dtype=np.int64)
+
+    for combo in range(COMBO_COUNT - 1, -1, -1):
+        first[COMBO_CLASS[combo]] = combo
+
+    return first
+
+
+@lru_cache(maxsize=1)
+def all_boards():
+    """
+    Every five-card board, int8 (C(52,5), 5), in lexicographic order.
+    """
+
+    cards = chain.from_iterable(combinations(range(52), 5))
+    return np.fromiter(cards, dtype=np.int8, count=5 * BOARDS).reshape(BOARDS, 5)
+
+
+def part_count():
+    return -(-BOARDS // PART_BOARDS)
+
+
+def score_boards(boards):
+    """
+    int64 (169, 1326): twice the pot share (win 2, tie 1) each class
+    representative wins against each combo, summed over `boards`.
+    """
+
+    reps = representative_combos()
+    won = np.zeros((CLASSES, COMBO_COUNT), dtype=np.int64)
+
+    for start in range(0, len(boards), BUILD_CHUNK):
+        drawn = boards[start:start + BUILD_CHUNK].astype(np.int64)
+
+        values = evaluate_keyed_batch(
+            CARD_KEYS[drawn].sum(axis=1)[:, None] + COMBO_KEYS,
+            SUIT_RANK_BITS[drawn].sum(axis=1)[:, None] + COMBO_BITS
+        )
+        board_mask = np.bitwise_or.reduce(np.int64(1) << drawn, axis=1)
+        valid = (COMBO_MASKS & board_mask[:, None]) == 0
+
+        # dense int16 strength ranks (half the memory traffic of the
+        # values); a combo using a board card ranks above everything,
+        # a hero using one below everything, so neither scores
+        _, ranks = np.unique(values, return_inverse=True)
+        ranks = np.where(valid, ranks.reshape(values.shape), np.iinfo(np.int16).max).astype(np.int16)
+
+        heroes = np.where(valid[:, reps], ranks[:, reps], -1).astype(np.int16)
+
+        for i in range(CLASSES):
+            hero = heroes[:, i:i + 1]
+            won[i] += (ranks < hero).sum(axis=0) + (ranks <= hero).sum(axis=0)
+
+    return won
+
+
+def _part_path(part):
+    return os.path.join(PARTS_DIR, f"part_{part:03d}.npy")
+
+
+def _build_part(part):
+
+    start = part * PART_BOARDS
+    won = score_boards(all_boards()[start:start + PART_BOARDS])
+
+    # saved aside and renamed, so an interrupted build never leaves a
+    # half-written part behind
+    temp = f"{_part_path(part)}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        np.save(f, won.astype(np.int32))
+    os.replace(temp, _part_path(part))
+
+    return part
+
+
+def suit_permutations():
+    """
+    (24, 1326): combo index of every combo under each suit relabelling.
+    """
+
+    table = []
+
+    for perm in permutations(range(4)):
+        cards = COMBOS // 4 * 4 + np.array(perm)[COMBOS % 4]
+        table.append(COMBO_INDEX[cards[:, 0] * 52 + cards[:, 1]])
+
+    return np.array(table)
+
+
+def expand_rows(rows):
+    """
+    (169, 1326) representative rows -> (1326, 1326): the row of combo h
+    is its class row with suits relabelled onto h.
+    """
+
+    reps = representative_combos()
+    relabel = suit_permutations()
+
+    matrix = np.zeros((COMBO_COUNT, COMBO_COUNT), dtype=rows.dtype)
+
+    for h in range(COMBO_COUNT):
+        c = COMBO_CLASS[h]
+        perm = relabel[(relabel[:, reps[c]] == h).argmax()]
+        matrix[h, perm] = rows[c]
+
+    return matrix
+
+
+def merge_parts(won):
+    """
+    Summed win counts -> (equity, combos, combo equity matrix).
+    """
+
+    reps = representative_combos()
+
+    # villain combos sharing a card with the representative never meet it
+    disjoint = (COMBO_MASKS[reps][:, None] & COMBO_MASKS) == 0
+
+    rows = np.where(disjoint, won / (2 * BOARDS_PER_MATCHUP), 0.0)
+
+    combos = np.stack([
+        np.bincount(COMBO_CLASS, weights=disjoint[i], minlength=CLASSES) for i in range(CLASSES)
+    ])
+    class_won = np.stack([
+        np.bincount(COMBO_CLASS, weights=rows[i], minlength=CLASSES) for i in range(CLASSES)
+    ])
+
+    equity = class_won / combos
+
+    return equity, combos, expand_rows(rows)
+
+
+def build_matrix(workers=None, path=MATRIX_PATH):
+
+    os.makedirs(PARTS_DIR, exist_ok=True)
+
+    todo = [p for p in range(part_count()) if not os.path.exists(_part_path(p))]
+    done = part_count() - len(todo)
+
+    print(f"[PREFLOP MATCHUPS] {BOARDS} boards in {part_count()} parts, {done} already saved")
+
+    start = time.perf_counter()
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            for part in pool.map(_build_part, todo):
+                done += 1
+                elapsed = time.perf_counter() - start
+                print(f"  part {part:3d} saved ({done}/{part_count()}, {elapsed:.0f}s)")
+
+    won = sum(np.load(_part_path(p)).astype(np.int64) for p in range(part_count()))
+    equity, combos, matrix = merge_parts(won)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, CLASSES, BOARDS))
+        f.write(np.round(equity * EQUITY_SCALE).astype("<u2").tobytes())
+        f.write(combos.astype("<u2").tobytes())
+        f.write(np.round(matrix * EQUITY_SCALE).astype("<u2").tobytes())
+
+    for p in range(part_count()):
+        os.remove(_part_path(p))
+    os.rmdir(PARTS_DIR)
+
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    build_matrix(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,354 @@
+# bot/evaluation/range_equity.py
+
+"""
+Hero equity against a weighted opponent range.
+
+A range is a float array over the 1326 two-card combos (COMBOS), e.g.
+from a HandRange of bot.strategy.preflop.ranges:
+
+    weights = OPEN_RANGES["UTG"]["raise"].weights()
+    estimate = equity_vs_range(hero_ints, board_ints, weights)
+
+Card removal is exact: combos that share a card with hero, the board or
+the runout get no weight on that runout.
+
+Every combo is scored on the same runouts, so the per-board part
+(runouts and all 1326 opponent values) is built once per board and
+kept; a hero query then only scores hero's own hand on each runout and
+takes one weighted sum. Turn and river enumerate every runout; the flop
+scores RANGE_EQUITY_RUNOUTS sampled turn/river pairs.
+
+range_vs_range(weights, other, board) compares two whole ranges on a
+board (equity, per-combo equity distribution and nut share), cached per
+canonical board.
+
+Ties count as wins, as everywhere else in bot.evaluation.
+"""
+
+from collections import OrderedDict, namedtuple
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from bot.config.constants import (
+    RANGE_EQUITY_RUNOUTS,
+    RANGE_BOARDS_KEPT,
+    RANGE_MATCHUPS_KEPT,
+    RANGE_NUT_SHARE_TOP,
+)
+from bot.evaluation.canonical import canonicalize
+from bot.evaluation.cards import card_mask
+from bot.evaluation.equity_cache import EquityCache, EquityEstimate
+from bot.evaluation.hand_utils import HAND_CODE_INDEX, hand_code_index, normalize_ints
+from bot.evaluation.vectorized import (
+    CARD_KEYS,
+    SUIT_RANK_BITS,
+    deal_batch,
+    evaluate_keyed_batch,
+)
+
+
+_RNG = np.random.default_rng()
+
+
+def reseed(seed):
+    """
+    Restart the module's sampler from `seed` (seeded simulations).
+    """
+
+    global _RNG
+    _RNG = np.random.default_rng(seed)
+
+
+# ======================================================
+# COMBOS
+# ======================================================
+# Combo i is the card pair COMBOS[i] (low card first).
+
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.int64)
+
+COMBO_MASKS = (np.int64(1) << COMBOS[:, 0]) | (np.int64(1) << COMBOS[:, 1])
+COMBO_KEYS = CARD_KEYS[COMBOS].sum(axis=1)
+COMBO_BITS = SUIT_RANK_BITS[COMBOS].sum(axis=1)
+
+# 13x13 grid index (hand_utils.HAND_CODES) of every combo
+COMBO_CLASS = np.array(
+    [HAND_CODE_INDEX[normalize_ints(pair)] for pair in COMBOS.tolist()],
+    dtype=np.int64
+)
+
+# c1 * 52 + c2 -> combo index, either card order (-1 on the diagonal)
+COMBO_INDEX = np.full(52 * 52, -1, dtype=np.int64)
+COMBO_INDEX[COMBOS[:, 0] * 52 + COMBOS[:, 1]] = np.arange(len(COMBOS))
+COMBO_INDEX[COMBOS[:, 1] * 52 + COMBOS[:, 0]] = np.arange(len(COMBOS))
+
+
+def combo_index(hole_cards) -> int:
+    c1, c2 = hole_cards
+    return int(COMBO_INDEX[c1 * 52 + c2])
+
+
+def range_weights(hands):
+    """
+    1326 combo weights from hand codes.
+
+    hands: iterable of codes ({"AA", "AKs", ...}, weight 1 each) or a
+           dict code -> weight (e.g. {"AKo": 0.5}).
+
+    Raises ValueError on a code that is not a normalized hand code.
+    """
+
+    classes = np.zeros(len(HAND_CODE_INDEX))
+
+    items = hands.items() if isinstance(hands, dict) else ((h, 1.0) for h in hands)
+    for code, weight in items:
+        classes[hand_code_index(code)] = weight
+
+    return classes[COMBO_CLASS]
+
+
+def live_weights(weights, dead_mask):
+    """
+    weights with every combo that uses a card of dead_mask zeroed.
+    """
+    return np.where((COMBO_MASKS & dead_mask) == 0, weights, 0.0)
+
+
+# ======================================================
+# PER-BOARD RUNOUTS
+# ======================================================
+
+class BoardRunouts:
+    """
+    Runouts of one board with every combo's hand value on each.
+    """
+
+    def __init__(self, board, runouts=RANGE_EQUITY_RUNOUTS, rng=None):
+
+        if rng is None:
+            rng = _RNG
+
+        self.board = tuple(board)
+        board_mask = card_mask(board)
+
+        deck = np.array([c for c in range(52) if not board_mask >> c & 1], dtype=np.int64)
+        need = 5 - len(board)
+
+        self.exact = comb(len(deck), need) <= runouts
+
+        if self.exact:
+            runs = list(combinations(deck.tolist(), need))
+            drawn = np.array(runs, dtype=np.int64).reshape(len(runs), need)
+        else:
+            drawn = deal_batch(deck, need, runouts, rng)
+
+        self.board_key = int(CARD_KEYS[list(board)].sum()) + CARD_KEYS[drawn].sum(axis=1)
+        self.board_bits = int(SUIT_RANK_BITS[list(board)].sum()) + SUIT_RANK_BITS[drawn].sum(axis=1)
+
+        # 52-bit mask of each runout's cards
+        self.runout_mask = np.bitwise_or.reduce(np.int64(1) << drawn, axis=1)
+
+        # (runouts, 1326): combo value and whether the combo is possible
+        self.values = evaluate_keyed_batch(
+            self.board_key[:, None] + COMBO_KEYS,
+            self.board_bits[:, None] + COMBO_BITS
+        )
+        self.valid = (COMBO_MASKS & (self.runout_mask[:, None] | board_mask)) == 0
+
+    def __len__(self):
+        return len(self.runout_mask)
+
+    def hero_values(self, hole):
+        """
+        (rows, values): runouts that leave hero's cards alone and hero's
+        value on each.
+        """
+
+        rows = np.flatnonzero((self.runout_mask & card_mask(hole)) == 0)
+
+        values = evaluate_keyed_batch(
+            self.board_key[rows] + CARD_KEYS[list(hole)].sum(),
+            self.board_bits[rows] + SUIT_RANK_BITS[list(hole)].sum()
+        )
+
+        return rows, values
+
+
+_boards = OrderedDict()
+
+
+def board_runouts(board):
+    """
+    BoardRunouts for `board`, kept for the RANGE_BOARDS_KEPT most recent
+    boards.
+    """
+
+    key = tuple(sorted(board))
+    runouts = _boards.get(key)
+
+    if runouts is None:
+        runouts = BoardRunouts(key)
+        _boards[key] = runouts
+
+        if len(_boards) > RANGE_BOARDS_KEPT:
+            _boards.popitem(last=False)
+
+    _boards.move_to_end(key)
+    return runouts
+
+
+# ======================================================
+# EQUITY
+# ======================================================
+
+def equity_vs_range(hole, board, weights):
+    """
+    Hero equity (int cards) against one opponent holding a combo drawn
+    from `weights`.
+
+    Returns an EquityEstimate; samples = runouts scored, method "range"
+    (every runout) or "range_sampled". None when card removal leaves no
+    combo of the range.
+    """
+
+    runouts = board_runouts(board)
+    rows, hero = runouts.hero_values(hole)
+
+    weights = live_weights(weights, card_mask(hole))
+    possible = runouts.valid[rows]
+
+    total = possible.sum(axis=0) @ weights
+    if total == 0:
+        return None
+
+    won = (possible & (hero[:, None] >= runouts.values[rows])).sum(axis=0) @ weights
+
+    method = "range" if runouts.exact else "range_sampled"
+    return EquityEstimate(float(won / total), len(rows), method)
+
+
+# ======================================================
+# RANGE VS RANGE
+# ======================================================
+
+# equity:       win-or-tie probability of a combo of the first range
+#               against a combo of the second, over the runouts
+# distribution: weighted share of the first range in each tenth of
+#               per-combo equity (0-10%, ..., 90-100%)
+# nut_share:    first range's share of the hands in the top
+#               RANGE_NUT_SHARE_TOP of both ranges on the current board,
+#               each range counted with equal total weight (0.5 = even)
+RangeMatchup = namedtuple("RangeMatchup", ["equity", "distribution", "nut_share"])
+
+EQUITY_BUCKETS = 10
+
+# hand values stay below 1 << 24, so rows can be laid end to end
+_ROW_SHIFT = 26
+
+RANGE_MATCHUPS = EquityCache(maxsize=RANGE_MATCHUPS_KEPT)
+
+
+def clear_caches():
+    """
+    Forget the scored matchups and board runouts (a fresh game).
+    """
+
+    RANGE_MATCHUPS.clear()
+    _boards.clear()
+
+
+def range_vs_range(weights, other, board):
+    """
+    RangeMatchup of `weights` against `other` on `board` (int cards,
+    3-5 cards).
+
+    Both ranges must be suit-symmetric (as range_weights builds them),
+    so the result is cached per canonical board. Card removal against the
+    board and runout is exact; blockers between the two ranges are
+    ignored.
+    """
+
+    key = (canonicalize((), board)[1], hash(weights.tobytes()), hash(other.tobytes()))
+
+    matchup = RANGE_MATCHUPS.get(key)
+    if matchup is None:
+        # scored on the board as dealt, sharing its runouts with
+        # equity_vs_range
+        matchup = _range_vs_range(weights, other, tuple(sorted(board)))
+        RANGE_MATCHUPS.put(key, matchup)
+
+    return matchup
+
+
+def _range_vs_range(weights, other, board):
+
+    board_mask = card_mask(board)
+    weights = live_weights(weights, board_mask)
+    other = live_weights(other, board_mask)
+
+    mine = np.flatnonzero(weights)
+    theirs = np.flatnonzero(other)
+
+    if not len(mine) or not len(theirs):
+        return None
+
+    runouts = board_runouts(board)
+    rows = len(runouts)
+
+    # opponent combos sorted by value within each runout, rows laid end
+    # to end so one searchsorted ranks every (runout, combo) pair
+    their_values = runouts.values[:, theirs]
+    their_weights = np.where(runouts.valid[:, theirs], other[theirs], 0.0)
+
+    order = their_values.argsort(axis=1)
+    offsets = np.arange(rows, dtype=np.int64)[:, None] << _ROW_SHIFT
+
+    ranked = (np.take_along_axis(their_values, order, axis=1) + offsets).ravel()
+    cumulative = np.take_along_axis(their_weights, order, axis=1).cumsum(axis=1)
+
+    my_values = runouts.values[:, mine] + offsets
+    beaten = np.searchsorted(ranked, my_values.ravel(), side="right").reshape(my_values.shape)
+    beaten -= np.arange(rows)[:, None] * len(theirs)
+
+    padded = np.hstack([np.zeros((rows, 1)), cumulative])
+    won = np.take_along_axis(padded, beaten, axis=1)
+
+    possible = runouts.valid[:, mine]
+    won = np.where(possible, won, 0.0).sum(axis=0)
+    total = (possible * cumulative[:, -1:]).sum(axis=0)
+
+    combo_equity = np.divide(won, total, out=np.zeros_like(won), where=total > 0)
+
+    my_weights = weights[mine]
+    equity = float(my_weights @ won / (my_weights @ total))
+
+    buckets = np.minimum((combo_equity * EQUITY_BUCKETS).astype(np.int64), EQUITY_BUCKETS - 1)
+    distribution = np.bincount(buckets, weights=my_weights, minlength=EQUITY_BUCKETS)
+    distribution = tuple((distribution / my_weights.sum()).tolist())
+
+    return RangeMatchup(equity, distribution, _nut_share(weights, other, board))
+
+
+def _nut_share(weights, other, board):
+
+    current = evaluate_keyed_batch(
+        int(CARD_KEYS[list(board)].sum()) + COMBO_KEYS,
+        int(SUIT_RANK_BITS[list(board)].sum()) + COMBO_BITS
+    )
+
+    mine = weights / weights.sum()
+    theirs = other / other.sum()
+
+    # strongest first; the cut-off value is where the pooled weight
+    # reaches the top share, and every combo tying it counts
+    order = np.argsort(-current, kind="stable")
+    pooled = ((mine + theirs) / 2)[order].cumsum()
+
+    cut = current[order[np.searchsorted(pooled, RANGE_NUT_SHARE_TOP)]]
+    top = current >= cut
+
+    my_nuts = mine[top].sum()
+    their_nuts = theirs[top].sum()
+
+    return float(my_nuts / (my_nuts + their_nuts))
@@ -0,0 +1,321 @@
+# bot/evaluation/range_notation.py
+
+"""
+Standard range notation -> HandRange.
+
+    parse_range("22+, A2s+, KTo+, 76s-T9s")
+
+Tokens (comma and / or space separated):
+
+    AA  AKs  AKo  AK     one hand class (AK = AKs and AKo)
+    77+                  77 up to AA
+    A2s+  KTo+  KT+      kicker up to one below the high card
+    22-55                pairs in between
+    A2s-A5s              same high card, kickers in between
+    76s-T9s              same gap, both cards stepping up together
+
+Ranks are 23456789TJQKA, high card first. Anything else (lower-case
+ranks, 'QKs', 'AAs', '72s-T9s' with mismatched gaps) raises ValueError,
+so every code that reaches a table is canonical.
+
+compile_ranges() turns a nested table of notation strings into the same
+table of HandRange leaves, reading the compiled bits from
+bot/data/compiled_ranges.json. Each table is stored with a digest of
+its notation: an unchanged table is read back without parsing, an
+edited one is parsed in memory until the cache is rebuilt (imports
+never write the file; tests/test_range_notation.py fails while it is
+stale).
+
+Rebuild the cache after editing a range table:
+    python -m bot.evaluation.range_notation
+"""
+
+import hashlib
+import json
+import os
+
+from bot.evaluation.hand_range import HandRange
+from bot.evaluation.hand_utils import RANK_ORDER, HAND_CODE_INDEX
+
+
+RANGE_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "compiled_ranges.json"
+)
+
+CACHE_VERSION = 1
+
+
+# ======================================================
+# PARSING
+# ======================================================
+
+def _rank(char, token):
+
+    if char not in RANK_ORDER:
+        raise ValueError(f"bad rank {char!r} in {token!r}")
+
+    return RANK_ORDER.index(char)
+
+
+def _hand(text, token):
+    """
+    'AKs' -> (12, 11, 's'); 'AK' -> (12, 11, ''); '77' -> (5, 5, '').
+    """
+
+    if len(text) not in (2, 3):
+        raise ValueError(f"bad hand {text!r} in {token!r}")
+
+    high = _rank(text[0], token)
+    low = _rank(text[1], token)
+    suffix = text[2:]
+
+    if suffix not in ("", "s", "o"):
+        raise ValueError(f"bad suffix {suffix!r} in {token!r}")
+
+    if high == low and suffix:
+        raise ValueError(f"pair {text!r} takes no suffix in {token!r}")
+
+    if high < low:
+        raise ValueError(
+            f"non-canonical {text!r} in {token!r} "
+            f"(high card first: {text[1]}{text[0]}{suffix})"
+        )
+
+    return high, low, suffix
+
+
+def _codes(high, low, suffix):
+
+    if high == low:
+        return [RANK_ORDER[high] * 2]
+
+    base = RANK_ORDER[high] + RANK_ORDER[low]
+    return [base + s for s in (suffix or "so")]
+
+
+def _token_codes(token):
+
+    if token.endswith("+"):
+        high, low, suffix = _hand(token[:-1], token)
+
+        if high == low:
+            return [RANK_ORDER[r] * 2 for r in range(low, 13)]
+
+        return [c for k in range(low, high) for c in _codes(high, k, suffix)]
+
+    if "-" in token:
+        first, last = token.split("-", 1)
+        h1, l1, s1 = _hand(first, token)
+        h2, l2, s2 = _hand(last, token)
+
+        if s1 != s2:
+            raise ValueError(f"suffixes differ in {token!r}")
+
+        # pairs
+        if h1 == l1 and h2 == l2:
+            lo, hi = sorted((h1, h2))
+            return [RANK_ORDER[r] * 2 for r in range(lo, hi + 1)]
+
+        # same high card, kickers in between
+        if h1 == h2 and l1 != h1 and l2 != h2:
+            lo, hi = sorted((l1, l2))
+            return [c for k in range(lo, hi + 1) for c in _codes(h1, k, s1)]
+
+        # same gap, stepping up together
+        if h1 - l1 == h2 - l2 and h1 != l1:
+            lo, hi = sorted((l1, l2))
+            gap = h1 - l1
+            return [c for k in range(lo, hi + 1) for c in _codes(k + gap, k, s1)]
+
+        raise ValueError(f"ends of {token!r} do not span a range")
+
+    return _codes(*_hand(token, token))
+
+
+def parse_range(text):
+    """
+    Notation string -> HandRange. Raises ValueError on any bad token.
+    """
+
+    bits = 0
+
+    for token in text.replace(",", " ").split():
+        for code in _token_codes(token):
+            bits |= 1 << HAND_CODE_INDEX[code]
+
+    return HandRange(bits)
+
+
+# ======================================================
+# FORMATTING
+# ======================================================
+
+def _runs(values):
+
+    runs = []
+    for v in sorted(values):
+        if runs and v == runs[-1][1] + 1:
+            runs[-1][1] = v
+        else:
+            runs.append([v, v])
+
+    return runs
+
+
+def format_range(hand_range):
+    """
+    HandRange -> compact notation (pairs, then each high card from A
+    down, suited before offsuit). parse_range(format_range(r)) == r.
+    """
+
+    codes = set(hand_range)
+    tokens = []
+
+    pairs = [r for r in range(13) if RANK_ORDER[r] * 2 in codes]
+    for lo, hi in reversed(_runs(pairs)):
+        a, b = RANK_ORDER[lo] * 2, RANK_ORDER[hi] * 2
+        tokens.append(a + "+" if hi == 12 and lo != hi else a if lo == hi else f"{b}-{a}")
+
+    for high in range(12, 0, -1):
+        for suffix in "so":
+            kickers = [
+                k for k in range(high)
+                if RANK_ORDER[high] + RANK_ORDER[k] + suffix in codes
+            ]
+
+            for lo, hi in reversed(_runs(kickers)):
+                a = RANK_ORDER[high] + RANK_ORDER[lo] + suffix
+                b = RANK_ORDER[high] + RANK_ORDER[hi] + suffix
+
+                if lo == hi:
+                    tokens.append(a)
+                elif hi == high - 1:
+                    tokens.append(a + "+")
+                else:
+                    tokens.append(f"{b}-{a}")
+
+    return ", ".join(tokens)
+
+
+# ======================================================
+# COMPILED TABLES (DISK CACHE)
+# ======================================================
+
+_caches = {}
+
+
+def _load_cache(path):
+
+    cache = _caches.get(path)
+
+    if cache is None:
+        try:
+            with open(path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+
+        if cache.get("version") != CACHE_VERSION:
+            cache = {"version": CACHE_VERSION, "tables": {}}
+
+        _caches[path] = cache
+
+    return cache
+
+
+def _parse_table(table):
+    return {
+        key: _parse_table(value) if isinstance(value, dict) else parse_range(value)
+        for key, value in table.items()
+    }
+
+
+def _to_json(table):
+    return {
+        key: _to_json(value) if isinstance(value, dict) else f"{value.bits:#x}"
+        for key, value in table.items()
+    }
+
+
+def _from_json(table):
+    return {
+        key: _from_json(value) if isinstance(value, dict) else HandRange(int(value, 16))
+        for key, value in table.items()
+    }
+
+
+def _digest(table):
+    return hashlib.sha1(json.dumps(table, sort_keys=True).encode()).hexdigest()
+
+
+# name -> notation table of every compile_ranges() call in this process
+_tables = {}
+
+
+def compile_ranges(name, table, path=RANGE_CACHE_PATH):
+    """
+    Nested dict of notation strings -> same dict with HandRange leaves,
+    read from the cache at `path` while the notation is unchanged, else
+    parsed in memory. Nothing is written here; build_cache() refreshes
+    the file.
+    """
+
+    _tables[name] = table
+
+    entry = _load_cache(path)["tables"].get(name)
+
+    if entry is not None and entry["digest"] == _digest(table):
+        return _from_json(entry["ranges"])
+
+    return _parse_table(table)
+
+
+def _register_tables():
+    # every compiled table of the bot is declared at import time here
+    import bot.strategy.preflop.ranges  # noqa: F401
+
+
+def stale_tables(path=RANGE_CACHE_PATH):
+    """
+    Names of the bot's tables whose cached bits are missing or were
+    compiled from different notation.
+    """
+
+    _register_tables()
+
+    _caches.pop(path, None)
+    entries = _load_cache(path)["tables"]
+
+    return sorted(
+        name for name, table in _tables.items()
+        if entries.get(name, {}).get("digest") != _digest(table)
+    )
+
+
+def build_cache(path=RANGE_CACHE_PATH):
+
+    _register_tables()
+
+    cache = {
+        "version": CACHE_VERSION,
+        "tables": {
+            name: {"digest": _digest(table), "ranges": _to_json(_parse_table(table))}
+            for name, table in _tables.items()
+        },
+    }
+
+    # written aside and renamed, so a process importing concurrently
+    # never reads half a file
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(temp, path)
+
+    print(f"Saved {len(_tables)} tables to {path}")
+
+
+if __name__ == "__main__":
+    # through the package module, whose registry the range tables fill
+    from bot.evaluation.range_notation import build_cache as build
+
+    build()
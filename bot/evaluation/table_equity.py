@@ -0,0 +1,302 @@
+# bot/evaluation/table_equity.py
+
+"""
+Table-scoped equity shared by every bot at one table.
+
+Bots at a table keep asking about the same board with the same player
+count (the legacy bots all use len(round_state['seats'])), so one
+TableEquity per game:
+
+- answers repeated spots from one EquityCache keyed by canonical cards,
+  player count and showdown rules (WorldClassBot's estimates go to the
+  same cache while the table is installed; the rules in the key keep
+  them apart from the legacy bots')
+- scores showdowns under LEGACY_SHOWDOWN_RULES: the legacy bots want
+  the engine's estimate_hole_card_win_rate, so by default a hand wins
+  when pypokerengine would pay it, hole card kickers and all
+  (bot/evaluation/evaluator.py). Under engine rules preflop spots are
+  sampled too, as the 169-class table is scored by standard rules.
+- keeps a SampleSet per (board, opponents): runouts and opponent
+  holdings dealt once with every opponent's hand scored once. A hero
+  query only scores its own hand on the rows that do not use its cards,
+  which is an exact sample of the remaining deck.
+- sends what is left (the misses) to its EquityService, if it has one:
+  sample sets are dealt and scored in chunks on the service's workers
+
+    table = TableEquity()
+    install_table(table)
+    ...  # play the game
+    install_table(None)
+    print(table.report())
+"""
+
+from collections import OrderedDict
+from math import comb
+
+import numpy as np
+
+from bot.config.constants import LEGACY_SHOWDOWN_RULES
+from bot.evaluation.canonical import canonicalize
+from bot.evaluation.equity_cache import EquityCache, EquityEstimate, EQUITY_CACHE
+from bot.evaluation.hand_utils import normalize_ints
+from bot.evaluation.preflop_table import preflop_equity
+from bot.evaluation.vectorized import (
+    CARD_KEYS,
+    SUIT_RANK_BITS,
+    deal_batch,
+    score_hands,
+    simulate_wins_batch,
+)
+
+
+# boards kept per table (a hand only ever has three)
+SAMPLE_SETS_KEPT = 8
+
+# extra rows dealt over the expected need, so most heroes fit
+SAMPLE_HEADROOM = 1.25
+
+
+_RNG = np.random.default_rng()
+
+
+def reseed(seed):
+    """
+    Restart the module's sampler from `seed` (seeded simulations).
+    """
+
+    global _RNG
+    _RNG = np.random.default_rng(seed)
+
+
+# ======================================================
+# SHARED SAMPLES
+# ======================================================
+
+def sample_rows(board, opponents, rows, rng=None, rules="standard"):
+    """
+    Deal `rows` (runout, opponent holdings) rows for `board` and score
+    every opponent under `rules`: (board_key, board_mask, best_opponent,
+    row_cards) arrays, one entry per row.
+    """
+
+    if rng is None:
+        rng = _RNG
+
+    deck = np.array([c for c in range(52) if c not in board], dtype=np.int64)
+
+    need = 5 - len(board)
+    drawn = deal_batch(deck, need + 2 * opponents, rows, rng)
+
+    runouts = drawn[:, :need]
+    holes = drawn[:, need:].reshape(rows, opponents, 2)
+
+    board_key = int(CARD_KEYS[list(board)].sum()) + CARD_KEYS[runouts].sum(axis=1)
+    board_mask = int(SUIT_RANK_BITS[list(board)].sum()) + SUIT_RANK_BITS[runouts].sum(axis=1)
+
+    best_opponent = score_hands(
+        board_key[:, None] + CARD_KEYS[holes].sum(axis=2),
+        board_mask[:, None] + SUIT_RANK_BITS[holes].sum(axis=2),
+        holes,
+        rules
+    ).max(axis=1)
+
+    # 52-bit mask of the cards each row deals
+    row_cards = np.bitwise_or.reduce(np.int64(1) << drawn, axis=1)
+
+    return board_key, board_mask, best_opponent, row_cards
+
+
+class SampleSet:
+    """
+    Rows of (runout, opponent holdings) for one board, with the best
+    opponent value per row already scored. With an EquityService the
+    rows are dealt and scored on its workers.
+    """
+
+    def __init__(self, board, opponents, rows, rng=None, service=None, rules="standard"):
+
+        self.board = tuple(board)
+        self.opponents = opponents
+        self.rules = rules
+
+        if service is not None:
+            parts = service.sample_rows(self.board, opponents, rows, rules)
+        else:
+            parts = [sample_rows(self.board, opponents, rows, rng, rules)]
+
+        self.board_key, self.board_mask, self.best_opponent, self.row_cards = (
+            np.concatenate(arrays) for arrays in zip(*parts)
+        )
+
+    def __len__(self):
+        return len(self.row_cards)
+
+    def wins(self, hole, trials):
+        """
+        (wins, trials) over the first `trials` rows that leave hero's
+        cards alone, or None if there are not enough such rows.
+        """
+
+        hero_cards = (1 << hole[0]) | (1 << hole[1])
+        rows = np.flatnonzero((self.row_cards & hero_cards) == 0)[:trials]
+
+        if len(rows) < trials:
+            return None
+
+        hero = score_hands(
+            self.board_key[rows] + CARD_KEYS[list(hole)].sum(),
+            self.board_mask[rows] + SUIT_RANK_BITS[list(hole)].sum(),
+            list(hole),
+            self.rules
+        )
+
+        return int((hero >= self.best_opponent[rows]).sum()), trials
+
+
+def rows_for(board_len, opponents, trials):
+    """
+    Rows to deal so `trials` of them are expected to miss hero's cards.
+    """
+
+    deck = 52 - board_len
+    draw = 5 - board_len + 2 * opponents
+    clean = comb(deck - 2, draw) / comb(deck, draw)
+
+    return int(trials / clean * SAMPLE_HEADROOM) + 1
+
+
+# ======================================================
+# TABLE
+# ======================================================
+
+class TableEquity:
+
+    def __init__(self, service=None, rules=LEGACY_SHOWDOWN_RULES):
+
+        # optional EquityService: computes every cache miss (preflop
+        # table misses and the sample sets behind postflop queries)
+        self.service = service
+        self.rules = rules
+
+        self.cache = EquityCache()
+        self.sample_sets = OrderedDict()
+
+        self.requests = 0
+        self.computed = 0
+        self.sets_built = 0
+        self.sets_reused = 0
+
+    def win_rate(self, hole, board, players, simulations):
+        """
+        hole / board: int cards. Win (or tie) probability against
+        players - 1 random hands.
+        """
+
+        self.requests += 1
+
+        if players <= 1:
+            return 1.0
+
+        key = (*canonicalize(hole, board), players, simulations, None, self.rules)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.equity
+
+        self.computed += 1
+        equity = self._compute(list(hole), list(board), players, simulations)
+
+        self.cache.put(key, EquityEstimate(equity, simulations, "table_shared"))
+
+        return equity
+
+    def _compute(self, hole, board, players, simulations):
+
+        opponents = players - 1
+
+        if not board:
+            if self.rules == "standard":
+                table_equity = preflop_equity(normalize_ints(hole), players)
+                if table_equity is not None:
+                    return table_equity
+
+            if self.service is not None:
+                return self.service.win_rate(hole, board, players, simulations, self.rules)
+
+            return simulate_wins_batch(hole, board, opponents, simulations, rules=self.rules) / simulations
+
+        result = self._sample_set(board, opponents, simulations).wins(hole, simulations)
+
+        if result is None:
+            # unlucky overlap with hero's cards: deal a bigger set
+            result = self._sample_set(board, opponents, simulations, grow=True).wins(hole, simulations)
+
+        wins, trials = result
+        return wins / trials
+
+    def _sample_set(self, board, opponents, simulations, grow=False):
+
+        key = (tuple(sorted(board)), opponents)
+        samples = self.sample_sets.get(key)
+
+        needed = rows_for(len(board), opponents, simulations)
+
+        if samples is not None and len(samples) >= needed and not grow:
+            self.sets_reused += 1
+            self.sample_sets.move_to_end(key)
+            return samples
+
+        rows = max(needed, 2 * len(samples)) if samples is not None else needed
+        samples = SampleSet(board, opponents, rows, service=self.service, rules=self.rules)
+        self.sets_built += 1
+
+        self.sample_sets[key] = samples
+        self.sample_sets.move_to_end(key)
+
+        if len(self.sample_sets) > SAMPLE_SETS_KEPT:
+            self.sample_sets.popitem(last=False)
+
+        return samples
+
+    @property
+    def dedupe_ratio(self):
+        """
+        Equity requests per computation actually run.
+        """
+        return self.requests / self.computed if self.computed else 0.0
+
+    def report(self):
+        return (
+            f"[TABLE EQUITY] {self.requests} requests, {self.computed} computed "
+            f"(dedupe ratio {self.dedupe_ratio:.2f}), "
+            f"cache hits {self.cache.hits}, "
+            f"sample sets {self.sets_built} built / {self.sets_reused} reused"
+        )
+
+
+# ======================================================
+# INSTALLED TABLE
+# ======================================================
+
+_table = None
+
+
+def install_table(table):
+    """
+    Route legacy-bot and bot.evaluation.equity queries through `table`
+    (None = back to the process-wide EQUITY_CACHE).
+    """
+
+    global _table
+    _table = table
+
+
+def current_table():
+    return _table
+
+
+def active_cache():
+    """
+    The installed table's cache, else the process-wide EQUITY_CACHE.
+    """
+    return _table.cache if _table is not None else EQUITY_CACHE
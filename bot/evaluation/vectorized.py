@@ -0,0 +1,358 @@
+# bot/evaluation/vectorized.py
+
+"""
+NumPy batched Monte Carlo equity.
+
+Every trial is dealt at once from a shuffled deck matrix and every
+(trial, player) hand is scored in one pass.
+
+Two scorers, both returning values identical to
+bot.evaluation.evaluator.evaluate:
+
+evaluate_batch(cards)
+    any (..., 5–7) card array: bincount rank / suit histograms, the
+    evaluator's 13-bit straight / top-five tables, and np.select over
+    hand categories in strength order
+
+evaluate_keyed_batch(keys, masks)
+    hands given as per-card key / mask sums; the shared board is summed
+    once per trial and looked up in the evaluator's rank-multiset table.
+    The simulators use this path.
+
+evaluate_engine_keyed_batch(keys, masks, holes) scores the same sums
+under pypokerengine's rules (evaluator.evaluate_engine); the simulators
+take rules="engine" to use it.
+"""
+
+import numpy as np
+
+from bot.evaluation.evaluator import (
+    STRAIGHT_HIGH,
+    TOP5,
+    CARD_KEY,
+    SUIT_RANK_BIT,
+    RANK_KEY_BITS,
+    RANK_KEY_MASK,
+    FLUSH_PROBE,
+    FLUSH_BITS,
+    FLUSH_VALUES,
+    NON_FLUSH_VALUES,
+    ENGINE_FLUSH_VALUES,
+    ENGINE_NON_FLUSH_VALUES,
+    HIGH_CARD,
+    PAIR,
+    TWO_PAIR,
+    TRIPS,
+    STRAIGHT,
+    FLUSH,
+    FULL_HOUSE,
+    QUADS,
+    STRAIGHT_FLUSH,
+)
+
+
+_STRAIGHT_HIGH = np.array(STRAIGHT_HIGH, dtype=np.int64)
+_TOP5 = np.array(TOP5, dtype=np.int64)
+
+_RANKS = np.arange(13, dtype=np.int64)
+_RANK_BITS = np.int64(1) << _RANKS
+
+CARD_KEYS = np.array(CARD_KEY, dtype=np.int64)
+SUIT_RANK_BITS = np.array(SUIT_RANK_BIT, dtype=np.int64)
+
+_FLUSH_VALUES = np.array(FLUSH_VALUES, dtype=np.int64)
+_NON_FLUSH_KEYS = np.array(sorted(NON_FLUSH_VALUES), dtype=np.int64)
+_NON_FLUSH_VALUES = np.array(
+    [NON_FLUSH_VALUES[k] for k in sorted(NON_FLUSH_VALUES)], dtype=np.int64
+)
+
+_ENGINE_FLUSH_VALUES = np.array(ENGINE_FLUSH_VALUES, dtype=np.int64)
+_ENGINE_NON_FLUSH_VALUES = np.array(
+    [ENGINE_NON_FLUSH_VALUES[k] for k in sorted(ENGINE_NON_FLUSH_VALUES)], dtype=np.int64
+)
+
+# flush probe bit (0x8 << 4 * suit) >> 3 -> suit
+_FLUSH_SUIT = np.zeros(0x1001, dtype=np.int64)
+_FLUSH_SUIT[[0x1, 0x10, 0x100, 0x1000]] = [0, 1, 2, 3]
+
+# Upper bound on (trial, player) hands scored per chunk
+BATCH_HANDS = 60_000
+
+_RNG = np.random.default_rng()
+
+
+def reseed(seed):
+    """
+    Restart the module's sampler from `seed` (seeded simulations).
+    """
+
+    global _RNG
+    _RNG = np.random.default_rng(seed)
+
+
+# ======================================================
+# SCORING
+# ======================================================
+
+def evaluate_batch(cards):
+    """
+    cards: int array shaped (..., 5–7).
+    Returns int64 hand values shaped (...).
+    """
+
+    cards = np.asarray(cards, dtype=np.int64)
+    shape = cards.shape[:-1]
+    cards = cards.reshape(-1, cards.shape[-1])
+
+    ranks = cards >> 2
+    suits = cards & 3
+
+    # -----------------------------------------
+    # HISTOGRAMS
+    # -----------------------------------------
+
+    rows = np.arange(len(cards), dtype=np.int64)[:, None]
+
+    rank_counts = np.bincount((rows * 13 + ranks).ravel(), minlength=len(cards) * 13)
+    rank_counts = rank_counts.reshape(-1, 13)
+
+    suit_counts = np.bincount((rows * 4 + suits).ravel(), minlength=len(cards) * 4)
+    suit_counts = suit_counts.reshape(-1, 4)
+
+    rank_mask = (rank_counts > 0) @ _RANK_BITS
+
+    has_flush = suit_counts.max(axis=1) >= 5
+    flush_suit = suit_counts.argmax(axis=1)
+
+    # cards of one suit never share a rank, so the sum is a bitwise or
+    flush_mask = np.where(suits == flush_suit[:, None], _RANK_BITS[ranks], 0).sum(axis=1)
+    flush_mask = np.where(has_flush, flush_mask, 0)
+
+    # -----------------------------------------
+    # RANK GROUPS (count first, then rank)
+    # -----------------------------------------
+
+    groups = rank_counts * 16 + _RANKS
+
+    first = groups.max(axis=1)
+    groups[rows[:, 0], first & 15] = -1
+    second = groups.max(axis=1)
+
+    top_count = first >> 4
+    top_rank = first & 15
+    second_count = second >> 4
+    second_rank = second & 15
+
+    rest = rank_mask & ~_RANK_BITS[top_rank]
+    rest_two_pair = rest & ~_RANK_BITS[second_rank]
+
+    straight = _STRAIGHT_HIGH[rank_mask]
+    straight_flush = _STRAIGHT_HIGH[flush_mask]
+
+    # -----------------------------------------
+    # CATEGORY SCORING
+    # -----------------------------------------
+
+    conditions = [
+        has_flush & (straight_flush >= 0),
+        top_count == 4,
+        (top_count == 3) & (second_count >= 2),
+        has_flush,
+        straight >= 0,
+        top_count == 3,
+        (top_count == 2) & (second_count == 2),
+        top_count == 2,
+    ]
+
+    values = [
+        STRAIGHT_FLUSH << 20 | straight_flush << 16,
+        QUADS << 20 | top_rank << 16 | (_TOP5[rest] >> 16) << 12,
+        FULL_HOUSE << 20 | top_rank << 16 | second_rank << 12,
+        FLUSH << 20 | _TOP5[flush_mask],
+        STRAIGHT << 20 | straight << 16,
+        TRIPS << 20 | top_rank << 16 | (_TOP5[rest] >> 12) << 8,
+        TWO_PAIR << 20 | top_rank << 16 | second_rank << 12 | (_TOP5[rest_two_pair] >> 16) << 8,
+        PAIR << 20 | top_rank << 16 | (_TOP5[rest] >> 8) << 4,
+    ]
+
+    scored = np.select(conditions, values, default=HIGH_CARD << 20 | _TOP5[rank_mask])
+
+    return scored.reshape(shape)
+
+
+def evaluate_keyed_batch(keys, masks):
+    """
+    Table-lookup scoring from precomputed card sums.
+
+    keys:  sums of CARD_KEYS over each hand's cards
+    masks: sums of SUIT_RANK_BITS over each hand's cards
+
+    Used when many hands share a board, so the sums are cheap broadcasts.
+    """
+
+    keys = np.asarray(keys, dtype=np.int64)
+    masks = np.asarray(masks, dtype=np.int64)
+
+    idx = np.searchsorted(_NON_FLUSH_KEYS, keys & RANK_KEY_MASK)
+    idx = np.minimum(idx, len(_NON_FLUSH_KEYS) - 1)
+    values = _NON_FLUSH_VALUES[idx]
+
+    flush = ((keys >> RANK_KEY_BITS) + FLUSH_PROBE) & FLUSH_BITS
+
+    if flush.any():
+        suit = _FLUSH_SUIT[flush >> 3]
+        flush_mask = (masks >> (13 * suit)) & 0x1FFF
+        values = np.where(flush != 0, _FLUSH_VALUES[flush_mask], values)
+
+    return values
+
+
+def evaluate_engine_keyed_batch(keys, masks, holes):
+    """
+    evaluate_keyed_batch under the engine's rules.
+
+    holes: each hand's two hole cards, shaped (..., 2) to broadcast with
+    keys; the engine breaks every tie on their ranks.
+    """
+
+    keys = np.asarray(keys, dtype=np.int64)
+    masks = np.asarray(masks, dtype=np.int64)
+    ranks = np.asarray(holes, dtype=np.int64) >> 2
+
+    idx = np.searchsorted(_NON_FLUSH_KEYS, keys & RANK_KEY_MASK)
+    idx = np.minimum(idx, len(_NON_FLUSH_KEYS) - 1)
+    made = _ENGINE_NON_FLUSH_VALUES[idx]
+
+    flush = ((keys >> RANK_KEY_BITS) + FLUSH_PROBE) & FLUSH_BITS
+
+    if flush.any():
+        suit = _FLUSH_SUIT[flush >> 3]
+        flush_mask = (masks >> (13 * suit)) & 0x1FFF
+        made = np.where(flush != 0, _ENGINE_FLUSH_VALUES[flush_mask], made)
+
+    hole_value = (ranks.max(axis=-1) + 2) << 4 | (ranks.min(axis=-1) + 2)
+
+    # high card: the hole cards alone
+    made = np.where(made == 0, hole_value, made)
+
+    return made << 8 | hole_value
+
+
+def score_hands(keys, masks, holes, rules="standard"):
+    """
+    Keyed scoring under `rules`: "standard" or "engine".
+    """
+
+    if rules == "engine":
+        return evaluate_engine_keyed_batch(keys, masks, holes)
+
+    return evaluate_keyed_batch(keys, masks)
+
+
+# ======================================================
+# MONTE CARLO
+# ======================================================
+
+def deal_batch(deck, draw, trials, rng):
+    """
+    `trials` rows of `draw` distinct cards from deck (shuffled deck matrix).
+    """
+
+    order = rng.random((trials, len(deck))).argsort(axis=1)[:, :draw]
+    return deck[order]
+
+
+def deal_common(dead, draw, trials, rng, row_dead=None):
+    """
+    `trials` rows of `draw` cards from the 52 minus `dead`.
+
+    Every row draws one uniform per card (column = card int) and takes
+    the smallest, so two calls with the same rng state deal the same
+    cards wherever their dead cards allow: seeded runs of different
+    spots share their random numbers (common random numbers).
+
+    row_dead: optional (trials, k) cards that row must not deal.
+    """
+
+    keys = rng.random((trials, 52))
+    keys[:, list(dead)] = 2.0
+
+    if row_dead is not None:
+        keys[np.arange(trials)[:, None], row_dead] = 2.0
+
+    return keys.argsort(axis=1)[:, :draw]
+
+
+def showdown_wins(hole, board, runouts, opponent_holes, rules="standard"):
+    """
+    Scores one showdown per row.
+
+    hole:            hero's 2 int cards
+    board:           known board int cards
+    runouts:         (n, 5 - len(board)) dealt board cards
+    opponent_holes:  (n, opponents, 2)
+
+    Returns a bool array: hero wins or ties under `rules`. The board
+    sums are computed once per row and every player only adds their own
+    two cards.
+    """
+
+    board = np.asarray(board, dtype=np.int64)
+    hole = np.asarray(hole, dtype=np.int64)
+
+    board_key = int(CARD_KEYS[board].sum()) + CARD_KEYS[runouts].sum(axis=1)
+    board_mask = int(SUIT_RANK_BITS[board].sum()) + SUIT_RANK_BITS[runouts].sum(axis=1)
+
+    hero = score_hands(
+        board_key + CARD_KEYS[hole].sum(),
+        board_mask + SUIT_RANK_BITS[hole].sum(),
+        hole,
+        rules
+    )
+
+    opponent = score_hands(
+        board_key[:, None] + CARD_KEYS[opponent_holes].sum(axis=2),
+        board_mask[:, None] + SUIT_RANK_BITS[opponent_holes].sum(axis=2),
+        opponent_holes,
+        rules
+    )
+
+    return hero >= opponent.max(axis=1)
+
+
+def simulate_wins_batch(hole, board, opponents, trials, rng=None, rules="standard"):
+    """
+    Vectorized counterpart of evaluator.simulate_wins.
+
+    hole / board are int cards. Ties count as wins. Dealt with
+    deal_common, so a seeded rng gives common random numbers.
+    rules="engine" scores showdowns the way pypokerengine settles them.
+    """
+
+    if rng is None:
+        rng = _RNG
+
+    dead = set(hole) | set(board)
+
+    need = 5 - len(board)
+    draw = need + 2 * opponents
+
+    chunk = max(1, BATCH_HANDS // (opponents + 1))
+    wins = 0
+
+    for start in range(0, trials, chunk):
+
+        n = min(chunk, trials - start)
+
+        drawn = deal_common(dead, draw, n, rng)
+        won = showdown_wins(
+            hole,
+            board,
+            drawn[:, :need],
+            drawn[:, need:].reshape(n, opponents, 2),
+            rules
+        )
+
+        wins += int(won.sum())
+
+    return wins
@@ -1,7 +1,13 @@
+import time
+
 from pypokerengine.players import BasePokerPlayer
-from bot.config.constants import DEBUG_MODE, DEBUG_ACTION
+from bot.config import constants
+from bot.config.constants import DEBUG_ACTION, DECISION_TIME_BUDGET
+from bot.core.hand_tracker import HandTracker
 from bot.core.state_parser import parse_state
+from bot.evaluation.cards import cards_to_ints
 from bot.strategy.postflop.flop_engine import get_flop_action
+from bot.strategy.postflop.opponent_range import range_matchup
 from bot.strategy.postflop.river_engine import get_river_action
 from bot.strategy.preflop.classifier import detect_preflop_situation
 from bot.strategy.preflop.decision import get_preflop_action
@@ -10,14 +16,32 @@ from bot.strategy.postflop.turn_engine import get_turn_action
 
 class WorldClassBot(BasePokerPlayer):
 
+    def __init__(self, time_budget=DECISION_TIME_BUDGET):
+        super().__init__()
+        # per-hand action state, fed by the engine callbacks below
+        self.tracker = HandTracker()
+        # seconds of equity refinement per decision; None = no deadline,
+        # so sample counts do not depend on CPU speed
+        self.time_budget = time_budget
+
     def declare_action(self, valid_actions, hole_card, round_state):
 
+        started = time.perf_counter()
+        deadline = None if self.time_budget is None else started + self.time_budget
+
         # Convert engine chaos into clean state object
-        state = parse_state(round_state, hole_card, self.uuid, valid_actions)
+        state = parse_state(
+            round_state,
+            hole_card,
+            self.uuid,
+            valid_actions,
+            deadline=deadline,
+            tracker=self.tracker
+        )
 
         if state.street == "preflop":
             situation = detect_preflop_situation(state)
-            if DEBUG_MODE:
+            if constants.DEBUG_MODE:
                 print(f"Preflop Situation: {situation.value}")
             action, amount = get_preflop_action(state, valid_actions)
         elif state.street == "flop":
@@ -29,8 +53,12 @@ class WorldClassBot(BasePokerPlayer):
         else:
             action, amount = self._basic_decision(valid_actions, state)
     
-        if DEBUG_MODE and DEBUG_ACTION:
+        if constants.DEBUG_MODE and DEBUG_ACTION:
             print(f"[BOT ACTION] {action} {amount}")
+            print(
+                f"[DECISION] {state.equity_samples} equity samples, "
+                f"{(time.perf_counter() - started) * 1000:.1f}ms"
+            )
 
         return action, amount
     
@@ -73,7 +101,17 @@ class WorldClassBot(BasePokerPlayer):
     # REQUIRED ENGINE METHODS
     # -----------------------------
     def receive_game_start_message(self, game_info): pass
-    def receive_round_start_message(self, round_count, hole_card, seats): pass
-    def receive_street_start_message(self, street, round_state): pass
-    def receive_game_update_message(self, action, round_state): pass
+    def receive_round_start_message(self, round_count, hole_card, seats):
+        self.tracker.start_round(round_count)
+
+    def receive_street_start_message(self, street, round_state):
+        self.tracker.start_street(street, round_state)
+
+        # range-vs-range on the new flop is cached off the decision clock
+        if street == "flop":
+            range_matchup(self.tracker, self.uuid, cards_to_ints(round_state["community_card"]))
+
+    def receive_game_update_message(self, action, round_state):
+        self.tracker.record_action(action, round_state)
+
     def receive_round_result_message(self, winners, hand_info, round_state): pass
@@ -1,35 +1,65 @@
 # bot/strategy/postflop/board_texture.py
 
-from collections import Counter
+"""
+Board texture flags for the postflop engines.
+
+A texture only depends on the board's rank multiset and suit counts, so
+it is packed into a 10-bit code and every distinct code maps to one
+shared, immutable BoardTexture record.
+
+- flops  → precomputed code per flop (22,100 boards, 1,755 up to suit
+           relabelling) in bot/data/board_textures.bin, memory-mapped
+           on first use and indexed by the flop's combination index
+- turn / river → computed from the board's rank / suit key and cached
+
+Build the flop table:
+    python -m bot.strategy.postflop.board_texture
+"""
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+from bot.evaluation.evaluator import CARD_KEY, RANK_KEY_BITS
 
 
 RANK_ORDER = "23456789TJQKA"
 RANK_VALUE = {r: i for i, r in enumerate(RANK_ORDER)}
 
+# A, K, Q as rank indices
+BROADWAY_HIGH = {RANK_VALUE["A"], RANK_VALUE["K"], RANK_VALUE["Q"]}
+
+
+BoardTexture = namedtuple("BoardTexture", [
+    "paired",
+    "monotone",
+    "two_tone",
+    "connected",
+    "high_card_heavy",
+    "low_board",
+    "wet_score",
+    "dry",
+    "wet",
+])
+
+
+TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "board_textures.bin"
+)
 
-class BoardTexture:
-
-    def __init__(
-        self,
-        paired,
-        monotone,
-        two_tone,
-        connected,
-        high_card_heavy,
-        low_board,
-        wet_score,
-        dry,
-        wet
-    ):
-        self.paired = paired
-        self.monotone = monotone
-        self.two_tone = two_tone
-        self.connected = connected
-        self.high_card_heavy = high_card_heavy
-        self.low_board = low_board
-        self.wet_score = wet_score
-        self.dry = dry
-        self.wet = wet
+MAGIC = b"BTEX"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+
+FLOP_COUNT = comb(52, 3)
+
+TURN_RIVER_CACHE_SIZE = 65_536
 
 
 # ======================================================
@@ -37,30 +67,78 @@ class BoardTexture:
 # ======================================================
 
 def analyze_board(board_cards):
+    """
+    board_cards: int cards (bot.evaluation.cards)
+    """
 
     if len(board_cards) < 3:
         # preflop or invalid
         return None
 
-    ranks = [c[1] for c in board_cards]
-    suits = [c[0] for c in board_cards]
+    if len(board_cards) == 3:
+        code = flop_texture_code(board_cards)
+    else:
+        key = 0
+        for c in board_cards:
+            key += CARD_KEY[c]
+        code = _keyed_texture_code(key)
+
+    return TEXTURES[code]
+
+
+def flop_index(flop):
+    """
+    Combination index 0..22,099 of a flop (any card order).
+    """
+
+    a, b, c = sorted(flop)
+    return a + _C2[b] + _C3[c]
+
+
+def flop_texture_code(flop):
 
-    rank_counts = Counter(ranks)
-    suit_counts = Counter(suits)
+    if not _loaded:
+        _load()
+
+    if _table is None:
+        return texture_code(flop)
+
+    return _table[flop_index(flop)]
+
+
+# ======================================================
+# TEXTURE CODES
+# ======================================================
+# bit 0 paired, 1 monotone, 2 two_tone, 3 connected,
+# 4 high_card_heavy, 5 low_board, 6-9 wet_score
+
+def texture_code(board_cards):
+
+    rank_count = [0] * 13
+    suit_count = [0] * 4
+
+    for c in board_cards:
+        rank_count[c >> 2] += 1
+        suit_count[c & 3] += 1
+
+    return _code_from_counts(rank_count, suit_count)
+
+
+def _code_from_counts(rank_count, suit_count):
+
+    values = [r for r in range(13) for _ in range(rank_count[r])]
 
     # -----------------------------------------
     # BASIC STRUCTURE FLAGS
     # -----------------------------------------
 
-    paired = any(v >= 2 for v in rank_counts.values())
-    monotone = any(v >= 3 for v in suit_counts.values())
-    two_tone = any(v == 2 for v in suit_counts.values())
-
-    values = sorted([RANK_VALUE[r] for r in ranks])
+    paired = max(rank_count) >= 2
+    monotone = max(suit_count) >= 3
+    two_tone = 2 in suit_count
 
     connected = _is_connected(values)
 
-    high_card_heavy = sum(r in {"A", "K", "Q"} for r in ranks) >= 2
+    high_card_heavy = sum(r in BROADWAY_HIGH for r in values) >= 2
     low_board = max(values) <= RANK_VALUE["9"]
 
     # -----------------------------------------
@@ -84,22 +162,105 @@ def analyze_board(board_cards):
     if max(values) - min(values) <= 4:
         wet_score += 1
 
-    dry = wet_score <= 2
-    wet = wet_score >= 4
+    return (
+        paired
+        | monotone << 1
+        | two_tone << 2
+        | connected << 3
+        | high_card_heavy << 4
+        | low_board << 5
+        | wet_score << 6
+    )
+
+
+def _decode(code):
+
+    wet_score = code >> 6
 
     return BoardTexture(
-        paired=paired,
-        monotone=monotone,
-        two_tone=two_tone,
-        connected=connected,
-        high_card_heavy=high_card_heavy,
-        low_board=low_board,
+        paired=bool(code & 1),
+        monotone=bool(code & 2),
+        two_tone=bool(code & 4),
+        connected=bool(code & 8),
+        high_card_heavy=bool(code & 16),
+        low_board=bool(code & 32),
         wet_score=wet_score,
-        dry=dry,
-        wet=wet
+        dry=wet_score <= 2,
+        wet=wet_score >= 4
     )
 
 
+TEXTURES = [_decode(code) for code in range(1 << 10)]
+
+
+@lru_cache(maxsize=TURN_RIVER_CACHE_SIZE)
+def _keyed_texture_code(key):
+    """
+    Texture code from a board's summed CARD_KEY (rank and suit counts).
+    """
+
+    rank_count = [(key >> (3 * r)) & 7 for r in range(13)]
+    suit_count = [(key >> (RANK_KEY_BITS + 4 * s)) & 15 for s in range(4)]
+
+    return _code_from_counts(rank_count, suit_count)
+
+
+# ======================================================
+# FLOP TABLE
+# ======================================================
+
+_C2 = [comb(n, 2) for n in range(52)]
+_C3 = [comb(n, 3) for n in range(52)]
+
+_table = None
+_loaded = False
+
+
+def _load():
+
+    global _table, _loaded
+    _loaded = True
+
+    if not os.path.exists(TABLE_PATH):
+        return
+
+    with open(TABLE_PATH, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, count = HEADER.unpack_from(mapped, 0)
+
+    if magic != MAGIC or version != VERSION or count != FLOP_COUNT:
+        return
+
+    _table = memoryview(mapped)[HEADER.size:].cast("H")
+
+
+def build_table(path=TABLE_PATH):
+
+    codes = [0] * FLOP_COUNT
+    classes = set()
+
+    for flop in combinations(range(52), 3):
+        codes[flop_index(flop)] = texture_code(flop)
+        classes.add(_suit_isomorphic_key(flop))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, FLOP_COUNT))
+        f.write(struct.pack(f"<{FLOP_COUNT}H", *codes))
+
+    print(f"[TEXTURE TABLE] {FLOP_COUNT} flops, {len(classes)} suit-isomorphic")
+    print(f"Saved {path}")
+
+
+def _suit_isomorphic_key(flop):
+
+    from bot.evaluation.canonical import canonicalize
+
+    return canonicalize([], list(flop))[1]
+
+
 # ======================================================
 # INTERNAL HELPERS
 # ======================================================
@@ -114,4 +275,8 @@ def _is_connected(values):
     for i in range(len(values) - 1):
         gaps.append(values[i+1] - values[i])
 
-    return max(gaps) <= 2
\ No newline at end of file
+    return max(gaps) <= 2
+
+
+if __name__ == "__main__":
+    build_table()
@@ -4,6 +4,7 @@ import random
 
 from bot.strategy.postflop.hand_category import categorize_hand, HandCategory
 from bot.strategy.postflop.board_texture import analyze_board
+from bot.strategy.postflop.opponent_range import equity_vs_villain, range_matchup
 
 
 # ======================================================
@@ -12,7 +13,7 @@ from bot.strategy.postflop.board_texture import analyze_board
 
 def get_flop_action(state, valid_actions):
 
-    texture = analyze_board(state.board_cards)
+    texture = analyze_board(state.board_ints)
     category = categorize_hand(state)
 
     hero_is_aggressor = _was_preflop_aggressor(state)
@@ -129,7 +130,8 @@ def _defender_strategy(state, valid_actions, category, texture, range_advantage)
     to_call = state.to_call
     high_spr = state.spr >= 6
 
-    # Facing bet
+    # Facing bet: equity against the opponent's preflop range when the
+    # range tables cover the spot
     if to_call > 0:
 
         # HIGH SPR → do NOT stack off light
@@ -140,7 +142,7 @@ def _defender_strategy(state, valid_actions, category, texture, range_advantage)
             if category in {HandCategory.STRONG_MADE, HandCategory.STRONG_DRAW}:
                 return _call_amount(valid_actions)
 
-            if state.equity > state.pot_odds:
+            if equity_vs_villain(state) > state.pot_odds:
                 return _call_amount(valid_actions)
 
             return "fold", 0
@@ -153,7 +155,7 @@ def _defender_strategy(state, valid_actions, category, texture, range_advantage)
             if category == HandCategory.STRONG_DRAW:
                 return _call_amount(valid_actions)
 
-            if state.equity > state.pot_odds:
+            if equity_vs_villain(state) > state.pot_odds:
                 return _call_amount(valid_actions)
 
             return "fold", 0
@@ -179,6 +181,11 @@ def _defender_strategy(state, valid_actions, category, texture, range_advantage)
 
 def _estimate_range_advantage(state, texture, hero_is_aggressor):
 
+    # Heads-up with both ranges known: hero range's equity
+    matchup = range_matchup(state.tracker, state.hero_uuid, state.board_ints)
+    if matchup is not None:
+        return matchup.equity
+
     advantage = 0.5
 
     if hero_is_aggressor:
@@ -205,18 +212,8 @@ def _estimate_range_advantage(state, texture, hero_is_aggressor):
 
 def _was_preflop_aggressor(state):
 
-    ctx = state.preflop_context
-
-    if not ctx:
-        return False
-
-    last_raiser = ctx.get("last_raiser_uuid")
-
-    if not last_raiser:
-        return False
-
-    # Hero is aggressor only if hero was last raiser
-    return last_raiser == state.hero_uuid
+    # Hero is aggressor only if hero was the last preflop raiser
+    return state.street_aggressors.get("preflop") == state.hero_uuid
 
 def _bet_small(state, valid_actions):
     return _bet_fraction(state, valid_actions, 0.33)
@@ -270,6 +267,11 @@ def _check_or_call(valid_actions):
 
 def _estimate_nut_advantage(state, texture, hero_is_aggressor):
 
+    # Heads-up with both ranges known: hero's share of the strongest hands
+    matchup = range_matchup(state.tracker, state.hero_uuid, state.board_ints)
+    if matchup is not None:
+        return matchup.nut_share
+
     advantage = 0.5
 
     # Paired boards favor aggressor
@@ -2,6 +2,8 @@
 
 from enum import Enum
 
+from bot.evaluation.cards import rank_counts
+
 
 class HandCategory(Enum):
     NUTS = "nuts"
@@ -23,7 +25,7 @@ def categorize_hand(state) -> HandCategory:
     draws = state.hand_info["draws"]
     equity = state.equity
     players = state.players
-    board = state.board_cards
+    board = state.board_ints
 
     # -----------------------------------------
     # MULTIWAY EQUITY ADJUSTMENT
@@ -95,6 +97,4 @@ def categorize_hand(state) -> HandCategory:
 
 def _board_is_paired(board):
 
-    ranks = [c[1] for c in board]
-
-    return len(ranks) != len(set(ranks))
\ No newline at end of file
+    return max(rank_counts(board)) >= 2
\ No newline at end of file
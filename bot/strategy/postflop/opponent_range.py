@@ -0,0 +1,135 @@
+# bot/strategy/postflop/opponent_range.py
+
+"""
+Heads-up preflop ranges read off the preflop tables.
+
+The preflop action (HandTracker) tells who raised and how many raises
+went in; a player's position picks the table their range comes from.
+Spots the tables do not cover (limped pots, multiway pots, positions
+without a table) give None, and callers fall back to equity against a
+random hand or to the board-texture heuristics.
+"""
+
+from functools import lru_cache
+
+from bot.evaluation.range_equity import equity_vs_range, range_vs_range
+from bot.strategy.preflop.ranges import (
+    OPEN_RANGES,
+    FACING_OPEN_RANGES,
+    FACING_RERAISE_RANGES,
+    BB_DEFEND_RANGE,
+    THREE_BET_RANGES,
+)
+
+
+# ======================================================
+# RANGE TABLES -> COMBO WEIGHTS
+# ======================================================
+
+@lru_cache(maxsize=None)
+def _table_weights(kind, position_name):
+
+    if kind == "open":
+        hands = OPEN_RANGES.get(position_name, {}).get("raise")
+
+    elif kind == "3bet":
+        ranges = THREE_BET_RANGES.get(position_name)
+        hands = ranges["value"] | ranges["bluff"] if ranges else None
+
+    elif kind == "4bet":
+        hands = FACING_RERAISE_RANGES["default"]["value_4bet"]
+
+    elif kind == "call_3bet":
+        hands = FACING_RERAISE_RANGES["default"]["call_3bet"]
+
+    elif position_name == "BB":
+        hands = BB_DEFEND_RANGE["call"]
+
+    else:
+        hands = FACING_OPEN_RANGES.get(position_name, {}).get("call")
+
+    if not hands:
+        return None
+
+    weights = hands.weights()
+    weights.flags.writeable = False
+    return weights
+
+
+def player_range(tracker, uuid):
+    """
+    1326 combo weights of `uuid` from the preflop action, or None.
+    """
+
+    aggressor = tracker.street_aggressors.get("preflop")
+
+    if aggressor is None:
+        return None
+
+    raises = tracker.raises
+
+    if uuid == aggressor:
+        kind = "open" if raises == 1 else "3bet" if raises == 2 else "4bet"
+    else:
+        kind = "call" if raises == 1 else "call_3bet"
+
+    return _table_weights(kind, tracker.positions[uuid][1])
+
+
+def _heads_up_villain(tracker, hero_uuid):
+
+    alive = tracker.alive_order
+
+    if len(alive) != 2 or hero_uuid not in alive:
+        return None
+
+    return alive[0] if alive[1] == hero_uuid else alive[1]
+
+
+def villain_range(state):
+    """
+    1326 combo weights of the single opponent, or None.
+    """
+
+    villain = _heads_up_villain(state.tracker, state.hero_uuid)
+    if villain is None:
+        return None
+
+    return player_range(state.tracker, villain)
+
+
+def range_matchup(tracker, hero_uuid, board):
+    """
+    RangeMatchup (bot.evaluation.range_equity) of hero's preflop range
+    against the single opponent's on `board`, or None.
+
+    Cached per canonical board, so WorldClassBot calls it when the flop
+    is dealt and the decision only reads the cache.
+    """
+
+    villain = _heads_up_villain(tracker, hero_uuid)
+    if villain is None:
+        return None
+
+    mine = player_range(tracker, hero_uuid)
+    theirs = player_range(tracker, villain)
+
+    if mine is None or theirs is None:
+        return None
+
+    return range_vs_range(mine, theirs, board)
+
+
+def equity_vs_villain(state):
+    """
+    Hero equity against villain_range(state), else state.equity.
+    """
+
+    weights = villain_range(state)
+
+    if weights is not None:
+        estimate = equity_vs_range(state.hero_ints, state.board_ints, weights)
+        if estimate is not None:
+            return estimate.equity
+
+    return state.equity
@@ -12,7 +12,7 @@ from bot.strategy.postflop.board_texture import analyze_board
 
 def get_river_action(state, valid_actions):
 
-    texture = analyze_board(state.board_cards)
+    texture = analyze_board(state.board_ints)
     category = categorize_hand(state)
 
     hero_is_aggressor = _was_preflop_aggressor(state)
@@ -71,13 +71,8 @@ def get_river_action(state, valid_actions):
 
 def _was_preflop_aggressor(state):
 
-    ctx = state.preflop_context
-
-    if not ctx:
-        return False
-
-    last_raiser = ctx.get("last_raiser_uuid")
-    return last_raiser == state.hero_uuid
+    # Hero is aggressor only if hero was the last preflop raiser
+    return state.street_aggressors.get("preflop") == state.hero_uuid
 
 
 def _bet_small(state, valid_actions):
@@ -12,7 +12,7 @@ from bot.strategy.postflop.board_texture import analyze_board
 
 def get_turn_action(state, valid_actions):
 
-    texture = analyze_board(state.board_cards)
+    texture = analyze_board(state.board_ints)
     category = categorize_hand(state)
 
     hero_is_aggressor = _was_preflop_aggressor(state)
@@ -85,18 +85,20 @@ def get_turn_action(state, valid_actions):
 
 def _is_scare_card(state):
 
-    if len(state.board_cards) < 4:
+    board = state.board_ints
+
+    if len(board) < 4:
         return False
 
-    turn_card = state.board_cards[-1]
-    rank = turn_card[1]
-    suit = turn_card[0]
+    turn_card = board[-1]
+    rank = turn_card >> 2
+    suit = turn_card & 3
 
-    board_ranks = [c[1] for c in state.board_cards[:-1]]
-    board_suits = [c[0] for c in state.board_cards[:-1]]
+    board_ranks = [c >> 2 for c in board[:-1]]
+    board_suits = [c & 3 for c in board[:-1]]
 
-    # High card scare
-    if rank in {"A", "K"}:
+    # High card scare (A, K)
+    if rank >= 11:
         return True
 
     # Flush completing scare
@@ -117,13 +119,8 @@ def _is_scare_card(state):
 
 def _was_preflop_aggressor(state):
 
-    ctx = state.preflop_context
-
-    if not ctx:
-        return False
-
-    last_raiser = ctx.get("last_raiser_uuid")
-    return last_raiser == state.hero_uuid
+    # Hero is aggressor only if hero was the last preflop raiser
+    return state.street_aggressors.get("preflop") == state.hero_uuid
 
 
 def _bet_small(state, valid_actions):
@@ -6,27 +6,72 @@ Handles:
 - Facing open raises
 - Structured 3-betting
 - Debug instrumentation
+
+The decision logic only reads position, spot, stack zone and hand, and
+returns an action template (what to do); apply_template() sizes it
+against the live state. compile_preflop_table() runs the logic once
+over every input into a dense table, so a decision is one byte lookup
+plus sizing. The template logic is pure (no output); with DEBUG_MODE
+on, get_preflop_action prints the looked-up spot and template and the
+sizing helpers print the amount. tests/test_preflop_decision.py checks
+the decisions against the pre-table engine's.
 """
 
-from bot.strategy.preflop.classifier import (
-    PreflopSituation,
-    detect_preflop_situation
-)
+from bot.strategy.preflop.classifier import PreflopSituation
 
 from bot.strategy.preflop.ranges import (
     in_open_range,
     get_facing_open_bucket
 )
 
-from bot.evaluation.hand_utils import normalize_hand
-from bot.config.constants import DEBUG_MODE
-from bot.evaluation.stack import is_push_fold_zone
+from bot.evaluation.hand_range import HandRange
+from bot.evaluation.hand_utils import HAND_CODES, hand_index
+from bot.config import constants
+from bot.evaluation.stack import (
+    ULTRA_SHORT, SHORT, PRESSURE, MEDIUM, STANDARD, DEEP,
+    is_push_fold_zone
+)
 from bot.strategy.preflop.ranges import get_push_fold_action
 from bot.strategy.preflop.ranges import get_facing_reraise_bucket
 from bot.core.state_parser import GameState
 from bot.strategy.preflop.ranges import in_limp_iso_range
 from bot.strategy.preflop.ranges import in_bb_defend_range
 from bot.strategy.preflop.ranges import get_3bet_bucket
+
+
+# Fixed hand groups of the re-raise and squeeze spots
+HARD_CAP_PREMIUM = HandRange.from_codes({"AA", "KK", "QQ", "AKs", "AKo"})
+
+# Strong 4bet hands
+VALUE_4BET = HandRange.from_codes({"QQ", "KK", "AA", "AKs", "AKo"})
+
+# Call 3bet (only in position, deep)
+CALL_3BET = HandRange.from_codes({"JJ", "TT", "AQs"})
+
+# Squeeze: only strong value, medium value calls
+SQUEEZE_VALUE = HandRange.from_codes({"QQ", "KK", "AA", "AKs", "AKo"})
+SQUEEZE_CALL = HandRange.from_codes({"JJ", "TT", "AQs", "AQo"})
+
+
+# ==================================================
+# ACTION TEMPLATES
+# ==================================================
+
+FOLD_OR_CHECK = 0
+CALL = 1
+OPEN_RAISE = 2      # 2.2x BB
+THREE_BET = 3       # 3x open IP, 3.5x OOP
+FOUR_BET = 4        # 2.2x the 3bet
+ISO_RAISE = 5       # 4x BB over limpers
+JAM = 6             # all-in, else call
+PUSH_FOLD = 7       # push/fold engine (ranges.get_push_fold_action)
+
+TEMPLATE_NAMES = (
+    "FOLD_OR_CHECK", "CALL", "OPEN_RAISE", "THREE_BET",
+    "FOUR_BET", "ISO_RAISE", "JAM", "PUSH_FOLD",
+)
+
+
 # ==================================================
 # PUBLIC ENTRY POINT
 # ==================================================
@@ -36,117 +81,111 @@ def get_preflop_action(state, valid_actions):
     Returns (action, amount)
     """
 
-    situation = detect_preflop_situation(state)
-    hand_code = normalize_hand(state.hero_cards)
+    hand = hand_index(state.hero_ints)
     position = state.hero_position_name
+    spot = context_spot(state.preflop_context, state.in_position)
+
+    template = lookup_template(position, spot, state.stack_zone, hand)
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("\n==============================")
         print("[PRE-FLOP DECISION ENGINE]")
-        print(f"Hand Code: {hand_code}")
+        print(f"Hand Code: {HAND_CODES[hand]}")
         print(f"Position: {position}")
         print(f"Stack Zone: {state.stack_zone}")
-        print(f"Situation: {situation.value}")
+        print(f"Situation: {SPOTS[spot][0].value}")
+        print(f"Template: {TEMPLATE_NAMES[template]}")
         print("==============================")
-        
+
+    return apply_template(template, state, valid_actions)
+
+
+def preflop_template(position, situation, stack_zone, hand,
+                     callers=0, raises=0, in_position=False):
+    """
+    Action template for one spot; the whole preflop logic.
+    """
+
     # -----------------------------
     # PUSH/FOLD OVERRIDE (≤20bb)
     # -----------------------------
-    if is_push_fold_zone(state.stack_zone) and situation != PreflopSituation.FACING_RERAISE:
-        return get_push_fold_action(state, valid_actions)
-    
+    if is_push_fold_zone(stack_zone) and situation != PreflopSituation.FACING_RERAISE:
+        return PUSH_FOLD
+
     # -----------------------------
     # UNOPENED
     # -----------------------------
     if situation == PreflopSituation.UNOPENED:
-        return _handle_unopened(state, valid_actions, position, hand_code)
+        return _handle_unopened(position, hand)
 
     # -----------------------------
     # FACING OPEN
     # -----------------------------
     if situation == PreflopSituation.FACING_OPEN:
-        return _handle_facing_open(state, valid_actions, position, hand_code)
+        return _handle_facing_open(position, hand, callers)
     # -----------------------------
     # FACING RERAISE
     # -----------------------------
     if situation == PreflopSituation.FACING_RERAISE:
-        return _handle_facing_reraise(
-            state,
-            valid_actions,
-            state.hero_position_name,
-            hand_code
-        )
+        return _handle_facing_reraise(hand, raises, stack_zone, in_position)
     # -----------------------------
     # FACING LIMPED
-    # -----------------------------    
+    # -----------------------------
     if situation == PreflopSituation.LIMPED:
-        return _handle_limped(state, valid_actions, position, hand_code)
+        return _handle_limped(position, hand)
     # -----------------------------
     # OTHER (Not implemented yet)
     # -----------------------------
-    if DEBUG_MODE:
-        print("[INFO] Situation not implemented yet → default action")
+    return FOLD_OR_CHECK
+
 
-    return _default_action(valid_actions)
+def apply_template(template, state, valid_actions):
+    """
+    Sized (action, amount) for a template.
+    """
+    return _APPLY[template](state, valid_actions)
 
 
 # ==================================================
 # UNOPENED LOGIC
 # ==================================================
 
-def _handle_unopened(state, valid_actions, position, hand_code):
+def _handle_unopened(position, hand):
 
-    in_range = in_open_range(position, hand_code)
+    in_range = in_open_range(position, hand)
     # If we are BB and no one raised, we just check
     if position == "BB":
-        if DEBUG_MODE:
-            print("BB unopened spot → CHECK")
-        return _call_amount(valid_actions)
-    if DEBUG_MODE:
-        print("[UNOPENED SPOT]")
-        print(f"In opening range? {in_range}")
+        return CALL
 
     if in_range:
-        return _raise_standard(state, valid_actions)
+        return OPEN_RAISE
 
-    if DEBUG_MODE:
-        print("Hand not in range → folding/checking")
-
-    return _fold_or_check(valid_actions)
+    return FOLD_OR_CHECK
 
 
 # ==================================================
 # FACING OPEN LOGIC
 # ==================================================
 
-def _handle_facing_open(state, valid_actions, position, hand_code):
+def _handle_facing_open(position, hand, callers):
 
-    bucket = get_facing_open_bucket(position, hand_code)
-    callers = state.preflop_context["callers_before"]
+    bucket = get_facing_open_bucket(position, hand)
 
     if callers >= 1:
-        return _handle_squeeze_spot(state, valid_actions, position, hand_code)
-    if DEBUG_MODE:
-        print("[FACING OPEN SPOT]")
-        print(f"Bucket: {bucket}")
+        return _handle_squeeze_spot(hand, callers)
 
     # BB defend override (kept)
     if position == "BB":
-        if in_bb_defend_range(hand_code):
-            if DEBUG_MODE:
-                print("[BB DEFENSE] Calling")
-            return _call_amount(valid_actions)
+        if in_bb_defend_range(hand):
+            return CALL
 
     if bucket in {"value_3bet", "bluff_3bet"}:
-        return _raise_3bet(state, valid_actions)
+        return THREE_BET
 
     if bucket == "call":
-        return _call_amount(valid_actions)
+        return CALL
 
-    if DEBUG_MODE:
-        print("Not in facing range → folding")
-
-    return _fold_or_check(valid_actions)
+    return FOLD_OR_CHECK
 
 
 # ==================================================
@@ -161,7 +200,7 @@ def _raise_standard(state, valid_actions):
     raise_info = next((a for a in valid_actions if a["action"] == "raise"), None)
 
     if not raise_info:
-        if DEBUG_MODE:
+        if constants.DEBUG_MODE:
             print("[WARNING] Raise not available → fallback to call")
         return _call_amount(valid_actions)
 
@@ -172,11 +211,11 @@ def _raise_standard(state, valid_actions):
     amount = max(min_raise, min(max_raise, target))
 
     if amount == -1:
-        if DEBUG_MODE:
+        if constants.DEBUG_MODE:
             print("[WARNING] Invalid raise amount → fallback to call")
         return _call_amount(valid_actions)
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("[OPEN RAISE]")
         print(f"Target: {target}")
         print(f"Final size: {amount}")
@@ -195,7 +234,7 @@ def _raise_3bet(state, valid_actions):
     raise_info = next((a for a in valid_actions if a["action"] == "raise"), None)
 
     if not raise_info:
-        if DEBUG_MODE:
+        if constants.DEBUG_MODE:
             print("[WARNING] Cannot 3-bet → fallback call")
         return _call_amount(valid_actions)
 
@@ -208,7 +247,7 @@ def _raise_3bet(state, valid_actions):
     target = int(open_size * multiplier)
     amount = max(min_raise, min(max_raise, target))
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("[3-BET]")
         print(f"Open size: {open_size}")
         print(f"Multiplier: {multiplier}")
@@ -223,16 +262,16 @@ def _fold_or_check(valid_actions):
     call_action = next((a for a in valid_actions if a["action"] == "call"), None)
 
     if call_action and call_action["amount"] == 0:
-        if DEBUG_MODE:
+        if constants.DEBUG_MODE:
             print("No bet → CHECK")
         return "call", 0
 
     if any(a["action"] == "fold" for a in valid_actions):
-        if DEBUG_MODE:
+        if constants.DEBUG_MODE:
             print("FOLD")
         return "fold", 0
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("[WARNING] No fold option → forced call")
 
     return _call_amount(valid_actions)
@@ -241,7 +280,7 @@ def _fold_or_check(valid_actions):
 def _call_amount(valid_actions):
     call_action = next(a for a in valid_actions if a["action"] == "call")
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print(f"CALL {call_action['amount']}")
 
     return "call", call_action["amount"]
@@ -249,69 +288,32 @@ def _call_amount(valid_actions):
 
 def _default_action(valid_actions):
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("[DEFAULT ACTION] Fallback used")
 
     return _fold_or_check(valid_actions)
 
-def _handle_facing_reraise(state, valid_actions, position, hand_code):
-    ctx = state.preflop_context
-    raises = ctx["raises_before"]
-
-    HARD_CAP_PREMIUM = {"AA", "KK", "QQ", "AKs", "AKo"}
+def _handle_facing_reraise(hand, raises, stack_zone, in_position):
 
     if raises >= 3:
-        if DEBUG_MODE:
-            print("[HARD CAP ACTIVATED] Raises >= 3")
-
-        if hand_code in HARD_CAP_PREMIUM:
-            if DEBUG_MODE:
-                print("Premium hand → JAM")
-            return _jam_all_in(valid_actions)
-
-        if DEBUG_MODE:
-            print("Not premium → FOLD")
-
-        return _fold_or_check(valid_actions)
-    if DEBUG_MODE:
-        print("[FACING RE-RERAISE SPOT]")
-
-    # Strong 4bet hands
-    value_4bet = {
-        "QQ","KK","AA",
-        "AKs","AKo"
-    }
-
-    # Call 3bet (only in position, deep)
-    call_3bet = {
-        "JJ","TT","AQs"
-    }
+        if HARD_CAP_PREMIUM.members[hand]:
+            return JAM
+        return FOLD_OR_CHECK
 
     # Short stack override
-    if state.stack_zone in {"ULTRA_SHORT", "SHORT"}:
-        if hand_code in value_4bet:
-            if DEBUG_MODE:
-                print("Short stack strong hand → JAM")
-            return _jam_all_in(valid_actions)
-        if DEBUG_MODE:
-            print("Short stack weak → fold")
-        return _fold_or_check(valid_actions)
+    if stack_zone in {"ULTRA_SHORT", "SHORT"}:
+        if VALUE_4BET.members[hand]:
+            return JAM
+        return FOLD_OR_CHECK
 
     # Deep stack logic
-    if hand_code in value_4bet:
-        if DEBUG_MODE:
-            print("Value 4bet")
-        return _raise_4bet(state, valid_actions)
-
-    if state.in_position and hand_code in call_3bet:
-        if DEBUG_MODE:
-            print("Flat 3bet in position")
-        return _call_amount(valid_actions)
+    if VALUE_4BET.members[hand]:
+        return FOUR_BET
 
-    if DEBUG_MODE:
-        print("Not strong enough → FOLD")
+    if in_position and CALL_3BET.members[hand]:
+        return CALL
 
-    return _fold_or_check(valid_actions)
+    return FOLD_OR_CHECK
 
 def _raise_4bet(state, valid_actions):
 
@@ -330,7 +332,7 @@ def _raise_4bet(state, valid_actions):
 
     amount = max(min_raise, min(max_raise, target))
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("[4-BET]")
         print(f"3bet size: {three_bet_size}")
         print(f"Target 4bet: {target}")
@@ -351,29 +353,18 @@ def _jam_all_in(valid_actions):
 
     return "fold", 0
 
-def _handle_limped(state, valid_actions, position, hand_code):
-
-    if DEBUG_MODE:
-        print("[LIMPED POT SPOT]")
+def _handle_limped(position, hand):
 
     # BB special case → check unless strong
     if position == "BB":
-        if DEBUG_MODE:
-            print("BB limped pot → check")
-        return _fold_or_check(valid_actions)
+        return FOLD_OR_CHECK
 
-    in_range = in_limp_iso_range(position, hand_code)
-
-    if DEBUG_MODE:
-        print(f"In iso range? {in_range}")
+    in_range = in_limp_iso_range(position, hand)
 
     if in_range:
-        return _raise_limp_iso(state, valid_actions)
-
-    if DEBUG_MODE:
-        print("Not isolating → check/fold")
+        return ISO_RAISE
 
-    return _fold_or_check(valid_actions)
+    return FOLD_OR_CHECK
 
 def _raise_limp_iso(state, valid_actions):
 
@@ -390,40 +381,140 @@ def _raise_limp_iso(state, valid_actions):
 
     amount = max(min_raise, min(max_raise, target))
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("[LIMP ISOLATION RAISE]")
         print(f"Target: {target}")
         print(f"Final: {amount}")
 
     return "raise", amount
 
-def _handle_squeeze_spot(state, valid_actions, position, hand_code):
+def _handle_squeeze_spot(hand, callers):
 
-    if DEBUG_MODE:
-        print("[SQUEEZE SPOT]")
-        print(f"Callers before: {state.preflop_context['callers_before']}")
+    if SQUEEZE_VALUE.members[hand]:
+        return THREE_BET
 
-    # Only squeeze strong value
-    strong_value = {
-        "QQ","KK","AA",
-        "AKs","AKo"
-    }
+    if SQUEEZE_CALL.members[hand]:
+        return CALL
 
-    medium_value = {
-        "JJ","TT","AQs","AQo"
-    }
+    return FOLD_OR_CHECK
 
-    if hand_code in strong_value:
-        if DEBUG_MODE:
-            print("Strong value → squeeze")
-        return _raise_3bet(state, valid_actions)
 
-    if hand_code in medium_value:
-        if DEBUG_MODE:
-            print("Medium value → call")
-        return _call_amount(valid_actions)
+# template -> sizing, indexed by the template constants above
+_APPLY = (
+    lambda state, valid_actions: _fold_or_check(valid_actions),
+    lambda state, valid_actions: _call_amount(valid_actions),
+    _raise_standard,
+    _raise_3bet,
+    _raise_4bet,
+    _raise_limp_iso,
+    lambda state, valid_actions: _jam_all_in(valid_actions),
+    get_push_fold_action,
+)
+
+
+# ==================================================
+# COMPILED TABLE
+# ==================================================
+# table[position][spot][stack zone][hand] = template, one byte per cell.
+#
+# A spot is a PreflopSituation plus the context the logic reads in it
+# (callers before an open, in position / capped facing a re-raise).
+# Positions without a range table (HJ, P6.. at larger tables) all take
+# the same path, so they share one OTHER row.
+
+SPOTS = (
+    # situation                        callers raises in_position
+    (PreflopSituation.UNOPENED,        0,      0,     False),
+    (PreflopSituation.LIMPED,          0,      0,     False),
+    (PreflopSituation.FACING_OPEN,     0,      1,     False),
+    (PreflopSituation.FACING_OPEN,     1,      1,     False),   # squeeze
+    (PreflopSituation.FACING_RERAISE,  0,      2,     False),
+    (PreflopSituation.FACING_RERAISE,  0,      2,     True),
+    (PreflopSituation.FACING_RERAISE,  0,      3,     False),   # hard cap
+)
+
+TABLE_POSITIONS = ("BTN", "SB", "BB", "UTG", "MP", "CO", "OTHER")
+TABLE_ZONES = (ULTRA_SHORT, SHORT, PRESSURE, MEDIUM, STANDARD, DEEP)
+
+_POSITION_ROWS = {name: i for i, name in enumerate(TABLE_POSITIONS)}
+_ZONE_ROWS = {name: i for i, name in enumerate(TABLE_ZONES)}
+
+_OTHER_ROW = _POSITION_ROWS["OTHER"]
+
+_HANDS = len(HAND_CODES)
+_ZONE_STRIDE = _HANDS
+_SPOT_STRIDE = len(TABLE_ZONES) * _ZONE_STRIDE
+_POSITION_STRIDE = len(SPOTS) * _SPOT_STRIDE
+
+
+def context_spot(ctx, in_position):
+    """
+    Spot straight from a preflop_context, in detect_preflop_situation's
+    priority order.
+    """
+
+    raises = ctx["raises_before"]
+
+    if raises >= 3:
+        return 6
+
+    if raises == 2:
+        return 5 if in_position else 4
+
+    if raises == 1:
+        return 3 if ctx["callers_before"] >= 1 else 2
+
+    return 1 if ctx["limpers_before"] > 0 else 0
+
+
+def spot_index(situation, callers, raises, in_position):
+
+    if situation == PreflopSituation.UNOPENED:
+        return 0
+
+    if situation == PreflopSituation.LIMPED:
+        return 1
+
+    if situation == PreflopSituation.FACING_OPEN:
+        return 3 if callers >= 1 else 2
+
+    if raises >= 3:
+        return 6
+
+    return 5 if in_position else 4
+
+
+def compile_preflop_table():
+    """
+    Every template of the logic, as bytes in table order.
+    """
+
+    cells = bytearray()
+
+    for position in TABLE_POSITIONS:
+        for situation, callers, raises, in_position in SPOTS:
+            for zone in TABLE_ZONES:
+                cells.extend(
+                    preflop_template(position, situation, zone, hand, callers, raises, in_position)
+                    for hand in range(_HANDS)
+                )
+
+    return bytes(cells)
+
+
+_table = None
+
+
+def lookup_template(position, spot, stack_zone, hand):
+
+    global _table
 
-    if DEBUG_MODE:
-        print("Too weak multiway → fold")
+    if _table is None:
+        _table = compile_preflop_table()
 
-    return _fold_or_check(valid_actions)
\ No newline at end of file
+    return _table[
+        _POSITION_ROWS.get(position, _OTHER_ROW) * _POSITION_STRIDE
+        + spot * _SPOT_STRIDE
+        + _ZONE_ROWS[stack_zone] * _ZONE_STRIDE
+        + hand
+    ]
@@ -0,0 +1,424 @@
+# bot/strategy/preflop/push_fold.py
+
+"""
+Push/fold equilibrium ranges by seat and stack depth (chip EV).
+
+Model: blinds 0.5 / 1bb, every stack the same effective depth S. The
+first player in either jams or folds; each player behind, in turn,
+calls or folds, and the first call ends the action (overcalls are left
+out). Equity and card removal between the jammer and a caller come
+from the heads-up matrix of bot.evaluation.preflop_matchups.
+
+    jam    EV = P(all fold) * dead money
+              + sum over callers of P(reached, calls) * (pot share * pot - S)
+    call   when pot share * pot - S > -blind posted
+
+The solver runs fictitious play (each side best-responds to the other's
+running average) for every stack depth at once, so one seat is a few
+hundred small matrix products and the whole grid solves in seconds.
+
+Seats are named by how many players are still to act behind the jammer
+(UTG: 5 ... SB: 1), so the same table serves every table size.
+
+With prize payouts set (ICM_PAYOUTS), icm_jam_gain() re-scores a
+first-in jam in prize equity against the solved calling ranges, since
+chips lost are worth more than chips won near the money. It scores
+hero's exact combo (suits included) with the 1326x1326 combo matrix.
+
+Stored as packed bits in bot/data/push_fold.bin, memory-mapped on first
+use:
+    header   MAGIC, version, seats, steps, hand classes
+    body     bits[jammer seat][player seat][stack step][169]
+             (player == jammer: jam range, else that player's call range)
+
+Build (needs bot/data/preflop_matchups.bin):
+    python -m bot.strategy.preflop.push_fold
+"""
+
+import mmap
+import os
+import struct
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from bot.config.constants import (
+    PUSH_FOLD_MIN_BB,
+    PUSH_FOLD_MAX_BB,
+    PUSH_FOLD_STACK_STEP,
+    PUSH_FOLD_ITERATIONS,
+)
+from bot.evaluation.hand_range import CLASS_COMBOS, TOTAL_COMBOS, HandRange
+from bot.evaluation.hand_utils import HAND_CODES
+from bot.evaluation.icm import icm_equity
+from bot.evaluation.preflop_matchups import EQUITY_SCALE, combo_equity_matrix, matchup_tables
+from bot.evaluation.range_equity import COMBO_CLASS, COMBO_MASKS, combo_index
+
+
+TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "push_fold.bin"
+)
+
+MAGIC = b"PSHF"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHH")
+
+# preflop action order of a full six-handed table
+SEATS = ("UTG", "MP", "CO", "BTN", "SB", "BB")
+
+BLINDS = {"SB": 0.5, "BB": 1.0}
+DEAD_MONEY = 1.5
+
+STACK_STEPS = np.arange(
+    PUSH_FOLD_MIN_BB, PUSH_FOLD_MAX_BB + PUSH_FOLD_STACK_STEP / 2, PUSH_FOLD_STACK_STEP
+)
+
+CLASSES = len(HAND_CODES)
+
+
+def seat_name(behind):
+    """
+    Seat that has `behind` players still to act (0 = BB ... 5+ = UTG).
+    """
+    return SEATS[len(SEATS) - 1 - min(behind, len(SEATS) - 1)]
+
+
+def jam_seat(behind):
+    """
+    Seat that has `behind` players still to act (1 = SB ... 5+ = UTG).
+    """
+    return seat_name(max(behind, 1))
+
+
+def callers_of(seat):
+    """
+    Players behind a jam from `seat`, in the order they act.
+    """
+    return SEATS[SEATS.index(seat) + 1:]
+
+
+# ======================================================
+# SOLVER
+# ======================================================
+
+def solve_seat(seat, equity, combos, stacks=STACK_STEPS, iterations=PUSH_FOLD_ITERATIONS):
+    """
+    (jam, calls): averaged jam frequencies (steps, 169) and call
+    frequencies (callers, steps, 169) for a jam from `seat`.
+    """
+
+    callers = callers_of(seat)
+
+    posted = BLINDS.get(seat, 0.0)
+    blinds = np.array([BLINDS.get(c, 0.0) for c in callers])[:, None, None]
+
+    # dead money in a showdown between the jammer and each caller
+    dead = DEAD_MONEY - posted - blinds
+
+    stack = np.asarray(stacks, dtype=np.float64)[:, None]
+    pot = 2 * stack + dead
+
+    # per class: combos of each opponent class left, and combos x equity
+    dealt = combos.sum(axis=1)
+    weighted = combos * equity
+
+    jam = np.ones((len(stacks), CLASSES))
+    calls = np.ones((len(callers), len(stacks), CLASSES))
+
+    for t in range(1, iterations + 1):
+
+        # jammer's best response to the average calling ranges
+        call_share = calls @ combos.T / dealt
+        call_won = calls @ weighted.T / dealt
+
+        folds = 1 - call_share
+        reached = np.cumprod(np.concatenate([np.ones_like(folds[:1]), folds[:-1]]), axis=0)
+
+        showdown = reached * (call_won * pot - call_share * stack)
+        jam_ev = folds.prod(axis=0) * (DEAD_MONEY - posted) + showdown.sum(axis=0)
+
+        jam += ((jam_ev > -posted) - jam) / (t + 1)
+
+        # callers' best response to the updated average jam range
+        jammed = jam @ combos.T
+        jam_won = jam @ weighted.T
+
+        share = np.divide(jam_won, jammed, out=np.zeros_like(jam_won), where=jammed > 0)
+        best_calls = share * pot - stack > -blinds
+
+        calls += (best_calls - calls) / (t + 1)
+
+    return jam, calls
+
+
+def solve_all(equity, combos, stacks=STACK_STEPS, iterations=PUSH_FOLD_ITERATIONS):
+    """
+    bool (jammer seat, player seat, step, 169) of every seat that can
+    jam first in (UTG ... SB).
+    """
+
+    ranges = np.zeros((len(SEATS), len(SEATS), len(stacks), CLASSES), dtype=bool)
+
+    for j, seat in enumerate(SEATS[:-1]):
+        jam, calls = solve_seat(seat, equity, combos, stacks, iterations)
+
+        ranges[j, j] = jam >= 0.5
+        ranges[j, j + 1:] = calls >= 0.5
+
+    return ranges
+
+
+# ======================================================
+# LOOKUP
+# ======================================================
+
+_ranges = None
+_loaded = False
+
+
+def _load():
+
+    global _ranges, _loaded
+    _loaded = True
+
+    if not os.path.exists(TABLE_PATH):
+        return
+
+    with open(TABLE_PATH, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, seats, steps, classes = HEADER.unpack_from(mapped, 0)
+
+    if (magic, version, seats, steps, classes) != (MAGIC, VERSION, len(SEATS), len(STACK_STEPS), CLASSES):
+        return
+
+    packed = np.frombuffer(mapped, dtype=np.uint8, offset=HEADER.size)
+    _ranges = packed.reshape(seats, seats, steps, -1)
+
+
+def stack_step(stack_bb):
+    """
+    Nearest solved stack depth (row of STACK_STEPS), clamped to the grid.
+    """
+
+    row = round((stack_bb - PUSH_FOLD_MIN_BB) / PUSH_FOLD_STACK_STEP)
+    return min(max(row, 0), len(STACK_STEPS) - 1)
+
+
+@lru_cache(maxsize=None)
+def _solved(jammer, player, step):
+
+    bits = np.unpackbits(_ranges[jammer, player, step], count=CLASSES)
+    return HandRange.from_indices(np.flatnonzero(bits).tolist())
+
+
+def solved_range(jammer, player, stack_bb):
+    """
+    HandRange of `player` when `jammer` jams first in at stack_bb:
+    the jam range for player == jammer, else player's call range.
+    None when the table is missing.
+    """
+
+    if not _loaded:
+        _load()
+
+    if _ranges is None:
+        return None
+
+    return _solved(SEATS.index(jammer), SEATS.index(player), stack_step(stack_bb))
+
+
+def effective_stack_bb(state):
+    """
+    Smaller of hero's and the largest opponent's chips at the start of
+    the street (stack plus chips already in front), in big blinds.
+    """
+
+    tracker = state.tracker
+
+    def chips(uuid):
+        return tracker.stacks.get(uuid, 0) + tracker.street_bets.get(uuid, 0)
+
+    opponents = [chips(u) for u in tracker.alive_order if u != state.hero_uuid]
+    hero = chips(state.hero_uuid)
+
+    return min(hero, max(opponents, default=hero)) / state.big_blind
+
+
+def push_fold_range(state):
+    """
+    Solved range hero jams with, or None when the table is missing.
+
+    First in (or over limpers) hero jams with the jam range of the seat
+    with as many players behind as there are opponents left. Facing a
+    raise, the raise stands in for a jam from the raiser's seat and hero
+    jams with the range that calls it from hero's own seat (the big
+    blind's when hero acted before the raiser).
+    """
+
+    tracker = state.tracker
+
+    if state.preflop_context["raises_before"] == 0:
+        jammer = jam_seat(len(tracker.alive_order) - 1)
+        return solved_range(jammer, jammer, effective_stack_bb(state))
+
+    raiser = seats_behind(tracker, tracker.preflop_raisers[-1])
+    hero = seats_behind(tracker, state.hero_uuid)
+
+    jammer = jam_seat(raiser)
+
+    if hero < raiser:
+        # players beyond a six-handed table call like the first seat behind
+        player = seat_name(min(hero, len(callers_of(jammer)) - 1))
+    else:
+        player = "BB"
+
+    return solved_range(jammer, player, effective_stack_bb(state))
+
+
+# ======================================================
+# ICM
+# ======================================================
+
+def preflop_order(tracker):
+    """
+    Participating uuids in preflop action order (first after the big
+    blind first, big blind last).
+    """
+
+    seats = len(tracker.positions)
+    return sorted(tracker.alive_order, key=lambda u: (tracker.positions[u][0] - 3) % seats)
+
+
+def seats_behind(tracker, uuid):
+    """
+    Players dealt in who act after `uuid` preflop (0 = the big blind).
+    """
+
+    seats = len(tracker.positions)
+    return seats - 1 - (tracker.positions[uuid][0] - 3) % seats
+
+
+def icm_jam_gain(state, payouts):
+    """
+    Prize equity a first-in jam with hero's hole cards wins over
+    folding, in payout units; None when the tables are missing or the
+    pot is already opened.
+
+    Each player behind calls with their solved call range at their own
+    effective stack, one after another until someone calls (the same
+    model the tables are solved with). Every outcome -- all fold, or the
+    first caller wins / loses the all-in -- is scored on the ICM of all
+    stacks at the table, players out of the hand included. If hero
+    folds, the blinds go to the big blind.
+    """
+
+    ctx = state.preflop_context
+
+    if ctx["raises_before"] or ctx["limpers_before"] or ctx["callers_before"]:
+        return None
+
+    matrix = combo_equity_matrix()
+    if matrix is None:
+        return None
+
+    tracker = state.tracker
+    hero = state.hero_uuid
+
+    opponents = [u for u in preflop_order(tracker) if u != hero]
+    if not opponents:
+        return None
+
+    jammer = jam_seat(len(opponents))
+    names = callers_of(jammer)
+
+    # early players beyond a six-handed table call like the first seat behind
+    seats = [names[0]] * (len(opponents) - len(names)) + list(names[-len(opponents):])
+
+    players = list(tracker.stacks)
+    index = {u: i for i, u in enumerate(players)}
+    behind = [tracker.stacks[u] for u in players]
+    posted = {u: tracker.street_bets.get(u, 0) for u in players}
+    pot = sum(tracker.contributions.values())
+
+    def value(changes):
+        stacks = list(behind)
+        for u, delta in changes:
+            stacks[index[u]] += delta
+        return icm_equity(stacks, payouts, index[hero])
+
+    # hero's exact combo against every villain combo it leaves
+    hero_combo = combo_index(state.hero_ints)
+    dealt = (COMBO_MASKS & COMBO_MASKS[hero_combo]) == 0
+    equity = matrix[hero_combo] / EQUITY_SCALE
+    total = dealt.sum()
+
+    jam_value = 0.0
+    reach = 1.0
+
+    for u, seat in zip(opponents, seats):
+        matched = min(behind[index[hero]] + posted[hero], behind[index[u]] + posted[u])
+
+        call_range = solved_range(jammer, seat, matched / state.big_blind)
+        if call_range is None:
+            return None
+
+        calling = dealt & (np.frombuffer(call_range.members, dtype=np.uint8)[COMBO_CLASS] == 1)
+        call_share = calling.sum() / total
+
+        if call_share > 0:
+            won = equity[calling].mean()
+
+            hero_in = matched - posted[hero]
+            caller_in = matched - posted[u]
+            showdown_pot = pot + hero_in + caller_in
+
+            win = value([(hero, showdown_pot - hero_in), (u, -caller_in)])
+            lose = value([(hero, -hero_in), (u, showdown_pot - caller_in)])
+
+            jam_value += reach * call_share * (won * win + (1 - won) * lose)
+
+        reach *= 1 - call_share
+
+    jam_value += reach * value([(hero, pot)])
+    fold_value = value([(opponents[-1], pot)])
+
+    return jam_value - fold_value
+
+
+# ======================================================
+# BUILD
+# ======================================================
+
+def build_table(path=TABLE_PATH):
+
+    tables = matchup_tables()
+    if tables is None:
+        raise RuntimeError("build bot/data/preflop_matchups.bin first "
+                           "(python -m bot.evaluation.preflop_matchups)")
+
+    start = time.perf_counter()
+    ranges = solve_all(*tables)
+    elapsed = time.perf_counter() - start
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(SEATS), len(STACK_STEPS), CLASSES))
+        f.write(np.packbits(ranges, axis=-1).tobytes())
+
+    print(f"[PUSH/FOLD] {len(SEATS) - 1} seats x {len(STACK_STEPS)} stacks solved in {elapsed:.1f}s")
+
+    for j, seat in enumerate(SEATS[:-1]):
+        shares = [
+            100 * ranges[j, j, stack_step(stack_bb)] @ CLASS_COMBOS / TOTAL_COMBOS
+            for stack_bb in (5, 10, 15, 20)
+        ]
+        print(f"  {seat:>3} jams " + "  ".join(f"{x:5.1f}%" for x in shares) + "  (5/10/15/20bb)")
+
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    build_table()
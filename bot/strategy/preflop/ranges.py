@@ -1,308 +1,161 @@
 """
 Preflop ranges — TAG+ Tournament Style
 
-Hands are stored in normalized format:
-AA, AKs, AKo, 76s, etc.
-
-Always use normalize_hand() before checking membership.
+Ranges are written in standard notation ("22+, A2s+, KTo+, 98s") and
+compiled at import into HandRange bitsets (bot.evaluation.range_notation,
+cached in bot/data/compiled_ranges.json). A bad or non-canonical code
+fails the import with ValueError instead of silently never matching.
+
+The lookups take the grid index from hand_index() (int cards) and read
+one byte of the compiled range; `"AKs" in OPEN_RANGES["UTG"]["raise"]`
+still works for hand codes.
 """
 
-from bot.config.constants import DEBUG_MODE
+from bot.config import constants
+from bot.evaluation.hand_utils import HAND_CODES
+from bot.evaluation.range_notation import compile_ranges
 
 
 # ==================================================
 # UNOPENED OPEN RANGES (Raise First In)
 # ==================================================
 
-OPEN_RANGES = {
+OPEN_RANGES = compile_ranges("OPEN_RANGES", {
 
     # ---------------- UTG ----------------
     "UTG": {
-        "raise": {
-            "77", "88", "99", "TT", "JJ", "QQ", "KK", "AA",
-            "AJs", "AQs", "AKs", "KQs",
-            "AQo", "AKo",
-        }
+        "raise": "77+, AJs+, KQs, AQo+"
     },
 
     # ---------------- MP ----------------
     "MP": {
-        "raise": {
-            "66", "77", "88", "99", "TT", "JJ", "QQ", "KK", "AA",
-            "ATs", "AJs", "AQs", "AKs",
-            "KJs", "KQs", "QJs",
-            "AJo", "AQo", "AKo",
-            "KQo",
-        }
+        "raise": "66+, ATs+, KJs+, QJs, AJo+, KQo"
     },
 
     "CO": {
-        "raise": {
-
-            # All pairs
-            "22","33","44","55","66","77","88","99",
-            "TT","JJ","QQ","KK","AA",
-
-            # All suited aces
-            "A2s","A3s","A4s","A5s","A6s","A7s",
-            "A8s","A9s","ATs","AJs","AQs","AKs",
-
-            # Offsuit aces
-            "A7o","A8o","A9o","ATo","AJo","AQo","AKo",
-
-            # Suited kings
-            "K7s","K8s","K9s","KTs","KJs","KQs",
-
-            # Offsuit kings
-            "KTo","KJo","KQo",
-
-            # Suited queens
-            "Q8s","Q9s","QTs","QJs",
-
-            # Offsuit queens
-            "Q9o","QTo",
-
-            # Suited connectors
-            "J9s","JTs",
-            "T8s","T9s",
-            "98s","87s","76s"
-        }
+        "raise": (
+            "22+, "                     # all pairs
+            "A2s+, A7o+, "              # suited aces, offsuit aces
+            "K7s+, KTo+, "              # kings
+            "Q8s+, QTo-Q9o, "           # queens
+            "J9s+, T8s+, 98s, 87s, 76s"  # suited connectors
+        )
     },
 
     # ---------------- BTN ----------------
     "BTN": {
-        "raise": {
-
-            # All pairs
-            "22","33","44","55","66","77","88","99",
-            "TT","JJ","QQ","KK","AA",
-
-            # ALL suited aces
-            "A2s","A3s","A4s","A5s","A6s","A7s",
-            "A8s","A9s","ATs","AJs","AQs","AKs",
-
-            # ALL offsuit aces
-            "A2o","A3o","A4o","A5o","A6o","A7o",
-            "A8o","A9o","ATo","AJo","AQo","AKo",
-
-            # Suited kings
-            "K2s","K3s","K4s","K5s","K6s","K7s",
-            "K8s","K9s","KTs","KJs","KQs",
-
-            # Offsuit kings (stronger)
-            "K9o","KTo","KJo","KQo",
-
-            # Suited queens
-            "Q5s","Q6s","Q7s","Q8s","Q9s",
-            "QTs","QJs","QKs",
-
-            # Offsuit queens
-            "Q9o","QTo","QJo",
-
-            # Suited jacks
-            "J7s","J8s","J9s","JTs",
-
-            # Offsuit jacks
-            "J9o","JTo",
-
-            # Suited connectors & gappers
-            "T8s","T9s",
-            "97s","98s",
-            "86s","87s",
-            "76s","65s"
-        }
+        "raise": (
+            "22+, "                     # all pairs
+            "A2s+, A2o+, "              # all aces
+            "K2s+, K9o+, "              # kings (offsuit: stronger)
+            "Q5s+, Q9o+, "              # queens
+            "J7s+, J9o+, "              # jacks
+            "T8s+, 97s+, 86s+, 76s, 65s"  # suited connectors & gappers
+        )
     },
 
     # ---------------- SB ----------------
     "SB": {
-        "raise": {
-            "22", "33", "44", "55", "66", "77", "88", "99",
-            "TT", "JJ", "QQ", "KK", "AA",
-
-            "A2s", "A3s", "A4s", "A5s", "A6s", "A7s",
-            "A8s", "A9s", "ATs", "AJs", "AQs", "AKs",
-
-            "K9s", "KTs", "KJs", "KQs",
-            "QTs", "QJs",
-            "JTs",
-
-            "A9o", "ATo", "AJo", "AQo", "AKo",
-            "KJo", "KQo",
-        }
-    },
-}
+        "raise": "22+, A2s+, K9s+, QTs+, JTs, A9o+, KJo+"
+    }
+})
 
 
 # ==================================================
 # FACING OPEN RANGES (POSITION-AWARE)
 # ==================================================
 
-FACING_OPEN_RANGES = {
+FACING_OPEN_RANGES = compile_ranges("FACING_OPEN_RANGES", {
 
     # BTN vs CO / MP opens
     "BTN": {
-        "value_3bet": {
-            "TT","JJ","QQ","KK","AA",
-            "AQs","AKs","AQo","AKo"
-        },
-        "bluff_3bet": {
-            "A5s","A4s",
-            "KTs","QTs",
-            "JTs","T9s"
-        },
-        "call": {
-            "22","33","44","55","66","77","88","99",
-            "AJs","ATs",
-            "KJs","QJs",
-            "J9s","98s","87s"
-        }
+        "value_3bet": "TT+, AQs+, AQo+",
+        "bluff_3bet": "A5s-A4s, KTs, QTs, JTs, T9s",
+        "call": "99-22, AJs-ATs, KJs, QJs, J9s, 98s, 87s"
     },
 
     # SB vs BTN open (aggressive spot)
     "SB": {
-        "value_3bet": {
-            "99","TT","JJ","QQ","KK","AA",
-            "AQs","AKs","AQo","AKo"
-        },
-        "bluff_3bet": {
-            "A5s","A4s","A3s",
-            "KTs","KJs",
-            "QTs","QJs",
-            "JTs","T9s"
-        },
-        "call": {
-            "22","33","44","55","66","77","88",
-            "ATs","AJs",
-            "KQo","KJo"
-        }
+        "value_3bet": "99+, AQs+, AQo+",
+        "bluff_3bet": "A5s-A3s, KJs-KTs, QTs+, JTs, T9s",
+        "call": "88-22, AJs-ATs, KJo+"
     },
 
     # BB vs CO open (linear)
     "BB": {
-        "value_3bet": {
-            "JJ","QQ","KK","AA",
-            "AKs","AQs","AKo"
-        },
-        "bluff_3bet": {
-            "A5s","A4s",
-            "KTs","QTs"
-        },
-        "call": {
-            "22","33","44","55","66","77","88","99","TT",
-            "AJs","ATs",
-            "KJs","KTs",
-            "QJs","QTs",
-            "JTs","T9s","98s","87s"
-        }
+        "value_3bet": "JJ+, AQs+, AKo",
+        "bluff_3bet": "A5s-A4s, KTs, QTs",
+        "call": "TT-22, AJs-ATs, KJs-KTs, QTs+, JTs, T9s, 98s, 87s"
     }
-}
+})
+
 # ==================================================
 # LIMPED POT ISOLATION RANGES
 # ==================================================
 
-LIMP_ISO_RANGES = {
+LIMP_ISO_RANGES = compile_ranges("LIMP_ISO_RANGES", {
 
     "BTN": {
-        "raise": {
-
-            # All pairs
-            "22","33","44","55","66","77","88","99",
-            "TT","JJ","QQ","KK","AA",
-
-            # All suited aces
-            "A2s","A3s","A4s","A5s","A6s","A7s",
-            "A8s","A9s","ATs","AJs","AQs","AKs",
-
-            # Suited kings
-            "K7s","K8s","K9s","KTs","KJs","KQs",
-
-            # Suited queens
-            "Q8s","Q9s","QTs","QJs",
-
-            # Suited connectors
-            "J8s","J9s","JTs",
-            "T8s","T9s",
-            "97s","98s",
-            "87s","76s",
-
-            # Offsuit aces
-            "A7o","A8o","A9o","ATo","AJo","AQo","AKo",
-
-            # Offsuit broadways
-            "KTo","KJo","KQo",
-            "QTo","JTo"
-        }
+        "raise": (
+            "22+, "                         # all pairs
+            "A2s+, A7o+, "                  # aces
+            "K7s+, Q8s+, "                  # suited kings, queens
+            "J8s+, T8s+, 97s+, 87s, 76s, "  # suited connectors
+            "KTo+, QTo, JTo"                # offsuit broadways
+        )
     },
 
     "CO": {
-        "raise": {
-
-            # Pairs
-            "44","55","66","77","88","99",
-            "TT","JJ","QQ","KK","AA",
-
-            # Suited Aces
-            "A5s","A6s","A7s","A8s","A9s",
-            "ATs","AJs","AQs","AKs",
-
-            # Suited Broadways
-            "K9s","KTs","KJs","KQs",
-            "Q9s","QTs","QJs",
-            "J9s","JTs","T9s","98s",
-
-            # Offsuit
-            "A9o","ATo","AJo","AQo","AKo",
-            "KJo","KQo"
-        }
+        "raise": (
+            "44+, "                             # pairs
+            "A5s+, "                            # suited aces
+            "K9s+, Q9s+, J9s+, T9s, 98s, "      # suited broadways
+            "A9o+, KJo+"                        # offsuit
+        )
     },
 
     "SB": {
-        "raise": {
-            "66","77","88","99",
-            "TT","JJ","QQ","KK","AA",
-
-            "ATs","AJs","AQs","AKs",
-            "KTs","KJs","KQs",
-            "AQo","AKo"
-        }
+        "raise": "66+, ATs+, KTs+, AQo+"
     }
-}
+})
+
+
 # ==================================================
 # HELPER FUNCTIONS
 # ==================================================
 
-def in_open_range(position_name: str, hand_code: str) -> bool:
+def in_open_range(position_name: str, hand: int) -> bool:
     """
     True if hand is in RFI range.
     """
 
     if position_name not in OPEN_RANGES:
-        if DEBUG_MODE:
+        if constants.DEBUG_MODE:
             print(f"[RANGE] No open range for {position_name}")
         return False
 
-    in_range = hand_code in OPEN_RANGES[position_name]["raise"]
+    in_range = OPEN_RANGES[position_name]["raise"].members[hand] == 1
 
-    if DEBUG_MODE:
-        print(f"[RANGE] {hand_code} in {position_name} OPEN range? {in_range}")
+    if constants.DEBUG_MODE:
+        print(f"[RANGE] {HAND_CODES[hand]} in {position_name} OPEN range? {in_range}")
 
     return in_range
 
 
-def get_facing_open_bucket(position_name: str, hand_code: str):
+def get_facing_open_bucket(position_name: str, hand: int):
 
     if position_name not in FACING_OPEN_RANGES:
         return None
 
     position_ranges = FACING_OPEN_RANGES[position_name]
 
-    if hand_code in position_ranges["value_3bet"]:
+    if position_ranges["value_3bet"].members[hand]:
         return "value_3bet"
 
-    if hand_code in position_ranges["bluff_3bet"]:
+    if position_ranges["bluff_3bet"].members[hand]:
         return "bluff_3bet"
 
-    if hand_code in position_ranges["call"]:
+    if position_ranges["call"].members[hand]:
         return "call"
 
     return None
@@ -311,65 +164,30 @@ def get_facing_open_bucket(position_name: str, hand_code: str):
 # FACING RE-RERAISE RANGES (3-Bet Defense)
 # ==================================================
 
-FACING_RERAISE_RANGES = {
+FACING_RERAISE_RANGES = compile_ranges("FACING_RERAISE_RANGES", {
 
     "default": {
-        "value_4bet": {
-            "AA", "KK", "QQ",
-            "AKs", "AKo"
-        },
+        "value_4bet": "QQ+, AKs, AKo",
 
-        "call_3bet": {
-            "JJ", "TT", "99",
-            "AQs", "KQs"
-        },
+        "call_3bet": "JJ-99, AQs, KQs",
 
         # Short stack jam bucket (≤20bb)
-        "jam": {
-            "AA", "KK", "QQ", "JJ", "TT",
-            "AKs", "AKo", "AQs"
-        }
-    }
-}
-BB_DEFEND_RANGE = {
-    "call": {
-
-        # All pairs
-        "22","33","44","55","66","77","88","99","TT",
-
-        # ALL suited aces
-        "A2s","A3s","A4s","A5s","A6s","A7s","A8s","A9s",
-        "ATs","AJs","AQs",
-
-        # Offsuit aces (reasonable ones)
-        "A7o","A8o","A9o","ATo","AJo",
-
-        # Suited kings
-        "K2s","K3s","K4s","K5s","K6s","K7s",
-        "K8s","K9s","KTs","KJs","KQs",
-
-        # Offsuit kings
-        "K9o","KTo","KJo",
-
-        # Suited queens
-        "Q5s","Q6s","Q7s","Q8s","Q9s",
-        "QTs","QJs",
-
-        # Offsuit queens
-        "Q9o","QTo",
-
-        # Suited jacks
-        "J7s","J8s","J9s","JTs",
-
-        # Suited connectors
-        "T7s","T8s","T9s",
-        "97s","98s",
-        "86s","87s",
-        "76s","65s"
+        "jam": "TT+, AQs+, AKo"
     }
-}
-
-def get_facing_reraise_bucket(hand_code: str, stack_zone: str):
+})
+
+BB_DEFEND_RANGE = compile_ranges("BB_DEFEND_RANGE", {
+    "call": (
+        "TT-22, "                   # pairs
+        "AQs-A2s, AJo-A7o, "        # suited aces, reasonable offsuit aces
+        "K2s+, KJo-K9o, "           # kings
+        "Q5s+, QTo-Q9o, "           # queens
+        "J7s+, "                    # suited jacks
+        "T7s+, 97s+, 86s+, 76s, 65s"  # suited connectors
+    )
+})
+
+def get_facing_reraise_bucket(hand: int, stack_zone: str):
     """
     Returns:
         "value_4bet"
@@ -382,166 +200,120 @@ def get_facing_reraise_bucket(hand_code: str, stack_zone: str):
 
     # Short stack jam logic
     if stack_zone in {"SHORT", "ULTRA_SHORT", "PRESSURE"}:
-        if hand_code in ranges["jam"]:
+        if ranges["jam"].members[hand]:
             return "jam"
         return None
 
     # Normal stack logic
-    if hand_code in ranges["value_4bet"]:
+    if ranges["value_4bet"].members[hand]:
         return "value_4bet"
 
-    if hand_code in ranges["call_3bet"]:
+    if ranges["call_3bet"].members[hand]:
         return "call_3bet"
 
     return None
 
-def in_limp_iso_range(position_name: str, hand_code: str) -> bool:
+def in_limp_iso_range(position_name: str, hand: int) -> bool:
     if position_name not in LIMP_ISO_RANGES:
         return False
 
-    return hand_code in LIMP_ISO_RANGES[position_name]["raise"]
+    return LIMP_ISO_RANGES[position_name]["raise"].members[hand] == 1
 
-def in_bb_defend_range(hand_code: str) -> bool:
-    return hand_code in BB_DEFEND_RANGE["call"]
+def in_bb_defend_range(hand: int) -> bool:
+    return BB_DEFEND_RANGE["call"].members[hand] == 1
 
 
 # ==================================================
 # POSITION-AWARE 3BET RANGES
 # ==================================================
 
-THREE_BET_RANGES = {
+THREE_BET_RANGES = compile_ranges("THREE_BET_RANGES", {
 
     # BTN vs CO / MP opens
     "BTN": {
-        "value": {
-            "TT","JJ","QQ","KK","AA",
-            "AQs","AKs","AQo","AKo"
-        },
-        "bluff": {
-            "A5s","A4s",
-            "KTs","QTs",
-            "JTs","T9s"
-        }
+        "value": "TT+, AQs+, AQo+",
+        "bluff": "A5s-A4s, KTs, QTs, JTs, T9s"
     },
 
     # SB vs BTN opens (most aggressive spot)
     "SB": {
-        "value": {
-            "99","TT","JJ","QQ","KK","AA",
-            "AQs","AKs","AQo","AKo"
-        },
-        "bluff": {
-            "A5s","A4s","A3s",
-            "KTs","KJs",
-            "QTs","QJs",
-            "JTs","T9s"
-        }
+        "value": "99+, AQs+, AQo+",
+        "bluff": "A5s-A3s, KJs-KTs, QTs+, JTs, T9s"
     },
 
     # BB vs CO open (more linear)
     "BB": {
-        "value": {
-            "JJ","QQ","KK","AA",
-            "AKs","AQs","AKo"
-        },
-        "bluff": {
-            "A5s","A4s",
-            "KTs",
-            "QTs"
-        }
+        "value": "JJ+, AQs+, AKo",
+        "bluff": "A5s-A4s, KTs, QTs"
     }
-}
+})
 
-def get_3bet_bucket(position_name: str, hand_code: str):
+def get_3bet_bucket(position_name: str, hand: int):
 
     if position_name not in THREE_BET_RANGES:
         return None
 
-    if hand_code in THREE_BET_RANGES[position_name]["value"]:
+    if THREE_BET_RANGES[position_name]["value"].members[hand]:
         return "value"
 
-    if hand_code in THREE_BET_RANGES[position_name]["bluff"]:
+    if THREE_BET_RANGES[position_name]["bluff"].members[hand]:
         return "bluff"
 
     return None
 
 
 """
-Push/Fold Engine — Static Tournament Version
+Push/Fold Engine — Tournament Version
 
 Used when stack is SHORT / ULTRA_SHORT / PRESSURE (≤20bb)
 
+Jams with the chip-EV equilibrium range of push_fold.py for the seat
+and effective stack (per 0.5bb); the static PUSH_RANGES below are the
+fallback when bot/data/push_fold.bin is missing. With ICM_PAYOUTS set,
+a first-in jam is decided on prize equity instead (icm_jam_gain).
+
 Returns:
     ("raise", all_in_amount)  -> JAM
     ("fold", 0)
 """
 
-from bot.evaluation.hand_utils import normalize_hand
-from bot.config.constants import DEBUG_MODE
+from bot.config.constants import ICM_PAYOUTS
+from bot.evaluation.hand_utils import hand_index
+from bot.strategy.preflop.push_fold import icm_jam_gain, push_fold_range
 
 
 # ==================================================
-# PUSH RANGES (Tournament Baseline)
+# PUSH RANGES (Static Fallback)
 # ==================================================
 
-PUSH_RANGES = {
+PUSH_RANGES = compile_ranges("PUSH_RANGES", {
 
     # ----------------------------------
     # BTN (Heads-up or Late)
     # ----------------------------------
     "BTN": {
-        "push": {
-            # All pairs
-            "22","33","44","55","66","77","88","99","TT","JJ","QQ","KK","AA",
-
-            # All aces
-            "A2s","A3s","A4s","A5s","A6s","A7s","A8s","A9s",
-            "ATs","AJs","AQs","AKs",
-            "A2o","A3o","A4o","A5o","A6o","A7o","A8o","A9o",
-            "ATo","AJo","AQo","AKo",
-
-            # Broadways
-            "K8s","K9s","KTs","KJs","KQs",
-            "KTo","KJo","KQo",
-            "Q9s","QTs","QJs",
-            "JTs",
-
-            # Suited connectors
-            "T9s","98s","87s"
-        }
+        "push": (
+            "22+, "                     # all pairs
+            "A2s+, A2o+, "              # all aces
+            "K8s+, KTo+, Q9s+, JTs, "   # broadways
+            "T9s, 98s, 87s"             # suited connectors
+        )
     },
 
     # ----------------------------------
     # SB (Similar to BTN)
     # ----------------------------------
     "SB": {
-        "push": {
-            "22","33","44","55","66","77","88","99","TT","JJ","QQ","KK","AA",
-            "A2s","A3s","A4s","A5s","A6s","A7s","A8s","A9s",
-            "ATs","AJs","AQs","AKs",
-            "A2o","A3o","A4o","A5o","A6o","A7o","A8o","A9o",
-            "ATo","AJo","AQo","AKo",
-            "K9s","KTs","KJs","KQs",
-            "KTo","KJo","KQo",
-            "QTs","QJs","JTs"
-        }
+        "push": "22+, A2s+, A2o+, K9s+, KTo+, QTs+, JTs"
     },
 
     # ----------------------------------
     # BB vs Open (Stronger Range)
     # ----------------------------------
     "BB": {
-        "push": {
-            "22","33","44","55","66","77","88","99","TT","JJ","QQ","KK","AA",
-            "A2s","A3s","A4s","A5s","A6s","A7s","A8s","A9s",
-            "ATs","AJs","AQs","AKs",
-            "A2o","A3o","A4o","A5o","A6o","A7o","A8o","A9o",
-            "ATo","AJo","AQo","AKo",
-            "KTs","KJs","KQs",
-            "QJs","JTs"
-        }
+        "push": "22+, A2s+, A2o+, KTs+, QJs, JTs"
     }
-}
+})
 
 
 # ==================================================
@@ -553,24 +325,41 @@ def get_push_fold_action(state, valid_actions):
     Determines jam/fold decision.
     """
 
-    hand_code = normalize_hand(state.hero_cards)
+    hand = hand_index(state.hero_ints)
     position = state.hero_position_name
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("\n[PUSH/FOLD ENGINE]")
-        print(f"Hand: {hand_code}")
+        print(f"Hand: {HAND_CODES[hand]}")
         print(f"Position: {position}")
         print(f"Stack BB: {state.stack_bb:.1f}")
 
-    if position not in PUSH_RANGES:
-        if DEBUG_MODE:
-            print("No push range for this position → fold")
-        return _fold(valid_actions)
+    if ICM_PAYOUTS is not None:
+        gain = icm_jam_gain(state, ICM_PAYOUTS)
+
+        if gain is not None:
+            if constants.DEBUG_MODE:
+                print(f"ICM jam gain: {gain:+.4f}")
+
+            return _jam(state, valid_actions) if gain > 0 else _fold(valid_actions)
+
+    jam_range = push_fold_range(state)
+
+    if jam_range is None:
+        if position not in PUSH_RANGES:
+            if constants.DEBUG_MODE:
+                print("No push range for this position → fold")
+            return _fold(valid_actions)
+
+        jam_range = PUSH_RANGES[position]["push"]
+
+    elif constants.DEBUG_MODE:
+        print(f"Solved range: {jam_range.percent():.1f}% of hands")
 
-    if hand_code in PUSH_RANGES[position]["push"]:
+    if jam_range.members[hand]:
         return _jam(state, valid_actions)
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print("Not in push range → fold")
 
     return _fold(valid_actions)
@@ -589,7 +378,7 @@ def _jam(state, valid_actions):
 
     max_raise = raise_info["amount"]["max"]
 
-    if DEBUG_MODE:
+    if constants.DEBUG_MODE:
         print(f"JAM for {max_raise}")
 
     return "raise", max_raise
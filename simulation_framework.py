@@ -1,16 +1,26 @@
 import sys
 import os
 import csv
+import random
 import statistics
+from collections import namedtuple
 import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pypokerengine.api.game import setup_config, start_poker
+from pypokerengine.players import BasePokerPlayer
 from dumb_bot import DumbBot
 from super_bot import SuperBot
 from tournament_titan import TournamentTitan
 from apex_predator import ApexPredator
 from smart_bot import SmartPokerBot
 from bot.main_bot import WorldClassBot
+from bot.evaluation.equity_service import EquityService, install_service
+from bot.evaluation.table_equity import TableEquity, install_table
+from bot.evaluation.icm import icm_equities
+from bot.config import constants
+from bot.evaluation import enumeration, range_equity, table_equity, vectorized
+from bot.evaluation.equity_cache import EQUITY_CACHE
 import io
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -24,7 +34,31 @@ ROUNDS_PER_GAME = 100
 INITIAL_STACK = 1000
 SMALL_BLIND = 10
 TARGET_BOT = "World_Class_Bot"
+PAYOUTS = (0.5, 0.3, 0.2)   # prize shares by finishing place, for ICM equity
 LOG_DIR = "simulation_logs"
+BASE_SEED = 2024            # game i is seeded with BASE_SEED + i
+GAME_WORKERS = None         # games run at once (None = one per core, 1 = in this process)
+VERBOSE_LOGS = False        # write each game's engine and bot output to LOG_DIR
+
+# ======================================================
+# SEEDING
+# ======================================================
+
+def seed_game(seed):
+    """
+    Seeds everything a game draws from -- the deck shuffle and the bots'
+    choices (python random), the numpy samplers of bot.evaluation --
+    and empties the Monte Carlo caches, so a game plays the same
+    whichever process runs it and whatever ran there before.
+    """
+
+    random.seed(seed)
+
+    for stream, module in enumerate((enumeration, vectorized, table_equity, range_equity)):
+        module.reseed([seed, stream])
+
+    EQUITY_CACHE.clear()
+    range_equity.clear_caches()
 
 # ======================================================
 # TEE LOGGER
@@ -40,12 +74,70 @@ class Tee:
                 f.write(data)
             except UnicodeEncodeError:
                 f.write(data.encode("utf-8", errors="ignore").decode("utf-8"))
-            f.flush()
 
     def flush(self):
         for f in self.files:
             f.flush()
 
+# ======================================================
+# EVENT RECORDER
+# ======================================================
+
+# kind: "round", "street", "action", "showdown" (a player shows down)
+# or "win"; player is a name, amount the action's chips or the
+# winner's stack
+Event = namedtuple("Event", "kind street player action amount")
+
+
+class EventRecorder(BasePokerPlayer):
+    """
+    Seats a bot and keeps the engine's messages to it as Event records
+    (every player's actions reach every seat), so stats come from the
+    game itself instead of its printed log.
+    """
+
+    def __init__(self, bot):
+        super().__init__()
+        self.bot = bot
+        self.events = []
+        self.names = {}
+        self.street = None
+
+    def set_uuid(self, uuid):
+        self.uuid = uuid
+        self.bot.set_uuid(uuid)
+
+    def declare_action(self, valid_actions, hole_card, round_state):
+        return self.bot.declare_action(valid_actions, hole_card, round_state)
+
+    def receive_game_start_message(self, game_info):
+        self.names = {seat["uuid"]: seat["name"] for seat in game_info["seats"]}
+        self.bot.receive_game_start_message(game_info)
+
+    def receive_round_start_message(self, round_count, hole_card, seats):
+        self.street = "preflop"
+        self.events.append(Event("round", "preflop", None, None, round_count))
+        self.bot.receive_round_start_message(round_count, hole_card, seats)
+
+    def receive_street_start_message(self, street, round_state):
+        self.street = street
+        self.events.append(Event("street", street, None, None, 0))
+        self.bot.receive_street_start_message(street, round_state)
+
+    def receive_game_update_message(self, new_action, round_state):
+        self.events.append(Event(
+            "action", self.street, self.names.get(new_action["player_uuid"]),
+            new_action["action"], new_action["amount"]
+        ))
+        self.bot.receive_game_update_message(new_action, round_state)
+
+    def receive_round_result_message(self, winners, hand_info, round_state):
+        for info in hand_info:
+            self.events.append(Event("showdown", self.street, self.names.get(info["uuid"]), None, 0))
+        for winner in winners:
+            self.events.append(Event("win", self.street, winner["name"], None, winner["stack"]))
+        self.bot.receive_round_result_message(winners, hand_info, round_state)
+
 # ======================================================
 # STATS COLLECTOR
 # ======================================================
@@ -54,6 +146,8 @@ class StatsCollector:
 
     def __init__(self):
         self.results = []
+        self.icm_results = []
+        self.dedupe_ratios = []
 
         # Basic actions
         self.total_raises = 0
@@ -85,88 +179,109 @@ class StatsCollector:
 
     # --------------------------------------------------
 
-    def add_game_result(self, profit):
+    def merge(self, other):
+        """
+        Adds another collector's games (one game's, from a worker).
+        """
+        for name, value in vars(other).items():
+            if isinstance(value, list):
+                getattr(self, name).extend(value)
+            else:
+                setattr(self, name, getattr(self, name) + value)
+
+    # --------------------------------------------------
+
+    def add_game_result(self, profit, icm=None):
         self.results.append(profit)
+        if icm is not None:
+            self.icm_results.append(icm)
+
+    def add_equity_report(self, table):
+        # equity requests per computation at the game's shared table
+        self.dedupe_ratios.append(table.dedupe_ratio)
 
     # --------------------------------------------------
 
-    def parse_actions_from_log(self, log_path):
+    def add_events(self, events):
 
         street = "preflop"
         hero_raised_preflop = False
+        hero_showed_down = False
         preflop_raises = 0
+        hands = 0
+
+        for event in events:
 
-        with open(log_path, "r") as f:
-            for line in f:
+            # New hand
+            if event.kind == "round":
+                hands += 1
+                street = "preflop"
+                hero_raised_preflop = False
+                hero_showed_down = False
+                preflop_raises = 0
 
-                # Detect new hand
-                if "Started the round" in line:
-                    self.total_hands += 1
-                    street = "preflop"
-                    hero_raised_preflop = False
-                    preflop_raises = 0
+            # Street transitions
+            elif event.kind == "street":
+                street = event.street
 
-                # Detect street transitions
-                if 'Street "flop"' in line:
-                    street = "flop"
-                elif 'Street "turn"' in line:
-                    street = "turn"
-                elif 'Street "river"' in line:
-                    street = "river"
+            elif event.kind == "action":
 
                 # Track raises count preflop
-                if street == "preflop" and "declared \"raise" in line:
+                if street == "preflop" and event.action == "raise":
                     preflop_raises += 1
 
                 # Target bot actions
-                if TARGET_BOT in line:
+                if event.player != TARGET_BOT:
+                    continue
+
+                if event.action == "raise":
+                    self.total_raises += 1
+                    self.total_actions += 1
+
+                    if street == "preflop":
+                        self.pfr += 1
+                        hero_raised_preflop = True
 
-                    if "declared \"raise" in line:
-                        self.total_raises += 1
-                        self.total_actions += 1
+                        if preflop_raises > 1:
+                            self.three_bet += 1
 
-                        if street == "preflop":
-                            self.pfr += 1
-                            hero_raised_preflop = True
+                    if street == "flop" and hero_raised_preflop:
+                        self.flop_cbet += 1
 
-                            if preflop_raises > 1:
-                                self.three_bet += 1
+                    if street == "turn":
+                        self.turn_barrel += 1
 
-                        if street == "flop" and hero_raised_preflop:
-                            self.flop_cbet += 1
+                    if street == "river":
+                        self.river_aggression += 1
 
-                        if street == "turn":
-                            self.turn_barrel += 1
+                elif event.action == "call":
+                    self.total_calls += 1
+                    self.total_actions += 1
 
-                        if street == "river":
-                            self.river_aggression += 1
+                    if street == "preflop":
+                        self.vpip += 1
 
-                    elif "declared \"call" in line:
-                        self.total_calls += 1
-                        self.total_actions += 1
+                elif event.action == "fold":
+                    self.total_folds += 1
+                    self.total_actions += 1
 
-                        if street == "preflop":
-                            self.vpip += 1
+                    if street == "preflop" and preflop_raises > 1:
+                        self.fold_to_three_bet += 1
 
-                    elif "declared \"fold" in line:
-                        self.total_folds += 1
-                        self.total_actions += 1
+            # Showdowns the target bot reached, and won
+            elif event.kind == "showdown" and event.player == TARGET_BOT:
+                self.showdowns += 1
+                hero_showed_down = True
 
-                        if street == "preflop" and preflop_raises > 1:
-                            self.fold_to_three_bet += 1
+            elif event.kind == "win" and event.player == TARGET_BOT and hero_showed_down:
+                self.showdown_wins += 1
 
-                # Showdown detection
-                if "won the round" in line:
-                    if TARGET_BOT in line:
-                        self.showdowns += 1
-                        self.showdown_wins += 1
-                    else:
-                        self.showdowns += 1
+        self.total_hands += hands
 
         # Opportunities
-        self.flop_opportunity += self.total_hands
-        self.turn_opportunity += self.total_hands
-        self.river_opportunity += self.total_hands
+        self.flop_opportunity += hands
+        self.turn_opportunity += hands
+        self.river_opportunity += hands
 
     # --------------------------------------------------
 
@@ -180,6 +295,15 @@ class StatsCollector:
         print("Average Profit:", round(avg_profit, 2))
         print("Std Deviation:", round(std_dev, 2))
 
+        if self.icm_results:
+            print("Average ICM Equity %:",
+                  round(statistics.mean(self.icm_results) * 100, 2))
+
+        if self.dedupe_ratios:
+            print("Equity Dedupe Ratio:",
+                  round(statistics.mean(self.dedupe_ratios), 2),
+                  "(per game:", ", ".join(f"{r:.2f}" for r in self.dedupe_ratios) + ")")
+
         print("\n========== ACTION FREQUENCY ==========")
         print("Raise %:", round(self.total_raises / self.total_actions * 100, 2))
         print("Call %:", round(self.total_calls / self.total_actions * 100, 2))
@@ -201,6 +325,10 @@ class StatsCollector:
               round(self.river_aggression / self.river_opportunity * 100, 2))
 
         print("\n========== SHOWDOWN ==========")
+        # showdowns come from the engine's hand_info (hands the target
+        # bot showed down); the old log parser counted every "won the
+        # round" line, folds included, so its figure was rounds won
+        print("(showdowns = hands", TARGET_BOT, "showed down; not comparable with round-win based reports)")
         if self.showdowns > 0:
             print("Showdown Win %:",
                   round(self.showdown_wins / self.showdowns * 100, 2))
@@ -212,9 +340,11 @@ class StatsCollector:
     def export_csv(self):
         with open("simulation_summary.csv", "w", newline="") as f:
             writer = csv.writer(f)
-            writer.writerow(["Game #", "Profit"])
+            writer.writerow(["Game #", "Profit", "ICM Equity", "Equity Dedupe Ratio"])
             for i, r in enumerate(self.results):
-                writer.writerow([i+1, r])
+                icm = self.icm_results[i] if i < len(self.icm_results) else ""
+                dedupe = self.dedupe_ratios[i] if i < len(self.dedupe_ratios) else ""
+                writer.writerow([i+1, r, icm, dedupe])
 
         print("Saved simulation_summary.csv")
 
@@ -226,16 +356,30 @@ class SimulationRunner:
 
     def __init__(self):
         self.stats = StatsCollector()
-        if not os.path.exists(LOG_DIR):
+        self.service = None
+        if VERBOSE_LOGS and not os.path.exists(LOG_DIR):
             os.makedirs(LOG_DIR)
 
     def run_single_game(self, game_index):
+        """
+        Plays one seeded game and returns its StatsCollector.
+        """
 
-        log_path = os.path.join(LOG_DIR, f"game_{game_index}.txt")
+        seed_game(BASE_SEED + game_index)
+        if self.service is not None:
+            self.service.reseed(BASE_SEED + game_index)
 
+        # Bot and engine output goes to the game's log; without one the
+        # bots' debug output is switched off, not just discarded
         original_stdout = sys.stdout
-        log_file = open(log_path, "w", encoding="utf-8")
-        sys.stdout = Tee(original_stdout, log_file)
+        debug_mode = constants.DEBUG_MODE
+        if VERBOSE_LOGS:
+            log_file = open(os.path.join(LOG_DIR, f"game_{game_index}.txt"), "w", encoding="utf-8")
+            sys.stdout = Tee(original_stdout, log_file)
+        else:
+            constants.DEBUG_MODE = False
+            log_file = open(os.devnull, "w", encoding="utf-8")
+            sys.stdout = log_file
 
         try:
             config = setup_config(
@@ -244,39 +388,97 @@ class SimulationRunner:
                 small_blind_amount=SMALL_BLIND
             )
 
+            # The target bot's seat also records the game
+            # (no decision time budget: a fixed sample count per
+            # decision, so the game replays the same on any machine)
+            recorder = EventRecorder(WorldClassBot(time_budget=None))
+
             config.register_player(name="Super_Bot", algorithm=SuperBot())
             config.register_player(name="Dumb_2", algorithm=DumbBot())
             config.register_player(name="Tournament_Titan", algorithm=TournamentTitan())
             config.register_player(name="Apex_Predator", algorithm=ApexPredator())
             config.register_player(name="Smart_Bot", algorithm=SmartPokerBot())
-            config.register_player(name="World_Class_Bot", algorithm=WorldClassBot())
+            config.register_player(name="World_Class_Bot", algorithm=recorder)
+
+            # One shared equity table per game, so every bot's queries
+            # on the same board are answered once
+            table = TableEquity(self.service)
+            install_table(table)
 
             print(f"\n========== STARTING GAME {game_index} ==========")
-            result = start_poker(config, verbose=1)
+            try:
+                result = start_poker(config, verbose=1 if VERBOSE_LOGS else 0)
+            finally:
+                install_table(None)
+
+            print(table.report())
 
             profit = 0
             for player in result["players"]:
                 if player["name"] == TARGET_BOT:
                     profit = player["stack"] - INITIAL_STACK
 
+            # prize share of the final stacks, as if the tournament
+            # were decided from here
+            names = [player["name"] for player in result["players"]]
+            icm = icm_equities([player["stack"] for player in result["players"]], PAYOUTS)
+            icm = icm[names.index(TARGET_BOT)] if TARGET_BOT in names else 0.0
+
             print(f"Game {game_index} Profit: {profit}")
+            print(f"Game {game_index} ICM Equity: {icm:.2%}")
 
         finally:
             sys.stdout = original_stdout
+            constants.DEBUG_MODE = debug_mode
             log_file.close()
 
-        self.stats.add_game_result(profit)
-        self.stats.parse_actions_from_log(log_path)
+        stats = StatsCollector()
+        stats.add_game_result(profit, icm)
+        stats.add_equity_report(table)
+        stats.add_events(recorder.events)
+
+        return stats
+
+    def run(self, workers=GAME_WORKERS):
 
-    def run(self):
+        cores = os.cpu_count() or 1
+        workers = min(workers or cores, NUM_SIMULATIONS)
 
-        for i in range(1, NUM_SIMULATIONS + 1):
-            self.run_single_game(i)
+        # Cores the games leave idle go to each game's equity service
+        service_workers = max(1, cores // workers)
+
+        if workers == 1:
+            for i in range(1, NUM_SIMULATIONS + 1):
+                self.stats.merge(_play_game(i, service_workers))
+        else:
+            # One game per process at a time; results come back in game
+            # order whatever finishes first
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                games = range(1, NUM_SIMULATIONS + 1)
+                for stats in pool.map(_play_game, games, [service_workers] * len(games)):
+                    self.stats.merge(stats)
 
         self.stats.print_summary()
         self.stats.export_csv()
         Visualizer.visualize(self.stats.results)
 
+
+def _play_game(game_index, service_workers=1):
+    """
+    Plays one game with every bot's equity misses going to an
+    EquityService (in-process with one worker, else its own pool).
+    """
+
+    runner = SimulationRunner()
+
+    with EquityService(workers=service_workers) as service:
+        install_service(service)
+        runner.service = service
+        try:
+            return runner.run_single_game(game_index)
+        finally:
+            install_service(None)
+
 # ======================================================
 # VISUALIZER
 # ======================================================
@@ -1,5 +1,6 @@
 from pypokerengine.players import BasePokerPlayer
-from pypokerengine.utils.card_utils import gen_cards, estimate_hole_card_win_rate
+from pypokerengine.utils.card_utils import gen_cards
+from bot.evaluation.equity_service import estimate_hole_card_win_rate
 import random
 
 class SmartPokerBot(BasePokerPlayer):
@@ -0,0 +1,118 @@
+# tests/test_equity_sampling.py
+
+"""
+The lattice sampler (enumeration.stratified_wins) against exact
+answers -- heads-up enumeration on the flop and turn, brute force over
+both opponents' holdings on a 3-way river: unbiased over many seeds,
+and closer to the exact equity than independent Monte Carlo with the
+same budget.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from bot.evaluation.cards import cards_to_ints
+from bot.evaluation.enumeration import enumerate_heads_up, stratified_wins
+from bot.evaluation.equity import estimate_equity_ints
+from bot.evaluation.vectorized import CARD_KEYS, SUIT_RANK_BITS, evaluate_keyed_batch, simulate_wins_batch
+
+
+SPOTS = [
+    (["SA", "DK"], ["H8", "D7", "C2"]),
+    (["HQ", "HJ"], ["HT", "S9", "C2"]),
+    (["S2", "H7"], ["DA", "DK", "CQ"]),
+    (["C9", "D9"], ["S6", "H7", "DQ", "C3"]),
+    (["HA", "H5"], ["H9", "H3", "SK", "CJ"]),
+]
+
+SEEDS = 50
+TRIALS = 500
+
+
+def _errors(sample, exact):
+    errors = []
+    for seed in range(SEEDS):
+        wins, trials = sample(np.random.default_rng(seed))
+        errors.append(wins / trials - exact)
+    return np.array(errors)
+
+
+RIVER_SPOTS = [
+    (["SA", "DK"], ["H8", "D7", "C2", "SK", "H3"]),
+    (["C5", "D5"], ["S6", "H7", "DQ", "C3", "SA"]),
+    (["HA", "H5"], ["H9", "H3", "SK", "CJ", "D2"]),
+]
+
+
+def _three_way_river(hole, board):
+    """
+    Exact win rate against two opponents, over every pair of disjoint
+    opponent holdings.
+    """
+
+    dead = set(hole) | set(board)
+    pairs = np.array(list(combinations([c for c in range(52) if c not in dead], 2)))
+
+    board_key = int(CARD_KEYS[board].sum())
+    board_mask = int(SUIT_RANK_BITS[board].sum())
+
+    values = evaluate_keyed_batch(board_key + CARD_KEYS[pairs].sum(axis=1), board_mask + SUIT_RANK_BITS[pairs].sum(axis=1))
+    hero = evaluate_keyed_batch(
+        np.array([board_key + CARD_KEYS[hole].sum()]), np.array([board_mask + SUIT_RANK_BITS[hole].sum()])
+    )[0]
+
+    masks = (np.int64(1) << pairs).sum(axis=1)
+    disjoint = (masks[:, None] & masks[None, :]) == 0
+    beaten = values <= hero
+
+    return (disjoint & beaten[:, None] & beaten[None, :]).sum() / disjoint.sum()
+
+
+@pytest.mark.parametrize("hole_cards, board_cards", SPOTS)
+def test_stratified_matches_exact_heads_up(hole_cards, board_cards):
+
+    hole = cards_to_ints(hole_cards)
+    board = cards_to_ints(board_cards)
+
+    wins, showdowns = enumerate_heads_up(hole, board)
+    exact = wins / showdowns
+
+    stratified = _errors(lambda rng: stratified_wins(hole, board, 1, TRIALS, rng), exact)
+    monte_carlo = _errors(lambda rng: (simulate_wins_batch(hole, board, 1, TRIALS, rng), TRIALS), exact)
+
+    # no bias beyond noise (the mean of 50 runs has SE ~0.002)
+    assert abs(stratified.mean()) < 0.01
+
+    # every run within 2.5 Monte Carlo standard errors
+    mc_se = np.sqrt(exact * (1 - exact) / TRIALS)
+    assert np.abs(stratified).max() < 2.5 * mc_se
+
+    # and less spread than independent sampling
+    assert np.sqrt((stratified ** 2).mean()) < np.sqrt((monte_carlo ** 2).mean())
+
+
+@pytest.mark.parametrize("hole_cards, board_cards", RIVER_SPOTS)
+def test_stratified_matches_brute_force_three_way_river(hole_cards, board_cards):
+
+    hole = cards_to_ints(hole_cards)
+    board = cards_to_ints(board_cards)
+
+    exact = _three_way_river(hole, board)
+
+    stratified = _errors(lambda rng: stratified_wins(hole, board, 2, TRIALS, rng), exact)
+    monte_carlo = _errors(lambda rng: (simulate_wins_batch(hole, board, 2, TRIALS, rng), TRIALS), exact)
+
+    assert abs(stratified.mean()) < 0.01
+
+    mc_se = np.sqrt(exact * (1 - exact) / TRIALS)
+    assert np.abs(stratified).max() < 2.5 * mc_se
+
+    assert np.sqrt((stratified ** 2).mean()) < np.sqrt((monte_carlo ** 2).mean())
+
+
+def test_multiway_river_uses_the_lattice():
+
+    estimate = estimate_equity_ints(cards_to_ints(["SA", "DK"]), cards_to_ints(["H8", "D7", "C2", "SK", "H3"]), 3)
+    assert estimate.method == "stratified"
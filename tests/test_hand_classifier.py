@@ -0,0 +1,50 @@
+# tests/test_hand_classifier.py
+
+"""
+The table-driven classify_hand against the count-based classifier it
+replaced (_classify_reference), on a fixed-seed sample of flops, turns
+and rivers.
+"""
+
+import random
+from itertools import combinations
+
+import pytest
+
+from bot.evaluation.cards import cards_to_ints
+from bot.evaluation.hand_classifier import _classify_reference, classify_hand
+
+
+def _deals(board_len, count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        cards = rng.sample(range(52), 2 + board_len)
+        yield cards[:2], cards[2:]
+
+
+def test_every_flop_matches_reference():
+
+    rng = random.Random(9)
+
+    for flop in combinations(range(52), 3):
+        live = [c for c in range(52) if c not in flop]
+        hole = rng.sample(live, 2)
+
+        assert classify_hand(hole, list(flop)) == _classify_reference(hole, list(flop)), (hole, flop)
+
+
+@pytest.mark.parametrize("board_len", [3, 4, 5])
+def test_random_deals_match_reference(board_len):
+
+    for hole, board in _deals(board_len, 20_000, seed=board_len):
+        assert classify_hand(hole, board) == _classify_reference(hole, board), (hole, board)
+
+
+@pytest.mark.parametrize("hole, board, expected", [
+    (["SA", "SK"], ["S2", "S7", "HQ"], {"made_hand": "high_card", "draws": ["flush_draw"]}),
+    (["H9", "H8"], ["D7", "C6", "S2"], {"made_hand": "high_card", "draws": ["straight_draw"]}),
+    (["HA", "DA"], ["CA", "S7", "D7", "C2"], {"made_hand": "full_house", "draws": []}),
+    (["H5", "H4"], ["HA", "H2", "D3", "C9", "SK"], {"made_hand": "straight", "draws": []}),
+])
+def test_known_hands(hole, board, expected):
+    assert classify_hand(cards_to_ints(hole), cards_to_ints(board)) == expected
@@ -0,0 +1,82 @@
+# tests/test_icm.py
+
+"""
+icm_equities against Harville summed over every finishing order
+(_brute_force): both exact walks on small fields, and the sampled mode
+within its sampling error.
+"""
+
+import numpy as np
+import pytest
+
+from bot.evaluation import icm
+from bot.evaluation.icm import _brute_force, _harville, _harville_dense, _sampled, icm_equities
+
+
+PAYOUTS = [
+    (1.0,),
+    (0.65, 0.35),
+    (0.5, 0.3, 0.2),
+    (0.4, 0.3, 0.2, 0.1),
+]
+
+
+def _fields(seed, count=20):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        players = int(rng.integers(2, 8))
+        yield rng.integers(1, 5000, players).tolist()
+
+
+@pytest.mark.parametrize("payouts", PAYOUTS)
+def test_exact_walks_match_every_order(payouts):
+
+    for stacks in _fields(len(payouts)):
+        truth = _brute_force(stacks, payouts)
+
+        # the walks take at most one place per player (icm_equities trims)
+        paid = payouts[:len(stacks)]
+
+        assert np.allclose(_harville(stacks, paid), truth, atol=1e-12), stacks
+        assert np.allclose(_harville_dense(stacks, paid), truth, atol=1e-12), stacks
+        assert np.allclose(icm_equities(stacks, payouts), truth, atol=1e-12), stacks
+
+
+def test_busted_players_get_nothing():
+
+    stacks = [3000, 0, 2000, 0, 1000]
+    payouts = (0.5, 0.3, 0.2, 0.1)
+
+    live = _brute_force([3000, 2000, 1000], payouts[:3])
+    assert np.allclose(icm_equities(stacks, payouts), [live[0], 0.0, live[1], 0.0, live[2]], atol=1e-12)
+
+
+def test_sampled_mode_within_tolerance():
+
+    rng = np.random.default_rng(3)
+    payouts = (0.5, 0.3, 0.2)
+
+    for _ in range(5):
+        stacks = rng.integers(500, 5000, 7).tolist()
+        error = np.abs(np.array(_sampled(stacks, payouts)) - _brute_force(stacks, payouts)).max()
+
+        # ICM_SAMPLES orders: SE per player < 0.5 / sqrt(20000) ~ 0.0035
+        assert error < 0.01, (stacks, error)
+
+
+def test_large_fields_switch_to_sampling(monkeypatch):
+
+    stacks = [4000, 3000, 2500, 2000, 1500, 1000, 500]
+    payouts = (0.5, 0.3, 0.2)
+
+    monkeypatch.setattr(icm, "DENSE_STATES", 0)
+    monkeypatch.setattr(icm, "ICM_EXACT_STATES", 0)
+    icm._equities.cache_clear()
+
+    try:
+        sampled = icm_equities(stacks, payouts)
+    finally:
+        icm._equities.cache_clear()
+
+    assert sampled == tuple(_sampled(stacks, payouts))
+    assert np.abs(np.array(sampled) - _brute_force(stacks, payouts)).max() < 0.01
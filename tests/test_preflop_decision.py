@@ -0,0 +1,112 @@
+# tests/test_preflop_decision.py
+
+"""
+get_preflop_action against the pre-table decision engine, and the
+runtime spot (context_spot) against situation detection.
+
+data/preflop_baseline.json holds the pre-table engine's (action,
+amount) for every position name, spot context, stack zone and hand,
+driven with the stub states built here (one char per hand, indexing
+"legend"). Push/fold spots record only that the push/fold engine was
+called.
+"""
+
+import itertools
+import json
+import os
+import types
+
+import pytest
+
+from bot.config import constants
+from bot.evaluation.cards import cards_to_ints
+from bot.evaluation.hand_utils import HAND_CODES
+from bot.strategy.preflop import decision
+from bot.strategy.preflop.classifier import detect_preflop_situation
+from bot.strategy.preflop.decision import TABLE_ZONES, context_spot, spot_index
+
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_baseline.json")
+
+BIG_BLIND = 20
+
+# name: raises, callers, limpers, in_position, to_call (as in the golden file)
+CONTEXTS = {
+    "unopened":      (0, 0, 0, False, 20),
+    "limped":        (0, 0, 1, False, 20),
+    "open":          (1, 0, 0, False, 44),
+    "open_callers":  (1, 1, 0, False, 44),
+    "reraise_oop":   (2, 0, 0, False, 132),
+    "reraise_ip":    (2, 0, 0, True, 132),
+    "capped_oop":    (3, 0, 0, False, 290),
+    "capped_ip":     (3, 0, 0, True, 290),
+}
+
+
+def _cards(code):
+    high, low = code[0], code[1]
+    if code.endswith("s"):
+        return ["S" + high, "S" + low]
+    return ["S" + high, "H" + low]
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+def test_golden_covers_the_grid(golden):
+    assert golden["hands"] == list(HAND_CODES)
+
+
+@pytest.mark.parametrize("position", ("BTN", "SB", "BB", "UTG", "MP", "CO", "HJ", "P6"))
+def test_decisions_match_baseline(golden, position, monkeypatch):
+
+    # the push/fold engine has changed on purpose (solved ranges, ICM);
+    # only the routing to it is compared
+    apply = list(decision._APPLY)
+    apply[decision.PUSH_FOLD] = lambda state, valid_actions: ("push_fold", 0)
+    monkeypatch.setattr(decision, "_APPLY", tuple(apply))
+    monkeypatch.setattr(constants, "DEBUG_MODE", False)
+
+    mismatches = []
+
+    for name, (raises, callers, limpers, in_position, to_call) in CONTEXTS.items():
+        valid_actions = [
+            {"action": "fold", "amount": 0},
+            {"action": "call", "amount": to_call},
+            {"action": "raise", "amount": {"min": 2 * to_call, "max": 2000}},
+        ]
+        ctx = {"raises_before": raises, "callers_before": callers, "limpers_before": limpers}
+
+        for zone in TABLE_ZONES:
+            row = golden["cells"][f"{position}/{name}/{zone}"]
+
+            for code, cell in zip(HAND_CODES, row):
+                cards = _cards(code)
+                state = types.SimpleNamespace(
+                    hero_cards=cards, hero_ints=cards_to_ints(cards),
+                    hero_position_name=position, stack_zone=zone,
+                    preflop_context=ctx, in_position=in_position,
+                    big_blind=BIG_BLIND, to_call=to_call, stack_bb=100,
+                )
+
+                action, amount = decision.get_preflop_action(state, valid_actions)
+                expected = golden["legend"][ord(cell) - 48]
+
+                if f"{action} {amount}" != expected:
+                    mismatches.append((name, zone, code, f"{action} {amount}", expected))
+
+    assert not mismatches, mismatches[:10]
+
+
+def test_context_spot_matches_detection():
+
+    for raises, callers, limpers, in_position in itertools.product(range(5), range(3), range(3), (False, True)):
+        ctx = {"raises_before": raises, "callers_before": callers, "limpers_before": limpers}
+        probe = types.SimpleNamespace(preflop_context=ctx)
+
+        expected = spot_index(detect_preflop_situation(probe), callers, raises, in_position)
+
+        assert context_spot(ctx, in_position) == expected, ctx
@@ -0,0 +1,29 @@
+# tests/test_range_notation.py
+
+"""
+The checked-in compiled range cache against the range tables, and
+compile_ranges() never writing it.
+"""
+
+import json
+
+from bot.evaluation.range_notation import compile_ranges, parse_range, stale_tables
+
+
+def test_checked_in_cache_is_current():
+    stale = stale_tables()
+    assert not stale, f"rebuild with: python -m bot.evaluation.range_notation ({stale})"
+
+
+def test_compile_ranges_does_not_write(tmp_path):
+
+    path = tmp_path / "compiled_ranges.json"
+    path.write_text(json.dumps({"version": 1, "tables": {}}))
+    before = path.read_text()
+
+    compiled = compile_ranges("TEST_RANGES", {"open": "22+, AKs"}, path=str(path))
+
+    assert compiled["open"].bits == parse_range("22+, AKs").bits
+    assert path.read_text() == before
+    assert list(tmp_path.iterdir()) == [path]
+